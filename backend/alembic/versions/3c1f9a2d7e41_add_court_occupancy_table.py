@@ -0,0 +1,35 @@
+"""add court_occupancy table
+
+Revision ID: 3c1f9a2d7e41
+Revises: 7befa15f55cf
+Create Date: 2026-10-17 10:12:31.402117
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a2d7e41'
+down_revision: Union[str, Sequence[str], None] = '7befa15f55cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sin backfill: las filas se materializan desde bookings al primer write del día
+    op.create_table(
+        'court_occupancy',
+        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('court_id', sa.Integer(), sa.ForeignKey('courts.id', ondelete="CASCADE"), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('bit_minutes', sa.Integer(), nullable=False),
+        sa.Column('bits', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=False), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index('uq_occupancy_court_day', 'court_occupancy', ['court_id', 'day'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_occupancy_court_day', table_name='court_occupancy')
+    op.drop_table('court_occupancy')
@@ -0,0 +1,25 @@
+"""add bookings.series_id
+
+Revision ID: 8a4e2b6c0d13
+Revises: 3c1f9a2d7e41
+Create Date: 2026-10-17 11:40:02.118734
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e2b6c0d13'
+down_revision: Union[str, Sequence[str], None] = '3c1f9a2d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('bookings', sa.Column('series_id', sa.String(length=36), nullable=True))
+    op.create_index('ix_bookings_series_id', 'bookings', ['series_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_series_id', table_name='bookings')
+    op.drop_column('bookings', 'series_id')
@@ -0,0 +1,76 @@
+"""notification_outbox: one row per event (drop recipient)
+
+Revision ID: a3d7e5c9b142
+Revises: f0b3d6e2a874
+Create Date: 2026-10-17 16:02:41.318870
+"""
+import json
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d7e5c9b142'
+down_revision: Union[str, Sequence[str], None] = 'f0b3d6e2a874'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COPY_COLUMNS = {
+    'kind': sa.String, 'booking_id': sa.Integer, 'payload': sa.JSON, 'attempts': sa.Integer,
+    'next_attempt_at': sa.DateTime, 'sent_at': sa.DateTime, 'failed_at': sa.DateTime,
+    'last_error': sa.Text, 'created_at': sa.DateTime,
+}
+
+
+def _load(payload):
+    # JSON vuelve como dict (psycopg) o como texto (sqlite)
+    if isinstance(payload, str):
+        return json.loads(payload or "{}")
+    return dict(payload or {})
+
+
+def upgrade() -> None:
+    # Los destinatarios pasan a payload["recipients"]. Cada fila del formato
+    # viejo (una por destinatario) conserva el suyo ahí adentro; también las ya
+    # enviadas, así el downgrade lo puede reconstruir.
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE notification_outbox "
+            "SET payload = (payload::jsonb || jsonb_build_object('recipients', jsonb_build_array(recipient)))::json"
+        )
+    else:
+        rows = bind.execute(sa.text("SELECT id, payload, recipient FROM notification_outbox")).fetchall()
+        for row_id, payload, recipient in rows:
+            data = {**_load(payload), "recipients": [recipient]}
+            bind.execute(sa.text("UPDATE notification_outbox SET payload = :p WHERE id = :id"),
+                         {"p": json.dumps(data), "id": row_id})
+
+    # batch: en SQLite recrea la tabla; en Postgres es un ALTER común
+    with op.batch_alter_table('notification_outbox') as batch:
+        batch.drop_column('recipient')
+
+
+def downgrade() -> None:
+    # Vuelta al formato viejo: una fila por destinatario. La fila existente
+    # queda con el primero y se copian las de los demás; en las pendientes se
+    # omiten los que ya figuran en payload["delivered"].
+    with op.batch_alter_table('notification_outbox') as batch:
+        batch.add_column(sa.Column('recipient', sa.String(length=20), nullable=True))
+
+    bind = op.get_bind()
+    outbox = sa.table('notification_outbox', sa.column('id', sa.Integer), sa.column('recipient', sa.String),
+                      *[sa.column(c, t) for c, t in _COPY_COLUMNS.items()])
+    rows = bind.execute(sa.select(outbox)).mappings().all()
+    for row in rows:
+        data = _load(row['payload'])
+        recipients = list(data.get('recipients') or ['player'])
+        if row['sent_at'] is None and row['failed_at'] is None:
+            delivered = set(data.get('delivered') or [])
+            recipients = [r for r in recipients if r not in delivered] or recipients[:1]
+        bind.execute(outbox.update().where(outbox.c.id == row['id']).values(recipient=recipients[0]))
+        for recipient in recipients[1:]:
+            bind.execute(outbox.insert().values(recipient=recipient, **{c: row[c] for c in _COPY_COLUMNS}))
+
+    with op.batch_alter_table('notification_outbox') as batch:
+        batch.alter_column('recipient', existing_type=sa.String(length=20), nullable=False)
@@ -0,0 +1,53 @@
+"""add venues.search_text with pg_trgm index
+
+Revision ID: a5c8e2f7d914
+Revises: f9a3c1e6b270
+Create Date: 2026-10-17 19:41:03.257819
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c8e2f7d914'
+down_revision: Union[str, Sequence[str], None] = 'f9a3c1e6b270'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# copia de app/domains/venues/search.py:normalize_text (la migración no importa la app)
+def _normalize(value):
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"[^0-9a-z]+", " ", stripped).strip()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_pg = bind.dialect.name == "postgresql"
+    if is_pg:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('venues', sa.Column('search_text', sa.String(length=600), nullable=False, server_default=''))
+
+    rows = bind.execute(sa.text("SELECT id, name, address, city FROM venues")).fetchall()
+    for vid, name, address, city in rows:
+        search_text = " ".join(p for p in (_normalize(name), _normalize(address), _normalize(city)) if p)
+        bind.execute(sa.text("UPDATE venues SET search_text = :t WHERE id = :id"), {"t": search_text, "id": vid})
+
+    if is_pg:
+        op.create_index(
+            'ix_venues_search_trgm', 'venues', ['search_text'],
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'},
+        )
+    else:
+        op.create_index('ix_venues_search_trgm', 'venues', ['search_text'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_venues_search_trgm', table_name='venues')
+    op.drop_column('venues', 'search_text')
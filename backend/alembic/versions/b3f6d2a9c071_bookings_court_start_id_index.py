@@ -0,0 +1,27 @@
+"""bookings: (court_id, start_datetime, id) index for owner keyset pages
+
+Revision ID: b3f6d2a9c071
+Revises: a5c8e2f7d914
+Create Date: 2026-10-17 21:12:36.540219
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6d2a9c071'
+down_revision: Union[str, Sequence[str], None] = 'a5c8e2f7d914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # reemplaza a ix_bookings_court_start (mismo prefijo); puede no existir si la
+    # base no se creó con create_all
+    op.create_index('ix_bookings_court_start_id', 'bookings', ['court_id', 'start_datetime', 'id'])
+    op.drop_index('ix_bookings_court_start', table_name='bookings', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_bookings_court_start', 'bookings', ['court_id', 'start_datetime'])
+    op.drop_index('ix_bookings_court_start_id', table_name='bookings')
@@ -0,0 +1,38 @@
+"""add bookings no-overlap exclusion constraint
+
+Revision ID: b71f0c4d9e25
+Revises: 8a4e2b6c0d13
+Create Date: 2026-10-17 12:25:48.530912
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71f0c4d9e25'
+down_revision: Union[str, Sequence[str], None] = '8a4e2b6c0d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Solo Postgres. Falla si ya hay reservas activas solapadas: resolverlas antes.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE bookings
+        ADD CONSTRAINT ex_bookings_court_no_overlap
+        EXCLUDE USING gist (
+            court_id WITH =,
+            tsrange(start_datetime, end_datetime, '[)') WITH &&
+        ) WHERE (status IN ('PENDING', 'CONFIRMED'))
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_court_no_overlap")
@@ -0,0 +1,28 @@
+"""users/venues.calendar_feed_version: revocable calendar feed links
+
+Revision ID: c4e8a1f6d392
+Revises: b3f6d2a9c071
+Create Date: 2026-10-17 22:05:17.904316
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f6d392'
+down_revision: Union[str, Sequence[str], None] = 'b3f6d2a9c071'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 0 = versión de los tokens ya emitidos (sin claim cal_v): siguen valiendo hasta rotar
+    op.add_column('users', sa.Column('calendar_feed_version', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('venues', sa.Column('calendar_feed_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('venues') as batch:
+        batch.drop_column('calendar_feed_version')
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('calendar_feed_version')
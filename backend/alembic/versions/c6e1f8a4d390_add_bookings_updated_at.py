@@ -0,0 +1,26 @@
+"""add bookings.updated_at
+
+Revision ID: c6e1f8a4d390
+Revises: a3d7e5c9b142
+Create Date: 2026-10-17 17:48:15.502911
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1f8a4d390'
+down_revision: Union[str, Sequence[str], None] = 'a3d7e5c9b142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('bookings', sa.Column('updated_at', sa.DateTime(timezone=False), nullable=False,
+                                        server_default=sa.text('CURRENT_TIMESTAMP')))
+    # las existentes: su última modificación conocida es la creación
+    op.execute("UPDATE bookings SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column('bookings', 'updated_at')
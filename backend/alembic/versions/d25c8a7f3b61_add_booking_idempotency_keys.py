@@ -0,0 +1,36 @@
+"""add booking_idempotency_keys table
+
+Revision ID: d25c8a7f3b61
+Revises: b71f0c4d9e25
+Create Date: 2026-10-17 13:02:17.906455
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd25c8a7f3b61'
+down_revision: Union[str, Sequence[str], None] = 'b71f0c4d9e25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'booking_idempotency_keys',
+        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete="CASCADE"), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('booking_id', sa.Integer(), sa.ForeignKey('bookings.id', ondelete="CASCADE"), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=False), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=False), nullable=False),
+    )
+    op.create_index('uq_idempotency_user_key', 'booking_idempotency_keys', ['user_id', 'key'], unique=True)
+    op.create_index('ix_idempotency_expires', 'booking_idempotency_keys', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_expires', table_name='booking_idempotency_keys')
+    op.drop_index('uq_idempotency_user_key', table_name='booking_idempotency_keys')
+    op.drop_table('booking_idempotency_keys')
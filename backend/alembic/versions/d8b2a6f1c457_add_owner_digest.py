@@ -0,0 +1,38 @@
+"""add users.owner_digest and owner_digest_events
+
+Revision ID: d8b2a6f1c457
+Revises: c6e1f8a4d390
+Create Date: 2026-10-17 18:31:54.207166
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b2a6f1c457'
+down_revision: Union[str, Sequence[str], None] = 'c6e1f8a4d390'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('owner_digest', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.create_table(
+        'owner_digest_events',
+        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('owner_user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete="CASCADE"), nullable=False),
+        sa.Column('venue_id', sa.Integer(), sa.ForeignKey('venues.id', ondelete="CASCADE"), nullable=False),
+        sa.Column('booking_id', sa.Integer(), sa.ForeignKey('bookings.id', ondelete="CASCADE"), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('detail', sa.String(length=120), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=False), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('digested_at', sa.DateTime(timezone=False), nullable=True),
+    )
+    op.create_index('ix_digest_pending', 'owner_digest_events', ['owner_user_id', 'digested_at', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_digest_pending', table_name='owner_digest_events')
+    op.drop_table('owner_digest_events')
+    op.drop_column('users', 'owner_digest')
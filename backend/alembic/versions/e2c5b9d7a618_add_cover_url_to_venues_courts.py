@@ -0,0 +1,42 @@
+"""add cover_url to venues and courts
+
+Revision ID: e2c5b9d7a618
+Revises: d8b2a6f1c457
+Create Date: 2026-10-17 19:05:27.880412
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c5b9d7a618'
+down_revision: Union[str, Sequence[str], None] = 'd8b2a6f1c457'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('venues', sa.Column('cover_url', sa.String(length=600), nullable=True))
+    op.add_column('courts', sa.Column('cover_url', sa.String(length=600), nullable=True))
+    # backfill con el mismo orden que usaban las lecturas públicas
+    op.execute("""
+        UPDATE venues SET cover_url = (
+            SELECT p.url FROM venue_photos p
+            WHERE p.venue_id = venues.id
+            ORDER BY p.is_cover DESC, p.sort_order ASC, p.id ASC
+            LIMIT 1
+        )
+    """)
+    op.execute("""
+        UPDATE courts SET cover_url = (
+            SELECT p.url FROM court_photos p
+            WHERE p.court_id = courts.id
+            ORDER BY p.is_cover DESC, p.sort_order ASC, p.id ASC
+            LIMIT 1
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('courts', 'cover_url')
+    op.drop_column('venues', 'cover_url')
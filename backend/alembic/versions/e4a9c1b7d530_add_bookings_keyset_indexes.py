@@ -0,0 +1,25 @@
+"""add bookings keyset pagination indexes
+
+Revision ID: e4a9c1b7d530
+Revises: d25c8a7f3b61
+Create Date: 2026-10-17 13:48:55.271043
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c1b7d530'
+down_revision: Union[str, Sequence[str], None] = 'd25c8a7f3b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_bookings_user_start_id', 'bookings', ['user_id', 'start_datetime', 'id'])
+    op.create_index('ix_bookings_start_id', 'bookings', ['start_datetime', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_start_id', table_name='bookings')
+    op.drop_index('ix_bookings_user_start_id', table_name='bookings')
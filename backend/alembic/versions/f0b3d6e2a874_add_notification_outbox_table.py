@@ -0,0 +1,40 @@
+"""add notification_outbox table
+
+Revision ID: f0b3d6e2a874
+Revises: e4a9c1b7d530
+Create Date: 2026-10-17 14:36:09.640218
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0b3d6e2a874'
+down_revision: Union[str, Sequence[str], None] = 'e4a9c1b7d530'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('booking_id', sa.Integer(), sa.ForeignKey('bookings.id', ondelete="CASCADE"), nullable=True),
+        sa.Column('recipient', sa.String(length=20), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=False), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('sent_at', sa.DateTime(timezone=False), nullable=True),
+        sa.Column('failed_at', sa.DateTime(timezone=False), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=False), nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index('ix_outbox_due', 'notification_outbox', ['sent_at', 'failed_at', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_due', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
@@ -0,0 +1,23 @@
+"""add venues (latitude, longitude) index
+
+Revision ID: f9a3c1e6b270
+Revises: e2c5b9d7a618
+Create Date: 2026-10-17 19:22:48.416093
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9a3c1e6b270'
+down_revision: Union[str, Sequence[str], None] = 'e2c5b9d7a618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_venues_lat_lng', 'venues', ['latitude', 'longitude'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_venues_lat_lng', table_name='venues')
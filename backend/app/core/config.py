@@ -19,6 +19,56 @@ class Settings(BaseSettings):
     # DB
     DATABASE_URL: str  # <- como str simple
 
+    # Cache en memoria de disponibilidad (court_id, fecha). TTL 0 lo desactiva.
+    AVAILABILITY_CACHE_TTL_SECONDS: int = 60
+    AVAILABILITY_CACHE_MAX_ENTRIES: int = 4096
+    # Tablas de precio compiladas por cancha (cambian poco; se invalidan al editar precios)
+    PRICE_TABLE_CACHE_TTL_SECONDS: int = 600
+    PRICE_TABLE_CACHE_MAX_ENTRIES: int = 4096
+    # Espera máxima por el lock del día al reservar (Postgres); vencido -> 409. 0 = sin límite
+    BOOKING_LOCK_TIMEOUT_MS: int = 3000
+    # Cuánto se recuerda una Idempotency-Key de POST /bookings
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+
+    # Job en proceso que expira PENDING vencidas (0 = no se agenda; queda el endpoint admin)
+    BOOKING_EXPIRY_INTERVAL_SECONDS: int = 60
+    BOOKING_EXPIRY_BATCH_SIZE: int = 500
+    # CONFIRMED terminadas hace más de N minutos -> NO_SHOW. None = no se marcan
+    BOOKING_NO_SHOW_AFTER_MINUTES: int | None = None
+
+    # Outbox de notificaciones: cada cuánto se drena, tamaño de lote y reintentos (backoff exponencial)
+    OUTBOX_POLL_INTERVAL_SECONDS: int = 5
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: int = 30
+    OUTBOX_RETRY_MAX_SECONDS: int = 3600
+    # Pool de envíos del outbox: threads, envíos encolados extra (backpressure) y
+    # tope de espera por lote. Conviene SMTP_POOL_SIZE >= NOTIFY_MAX_WORKERS
+    NOTIFY_MAX_WORKERS: int = 4
+    NOTIFY_MAX_PENDING: int = 100
+    NOTIFY_BATCH_TIMEOUT_SECONDS: int = 60
+    NOTIFY_SEND_TIMEOUT_SECONDS: int = 20      # timeout de socket SMTP por envío
+
+    # Resumen para owners con users.owner_digest: los eventos se juntan desde el
+    # primero pendiente durante la ventana y salen en un solo mail por owner
+    OWNER_DIGEST_WINDOW_MINUTES: int = 60
+    OWNER_DIGEST_INTERVAL_SECONDS: int = 300   # 0 = no se agenda
+    OWNER_DIGEST_BATCH_SIZE: int = 100         # owners por corrida
+
+    # Feeds iCalendar suscribibles (/users/me/calendar.ics, /venues/{id}/calendar.ics)
+    CALENDAR_FEED_TOKEN_EXPIRE_DAYS: int = 365  # revocables antes: POST .../calendar-feed/rotate
+    CALENDAR_FEED_PAST_DAYS: int = 30          # hasta cuánto atrás se publican reservas
+    CALENDAR_FEED_PAGE_SIZE: int = 500         # filas por página del keyset al streamear
+    CALENDAR_FEED_REFRESH_MINUTES: int = 5     # sugerido a los clientes (REFRESH-INTERVAL)
+    # ETag por feed en memoria: un poll con If-None-Match no toca la DB mientras no venza
+    CALENDAR_FEED_ETAG_TTL_SECONDS: int = 300
+    CALENDAR_FEED_ETAG_MAX_ENTRIES: int = 8192
+
+    # Autocompletado en memoria (GET /venues/public/suggest): se carga al arrancar
+    # y los routers lo actualizan; el rebuild periódico trae cambios de otros procesos
+    SUGGEST_REBUILD_INTERVAL_SECONDS: int = 600   # 0 = no se agenda
+    SUGGEST_MAX_RESULTS: int = 20
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -35,14 +35,16 @@ if not DATABASE_URL:
 
 is_sqlite = DATABASE_URL.startswith("sqlite")
 
+# SQLite (dev/tests): sin pool_size/max_overflow, create_engine no acepta None
+_pool_args = {} if is_sqlite else {"pool_size": 5, "max_overflow": 10}
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=not is_sqlite,
     pool_recycle=0 if is_sqlite else 1800,
     connect_args={"check_same_thread": False} if is_sqlite else {},
-    pool_size=None if is_sqlite else 5,
-    max_overflow=None if is_sqlite else 10,
     future=True,
+    **_pool_args,
 )
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
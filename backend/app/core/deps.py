@@ -20,6 +20,9 @@ TokenStr = Annotated[str, Depends(oauth2_scheme)]
 def get_current_user(token: TokenStr, db: DB) -> User:
     try:
         payload = decode_token(token)
+        # los tokens de feeds .ics (claim "cal") sólo sirven para leer el calendario
+        if payload.get("cal"):
+            raise ValueError("calendar token")
         user_id = int(payload.get("sub"))
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
@@ -0,0 +1,65 @@
+# app/core/scheduler.py
+"""
+Scheduler mínimo en proceso: cada job corre en su propio thread daemon cada
+`interval_seconds`. Se arranca/para desde los eventos de startup/shutdown de la app.
+
+Con varios workers cada uno corre sus jobs; los jobs tienen que tolerarlo
+(p. ej. lockear con SKIP LOCKED en vez de asumir que son los únicos).
+"""
+from __future__ import annotations
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+
+@dataclass
+class _Job:
+    name: str
+    interval_seconds: float
+    fn: Callable[[], None]
+    thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+
+class PeriodicScheduler:
+    def __init__(self) -> None:
+        self._jobs: Dict[str, _Job] = {}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, interval_seconds: float, fn: Callable[[], None]) -> None:
+        """Registra (o reemplaza, si no arrancó) un job. interval <= 0 lo deja desactivado."""
+        if interval_seconds <= 0:
+            return
+        with self._lock:
+            self._jobs[name] = _Job(name, interval_seconds, fn)
+
+    def start(self) -> None:
+        with self._lock:
+            self._stop.clear()
+            for job in self._jobs.values():
+                if job.thread is not None and job.thread.is_alive():
+                    continue
+                job.thread = threading.Thread(
+                    target=self._loop, args=(job,), name=f"job:{job.name}", daemon=True
+                )
+                job.thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if job.thread is not None:
+                job.thread.join(timeout)
+                job.thread = None
+
+    def _loop(self, job: _Job) -> None:
+        # primera corrida después de un intervalo: no competir con el arranque
+        while not self._stop.wait(job.interval_seconds):
+            try:
+                job.fn()
+            except Exception as e:
+                print(f"[scheduler] job {job.name} falló: {e}")
+
+
+scheduler = PeriodicScheduler()
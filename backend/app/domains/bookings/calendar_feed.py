@@ -0,0 +1,219 @@
+# app/domains/bookings/calendar_feed.py
+"""
+Feeds iCalendar suscribibles: reservas de un jugador y de un venue.
+
+- Auth por token en la URL (los clientes de calendario no mandan headers):
+  JWT firmado con claim `cal` = "user" o "venue:<id>", de vida larga. El claim
+  `cal_v` lleva la versión del feed (users/venues.calendar_feed_version): rotar
+  el link la incrementa y los tokens anteriores dejan de valer.
+- ETag = hash de (max(updated_at), count) del alcance del feed + fecha de hoy
+  (la ventana de publicación corre por día). Se cachea en memoria y se
+  invalida desde el service de bookings (el venue se resuelve por la cancha
+  en ese momento), así un poll con If-None-Match contesta 304 con una sola
+  lectura por PK (la versión del token).
+- El cuerpo se streamea: páginas keyset (start_datetime, id) -> VEVENTs.
+"""
+from __future__ import annotations
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.security import create_access_token, decode_token
+from app.domains.bookings.models import Booking
+from app.domains.users.models import User
+from app.domains.venues.models import Court, Venue
+from app.shared.cache import TTLCache
+from app.shared.enums import BookingStatusEnum
+from app.utils.calendar_ics import ICS_CALENDAR_FOOTER, build_vevent, ics_calendar_header
+
+FeedKey = Tuple[str, int]   # ("user", user_id) | ("venue", venue_id)
+
+# Las canceladas no se publican: al desaparecer del feed el cliente borra el evento
+_FEED_STATUSES = {
+    BookingStatusEnum.PENDING: "STATUS:TENTATIVE",
+    BookingStatusEnum.CONFIRMED: "STATUS:CONFIRMED",
+}
+
+etag_cache: TTLCache[FeedKey, str] = TTLCache(
+    max_entries=settings.CALENDAR_FEED_ETAG_MAX_ENTRIES,
+    ttl_seconds=settings.CALENDAR_FEED_ETAG_TTL_SECONDS,
+)
+
+
+def invalidate_calendar_feeds(db: Session, changes: Iterable[Tuple[int, Optional[int]]]) -> None:
+    """ETags del jugador y del venue de cada (court_id, user_id) modificado; una query por llamada."""
+    changes = list(changes)
+    for _, user_id in changes:
+        if user_id is not None:
+            etag_cache.delete(("user", user_id))
+    court_ids = {court_id for court_id, _ in changes}
+    if court_ids:
+        for venue_id in set(db.scalars(select(Court.venue_id).where(Court.id.in_(court_ids)))):
+            etag_cache.delete(("venue", venue_id))
+
+
+# -------------------------
+# Tokens
+# -------------------------
+def _feed_owner_model(key: FeedKey):
+    return User if key[0] == "user" else Venue
+
+
+def feed_token(key: FeedKey, version: int) -> str:
+    scope, id_ = key
+    sub, cal = (id_, "user") if scope == "user" else (0, f"venue:{id_}")
+    return create_access_token(
+        subject=sub, claims={"cal": cal, "cal_v": version},
+        expires_minutes=settings.CALENDAR_FEED_TOKEN_EXPIRE_DAYS * 24 * 60,
+    )
+
+
+def rotate_feed_token(db: Session, key: FeedKey) -> str:
+    """Nueva versión del feed (invalida los links anteriores) y su token."""
+    model = _feed_owner_model(key)
+    version = db.execute(
+        update(model)
+        .where(model.id == key[1])
+        .values(calendar_feed_version=model.calendar_feed_version + 1)
+        .returning(model.calendar_feed_version)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    db.commit()
+    return feed_token(key, version)
+
+
+def key_from_token(db: Session, token: str, venue_id: Optional[int] = None) -> FeedKey:
+    """Valida el token del feed: alcance (para venues, ESE venue) y versión vigente."""
+    try:
+        payload = decode_token(token)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+    cal = payload.get("cal")
+    if venue_id is None and cal == "user":
+        key: FeedKey = ("user", int(payload["sub"]))
+    elif venue_id is not None and cal == f"venue:{venue_id}":
+        key = ("venue", venue_id)
+    else:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Token no válido para este calendario")
+
+    model = _feed_owner_model(key)
+    current = db.scalar(select(model.calendar_feed_version).where(model.id == key[1]))
+    # tokens emitidos antes de versionar no traen cal_v: valen como versión 0
+    if current is None or payload.get("cal_v", 0) != current:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revocado")
+    return key
+
+
+# -------------------------
+# Queries
+# -------------------------
+def _window_start(today: date) -> datetime:
+    return datetime.combine(today - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS), datetime.min.time())
+
+
+def _scoped(q, key: FeedKey, since: datetime):
+    scope, id_ = key
+    q = q.where(and_(Booking.start_datetime >= since, Booking.status.in_(list(_FEED_STATUSES))))
+    if scope == "user":
+        return q.where(Booking.user_id == id_)
+    return q.where(Booking.court_id.in_(select(Court.id).where(Court.venue_id == id_)))
+
+
+def feed_etag(db: Session, key: FeedKey) -> str:
+    cached = etag_cache.get(key)
+    if cached is not None:
+        return cached
+
+    today = date.today()
+    last, count = db.execute(
+        _scoped(select(func.max(Booking.updated_at), func.count(Booking.id)), key, _window_start(today))
+    ).one()
+    raw = f"{key[0]}:{key[1]}:{today.isoformat()}:{last.isoformat() if last else '-'}:{count}"
+    etag = '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+    etag_cache.set(key, etag)
+    return etag
+
+
+def _court_label(number: Optional[str]) -> str:
+    # Court no tiene nombre: mismo rótulo que venues/public.py
+    return f"Cancha {number}" if number else "Cancha"
+
+
+def _summary(key: FeedKey, bk: Booking, court_name: str, venue_name: str) -> str:
+    if key[0] == "venue":
+        return f"{court_name} - Reserva #{bk.id}"
+    return f"Reserva en {venue_name} - {court_name}"
+
+
+def _feed_name(db: Session, key: FeedKey) -> str:
+    if key[0] == "user":
+        return "Mis reservas"
+    venue_name = db.execute(select(Venue.name).where(Venue.id == key[1])).scalar_one_or_none()
+    return f"Reservas - {venue_name or f'Venue {key[1]}'}"
+
+
+def stream_feed(key: FeedKey) -> Iterator[str]:
+    """
+    Generador del cuerpo del feed. Abre su propia sesión: corre mientras se
+    envía la respuesta, después de que se cerró la del request.
+    """
+    db = SessionLocal()
+    try:
+        yield ics_calendar_header("PUBLISH", name=_feed_name(db, key), refresh_minutes=settings.CALENDAR_FEED_REFRESH_MINUTES)
+        base = _scoped(
+            select(Booking, Court.number, Venue.name, Venue.address)
+            .join(Court, Court.id == Booking.court_id)
+            .join(Venue, Venue.id == Court.venue_id),
+            key, _window_start(date.today()),
+        )
+        after: Optional[Tuple[datetime, int]] = None
+        while True:
+            q = base
+            if after is not None:
+                q = q.where(tuple_(Booking.start_datetime, Booking.id) > tuple_(*after))
+            rows = db.execute(
+                q.order_by(Booking.start_datetime.asc(), Booking.id.asc())
+                .limit(settings.CALENDAR_FEED_PAGE_SIZE)
+            ).all()
+            if not rows:
+                break
+            for bk, court_number, venue_name, address in rows:
+                yield build_vevent(
+                    uid=bk.ics_uid or f"booking-{bk.id}",
+                    summary=_summary(key, bk, _court_label(court_number), venue_name),
+                    description=f"Reserva #{bk.id} - Estado: {bk.status.value}",
+                    location=address or venue_name,
+                    start_dt=bk.start_datetime,
+                    end_dt=bk.end_datetime,
+                    sequence=bk.ics_sequence or 0,
+                    status_line=_FEED_STATUSES[bk.status],
+                    dtstamp=bk.updated_at,
+                    alarm=(key[0] == "user"),
+                )
+            if len(rows) < settings.CALENDAR_FEED_PAGE_SIZE:
+                break
+            last = rows[-1][0]
+            after = (last.start_datetime, last.id)
+            db.expunge_all()  # no acumular la identidad de todas las páginas
+        yield ICS_CALENDAR_FOOTER
+    finally:
+        db.close()
+
+
+def feed_response(db: Session, key: FeedKey, if_none_match: Optional[str]) -> Response:
+    """304 si el cliente ya tiene la versión actual; si no, el feed streameado."""
+    etag = feed_etag(db, key)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.CALENDAR_FEED_REFRESH_MINUTES * 60}",
+    }
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return StreamingResponse(stream_feed(key), media_type="text/calendar; charset=utf-8", headers=headers)
@@ -0,0 +1,31 @@
+# app/domains/bookings/jobs.py
+"""Jobs periódicos de bookings (ver app/core/scheduler.py)."""
+from __future__ import annotations
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.scheduler import PeriodicScheduler
+from app.domains.bookings.service import (
+    expire_pending_bookings_svc,
+    mark_no_shows_svc,
+    purge_expired_idempotency_keys,
+)
+
+
+def run_booking_maintenance() -> None:
+    # cada corrida abre y cierra su sesión
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        expired = expire_pending_bookings_svc(db, now=now)
+        no_shows = mark_no_shows_svc(db, now=now)
+        purge_expired_idempotency_keys(db, now=now)
+        if expired or no_shows:
+            print(f"[bookings job] expiradas={expired} no_show={no_shows}")
+    finally:
+        db.close()
+
+
+def register_jobs(scheduler: PeriodicScheduler) -> None:
+    scheduler.register("bookings-maintenance", settings.BOOKING_EXPIRY_INTERVAL_SECONDS, run_booking_maintenance)
@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 
 from app.shared.enums import BookingStatusEnum
-from sqlalchemy import DateTime, Numeric, ForeignKey, Index, Enum as SAEnum, func
+from sqlalchemy import DateTime, Numeric, String, ForeignKey, Index, Enum as SAEnum, func
 from decimal import Decimal
 from typing import ClassVar, Optional, Set, Tuple, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -129,6 +129,10 @@ class Booking(Base):
     )
     price_total: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    # último cambio (ORM o UPDATE set-based): base del ETag de los feeds .ics
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
     user: Mapped["User"] = relationship(back_populates="bookings")
     court: Mapped["Court"] = relationship(back_populates="bookings")
@@ -136,10 +140,17 @@ class Booking(Base):
     ics_uid: Mapped[Optional[str]] = mapped_column(nullable=True, index=True)
     ics_sequence: Mapped[int] = mapped_column(default=0, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True, index=True)
+    # Serie semanal (ver create_booking_series); NULL para reservas sueltas
+    series_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
 
+    # En Postgres además: ex_bookings_court_no_overlap (EXCLUDE gist, solo migración)
     __table_args__ = (
-        Index("ix_bookings_court_start", "court_id", "start_datetime"),
+        # solapes/ocupación por cancha y keyset del owner (una página por cancha)
+        Index("ix_bookings_court_start_id", "court_id", "start_datetime", "id"),
         Index("ix_bookings_status_expires", "status", "expires_at"),
+        # keyset (start_datetime, id): "mis reservas" y GET /bookings sin filtros
+        Index("ix_bookings_user_start_id", "user_id", "start_datetime", "id"),
+        Index("ix_bookings_start_id", "start_datetime", "id"),
     )
 
     _state_machine: ClassVar[BookingStateMachine] = DefaultStateMachine()
@@ -217,3 +228,28 @@ class Booking(Base):
     @classmethod
     def _sm(cls) -> BookingStateMachine:
         return cls._state_machine
+
+
+class BookingIdempotencyKey(Base):
+    """
+    Idempotency-Key de POST /bookings: un reintento con la misma key (y el mismo
+    payload) devuelve la reserva original sin volver a validar, cotizar ni mandar mails.
+    La fila se inserta en la misma transacción que el booking.
+    """
+    __tablename__ = "booking_idempotency_keys"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    # sha256 del payload: misma key con otro payload es un error del cliente
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    booking_id: Mapped[Optional[int]] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    booking: Mapped[Optional["Booking"]] = relationship()
+
+    __table_args__ = (
+        Index("uq_idempotency_user_key", "user_id", "key", unique=True),
+        Index("ix_idempotency_expires", "expires_at"),
+    )
@@ -1,9 +1,34 @@
 # app/domains/bookings/repo.py
 from sqlalchemy import select, and_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 from .models import Booking
+from app.domains.venues.models import Court, Venue
+from app.domains.users.models import User
 from datetime import datetime
-from typing import Sequence, Optional
+from typing import NamedTuple, Sequence, Optional
+
+
+class BookingParties(NamedTuple):
+    booking: Booking
+    court: Court
+    venue: Venue
+    player: Optional[User]
+    owner: Optional[User]
+
+
+def load_booking_parties(db: Session, booking_id: int) -> Optional[BookingParties]:
+    """Booking + court + venue + jugador + owner en UNA query (para mails/ICS)."""
+    player = aliased(User, name="player")
+    owner = aliased(User, name="owner")
+    row = db.execute(
+        select(Booking, Court, Venue, player, owner)
+        .join(Court, Court.id == Booking.court_id)
+        .join(Venue, Venue.id == Court.venue_id)
+        .outerjoin(player, player.id == Booking.user_id)
+        .outerjoin(owner, owner.id == Venue.owner_user_id)
+        .where(Booking.id == booking_id)
+    ).first()
+    return BookingParties(*row) if row else None
 
 class BookingRepo:
     def __init__(self, db: Session):
@@ -1,74 +1,63 @@
 # app/domains/bookings/routers.py (extracto)
-from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from app.domains.bookings.service import (
     BookingListFilters,
     list_bookings_svc,
     create_booking as svc_create_booking,
+    create_booking_series as svc_create_booking_series,
     get_booking as svc_get_booking,
     update_booking as svc_update_booking,
     cancel_booking_svc,
     confirm_booking_svc,
     decline_booking_svc,
     expire_pending_bookings_svc,
-    BookingEmailContext,
+    purge_expired_idempotency_keys,
     svc_list_owner_bookings,
 )
-from app.utils.email_templates import (
-    booking_html_player_confirmed,
-    booking_html_player_cancelled,
-    booking_html_player_pending,
-)
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, select
 from typing import Optional, List
 from datetime import datetime, time, timedelta
-from app.domains.bookings.schemas import BookingCreate, BookingUpdate, BookingOut
+from app.domains.bookings.schemas import BookingCreate, BookingUpdate, BookingOut, BookingSeriesCreate, BookingSeriesOut
 from app.domains.users.models import User
-from app.domains.notifications.calendar_sender import send_booking_confirmation_with_ics
 from app.core.deps import get_db, get_current_user, require_owner
+from app.shared.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, NEXT_CURSOR_HEADER, set_next_cursor
 from app.domains.bookings.service import BookingListFilters, list_bookings_svc
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 @router.post("", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
-def create_booking(payload: BookingCreate, background_tasks: BackgroundTasks,
+def create_booking(payload: BookingCreate, response: Response,
+                   idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
                    db: Session = Depends(get_db), user=Depends(get_current_user)):
-    bk, ctx = svc_create_booking(
+    # El mail de "pendiente" se encola en el outbox dentro de la misma transacción
+    bk, created = svc_create_booking(
         db=db,
         user_id=user.id,
         court_id=payload.court_id,
         start=payload.start_datetime,
         end=payload.end_datetime,
         status_=payload.status,   # si viene None, el service lo fuerza a PENDING
+        idempotency_key=idempotency_key,
     )
+    if not created:
+        # reintento con la misma Idempotency-Key: misma reserva, sin reenviar mails
+        response.headers["Idempotent-Replayed"] = "true"
+    return bk
 
-    # HTML para “pendiente”
-    html = booking_html_player_pending(
-        player_name=None,
-        venue_name=ctx.venue_name,
-        court_name=ctx.court_label,
-        start=ctx.start_dt,
-        end=ctx.end_dt,
-        price=ctx.price_total,
+@router.post("/series", response_model=BookingSeriesOut, status_code=status.HTTP_201_CREATED)
+def create_booking_series(payload: BookingSeriesCreate,
+                          db: Session = Depends(get_db), user=Depends(get_current_user)):
+    # Un solo mail para toda la serie (encolado), con el evento recurrente en el .ics
+    series_id, bookings = svc_create_booking_series(
+        db=db,
+        user_id=user.id,
+        court_id=payload.court_id,
+        start=payload.start_datetime,
+        end=payload.end_datetime,
+        weeks=payload.weeks,
     )
-
-    # Enviá mails distintos si querés; por simplicidad mandamos uno genérico con estado pendiente
-    if ctx.owner_email or ctx.player_email:
-        background_tasks.add_task(
-            send_booking_confirmation_with_ics,
-            to_owner=ctx.owner_email,
-            to_player=ctx.player_email,
-            html_body=html,
-            subject="Tu reserva está pendiente de confirmación ⏳",
-            summary=f"Reserva en {ctx.venue_name} - {ctx.court_label} (pendiente)",
-            description=f"Reserva #{ctx.booking_id} pendiente. Precio: $ {ctx.price_total:,.0f} ARS",
-            location=ctx.venue_address or ctx.venue_name,
-            start_dt=ctx.start_dt,
-            end_dt=ctx.end_dt,
-            organizer_email=ctx.organizer_email,
-        )
-
-    return bk
+    return BookingSeriesOut(series_id=series_id, bookings=[BookingOut.model_validate(b) for b in bookings])
 
 @router.get("/{booking_id}", response_model=BookingOut)
 def get_booking(booking_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
@@ -76,11 +65,14 @@ def get_booking(booking_id: int, db: Session = Depends(get_db), user=Depends(get
 
 @router.get("", response_model=List[BookingOut])
 def list_bookings(
+    response: Response,
     court_id: Optional[int] = None,
     user_id: Optional[int] = None,
     mine: bool = False,
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description=f"Valor de {NEXT_CURSOR_HEADER} de la página anterior"),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -92,7 +84,9 @@ def list_bookings(
         date_to=date_to,
         requester_user_id=user.id,
     )
-    return list_bookings_svc(db, filters)
+    rows, next_cursor = list_bookings_svc(db, filters, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return rows
 
 @router.patch("/{booking_id}", response_model=BookingOut)
 def update_booking(booking_id: int, payload: BookingUpdate,
@@ -113,14 +107,19 @@ def cancel_booking(booking_id: int, db: Session = Depends(get_db), user=Depends(
 
 @router.get("/admin/bookings", response_model=list[dict], dependencies=[Depends(require_owner)])
 def owner_bookings(
+    response: Response,
     from_: str | None = Query(None, alias="from"),
     to_: str | None = Query(None, alias="to"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description=f"Valor de {NEXT_CURSOR_HEADER} de la página anterior"),
     db: Session = Depends(get_db),
     me = Depends(get_current_user),
 ):
     from_dt = datetime.fromisoformat(from_) if from_ else None
     to_dt   = datetime.fromisoformat(to_) if to_ else None
-    rows = svc_list_owner_bookings(db, owner_id=me.id, from_dt=from_dt, to_dt=to_dt)
+    rows, next_cursor = svc_list_owner_bookings(db, owner_id=me.id, from_dt=from_dt, to_dt=to_dt,
+                                                limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
     # conservamos el payload de respuesta que ya tenías (dicts)
     return [
         {
@@ -153,8 +152,10 @@ def cancel_booking_ep(booking_id: int, db: Session = Depends(get_db), user=Depen
     bk = cancel_booking_svc(db, booking_id, actor=user, now=datetime.utcnow(), late_window_hours=24)
     return bk
 
-# Admin/dev: barrer expiradas PENDING (simulación cron)
+# Admin/dev: barrer expiradas PENDING ya (el job de app/domains/bookings/jobs.py lo hace solo)
 @router.post("/admin/expire-now", response_model=dict, dependencies=[Depends(require_owner)])
 def expire_now_ep(db: Session = Depends(get_db)):
-    n = expire_pending_bookings_svc(db, now=datetime.utcnow())
+    now = datetime.utcnow()
+    n = expire_pending_bookings_svc(db, now=now)
+    purge_expired_idempotency_keys(db, now=now)
     return {"expired": n}
\ No newline at end of file
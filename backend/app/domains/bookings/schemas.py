@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.shared.enums import BookingStatusEnum
 
@@ -17,6 +17,12 @@ class BookingUpdate(BaseModel):
     end_datetime: Optional[datetime] = None
     status: Optional[BookingStatusEnum] = None
 
+class BookingSeriesCreate(BaseModel):
+    court_id: int = Field(..., description="ID de la cancha reservada")
+    start_datetime: datetime = Field(..., description="Inicio de la primera ocurrencia")
+    end_datetime: datetime = Field(..., description="Fin de la primera ocurrencia")
+    weeks: int = Field(..., ge=2, le=52, description="Cantidad de ocurrencias semanales (incluye la primera)")
+
 class BookingOut(BaseModel):
     id: int
     user_id: int
@@ -26,6 +32,15 @@ class BookingOut(BaseModel):
     status: BookingStatusEnum
     price_total: float
     created_at: datetime
+    series_id: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+class BookingSeriesOut(BaseModel):
+    series_id: str
+    bookings: List[BookingOut]
+
+class CalendarFeedOut(BaseModel):
+    url: str = Field(..., description="URL para suscribirse desde Google Calendar / Apple / Outlook")
+    token: str
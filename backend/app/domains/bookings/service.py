@@ -1,36 +1,38 @@
 # app/domains/bookings/service.py
 from __future__ import annotations
+import hashlib
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
 from typing import Optional
-from sqlalchemy import and_, select, or_, func, literal_column, tuple_
+from uuid import uuid4
+from sqlalchemy import and_, delete, select, update, or_, func, literal_column, tuple_
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.domains.notifications.booking_state import notify_booking_state_change
-from app.domains.bookings.models import Booking
+from app.domains.notifications.booking_state import (
+    enqueue_booking_created,
+    enqueue_booking_state_change,
+    enqueue_booking_state_changes,
+    StateChange,
+)
+from app.core.config import settings
+from app.domains.bookings.models import Booking, BookingIdempotencyKey
 from app.domains.venues.models import Court, Venue
 from app.domains.users.models import User
 from app.domains.schedules.models import CourtSchedule
-from app.domains.pricing.models import Price
+from app.domains.pricing.service import get_price_table, quote_slots, quote_booking
+from app.domains.scheduling.service import invalidate_availability
+from app.domains.bookings.calendar_feed import invalidate_calendar_feeds
+from app.domains.scheduling import occupancy
+from app.domains.scheduling.models import CourtOccupancy
 from app.shared.enums import BookingStatusEnum
+from app.shared.pagination import DEFAULT_PAGE_LIMIT, keyset_merge_page, keyset_page
 
 # -------------------------
 # Email context (para ICS/mail)
 # -------------------------
-@dataclass
-class BookingEmailContext:
-    booking_id: int
-    venue_name: str
-    court_label: str
-    venue_address: str
-    start_dt: datetime
-    end_dt: datetime
-    price_total: float
-    owner_email: Optional[str]
-    player_email: Optional[str]
-    organizer_email: Optional[str]  # owner o genérico del sistema
-
 # ------------ Filtros para list ------------
 @dataclass
 class BookingListFilters:
@@ -49,6 +51,11 @@ def _time_of(dt: datetime) -> time: return dt.time()
 def _duration_minutes(s: datetime, e: datetime) -> int: return int((e - s).total_seconds() // 60)
 def _aligned_to_slot(start: datetime, slot: int) -> bool: return (start.minute % slot) == 0 and start.second == 0 and start.microsecond == 0
 
+def _invalidate_booking_caches(db: Session, court_id: int, *starts: datetime, user_id: Optional[int] = None) -> None:
+    # Las reservas no cruzan días: alcanza con la fecha de inicio
+    invalidate_availability(court_id, *{s.date() for s in starts})
+    invalidate_calendar_feeds(db, [(court_id, user_id)])
+
 def _get_court_or_404(db: Session, court_id: int) -> Court:
     court = db.get(Court, court_id)
     if not court: raise HTTPException(404, "Court no encontrada")
@@ -70,7 +77,7 @@ def _ensure_owner_of_court(db: Session, actor: User, court_id: int):
     if getattr(actor, "role", None) != "ADMIN" and venue.owner_user_id != actor.id:
         raise HTTPException(403, "No sos owner de este venue")
 
-def _validate_within_schedule(db: Session, court_id: int, start: datetime, end: datetime):
+def _validate_within_schedule(db: Session, court_id: int, start: datetime, end: datetime) -> CourtSchedule:
     wd = _weekday_of(start)
     if _weekday_of(end) != wd:
         raise HTTPException(422, "La reserva no puede cruzar días. Usa un solo día por booking.")
@@ -88,93 +95,213 @@ def _validate_within_schedule(db: Session, court_id: int, start: datetime, end:
         raise HTTPException(422, f"La duración debe ser múltiplo de {sched.slot_minutes} minutos.")
     if not _aligned_to_slot(start, sched.slot_minutes):
         raise HTTPException(422, f"La hora de inicio debe estar alineada a bloques de {sched.slot_minutes} minutos (mm % {sched.slot_minutes} == 0).")
-
-def _assert_no_overlap(db: Session, court_id: int, start: datetime, end: datetime, exclude_id: Optional[int] = None):
-    q = select(Booking).where(
-        and_(
-            Booking.court_id == court_id,
-            Booking.status.in_(Booking.blocking_statuses()),
-            Booking.start_datetime < end,
-            Booking.end_datetime > start,
+    return sched
+
+def _assert_no_overlap(db: Session, court_id: int, start: datetime, end: datetime, slot_minutes: int,
+                       exclude: Optional[Booking] = None) -> CourtOccupancy:
+    # Lockea el bitmap del día (FOR UPDATE) hasta el commit del caller
+    occ = occupancy.lock_day(db, court_id, start.date(), slot_minutes)
+    own = None
+    if exclude is not None and exclude.is_active and exclude.start_datetime.date() == start.date():
+        own = (exclude.start_datetime, exclude.end_datetime)
+    if not occupancy.is_free(occ, start, end, exclude=own):
+        raise HTTPException(status.HTTP_409_CONFLICT, "La franja horaria ya está reservada para esa cancha.")
+    return occ
+
+# SQLSTATE de Postgres: lock_not_available (lock_timeout) y exclusion_violation
+_PG_LOCK_NOT_AVAILABLE = "55P03"
+_PG_EXCLUSION_VIOLATION = "23P01"
+
+def _sqlstate(exc: Exception) -> Optional[str]:
+    return getattr(getattr(exc, "orig", None), "sqlstate", None)
+
+@contextmanager
+def _slot_conflicts_as_409(db: Session):
+    """
+    Traduce a 409 los conflictos que resuelve la DB: timeout esperando el lock del
+    día (contención) o la constraint de exclusión (solapamiento). Sin reintentos
+    del lado del server: el cliente decide, con Retry-After como pista.
+    """
+    try:
+        yield
+    except OperationalError as e:
+        if _sqlstate(e) != _PG_LOCK_NOT_AVAILABLE:
+            raise
+        db.rollback()
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            "La cancha está recibiendo otras reservas en este momento. Probá de nuevo.",
+            headers={"Retry-After": "1"},
         )
-    )
-    if exclude_id is not None:
-        q = q.where(Booking.id != exclude_id)
-    if db.execute(q).first():
+    except IntegrityError as e:
+        if _sqlstate(e) != _PG_EXCLUSION_VIOLATION:
+            raise
+        db.rollback()
         raise HTTPException(status.HTTP_409_CONFLICT, "La franja horaria ya está reservada para esa cancha.")
 
-def _compute_price_total(db: Session, court_id: int, start: datetime, end: datetime) -> float:
-    wd = _weekday_of(start)
-    if _weekday_of(end) != wd:
-        raise HTTPException(422, "La reserva no puede cruzar días.")
-    sched: CourtSchedule | None = db.execute(
-        select(CourtSchedule).where(and_(CourtSchedule.court_id == court_id, CourtSchedule.weekday == wd))
+def _release_if_unblocked(db: Session, bk: Booking, was_active: bool) -> None:
+    if was_active and not bk.is_active:
+        occupancy.release_bookings(db, [(bk.court_id, bk.start_datetime, bk.end_datetime)])
+
+# -------------------------
+# Idempotency-Key
+# -------------------------
+def _request_fingerprint(court_id: int, start: datetime, end: datetime,
+                         status_: Optional[BookingStatusEnum]) -> str:
+    raw = f"{court_id}|{start.isoformat()}|{end.isoformat()}|{status_.value if status_ else ''}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def _find_idempotent_booking(db: Session, user_id: int, key: str, fingerprint: str,
+                             now: datetime) -> Optional[Booking]:
+    row = db.execute(
+        select(BookingIdempotencyKey).where(
+            and_(BookingIdempotencyKey.user_id == user_id, BookingIdempotencyKey.key == key)
+        )
     ).scalar_one_or_none()
-    if not sched:
-        raise HTTPException(422, "No hay horario definido para ese día.")
-    slot = sched.slot_minutes
-    total_min = _duration_minutes(start, end)
-    slots = total_min // slot
-    if slots <= 0: raise HTTPException(422, "Duración inválida.")
-
-    total = 0.0
-    for i in range(slots):
-        s_i = start + timedelta(minutes=i * slot)
-        e_i = s_i + timedelta(minutes=slot)
-        s_t, e_t = _time_of(s_i), _time_of(e_i)
-        rule = db.execute(
-            select(Price).where(and_(Price.court_id == court_id, Price.weekday == wd,
-                                     Price.start_time <= s_t, Price.end_time >= e_t))
-        ).scalar_one_or_none()
-        if not rule:
-            raise HTTPException(422, f"No hay regla de precio que cubra el slot {s_t.strftime('%H:%M')}–{e_t.strftime('%H:%M')}.")
-        total += float(rule.price_per_slot)
-    return round(total, 2)
+    if row is None:
+        return None
+    if row.expires_at <= now:
+        # vencida: se libera la key para este intento
+        db.delete(row)
+        db.flush()
+        return None
+    if row.request_hash != fingerprint:
+        raise HTTPException(422, "La Idempotency-Key ya se usó con otros datos de reserva.")
+    return row.booking
+
+def _claim_idempotency_key(db: Session, user_id: int, key: str, fingerprint: str,
+                           now: datetime) -> Optional[BookingIdempotencyKey]:
+    """
+    Inserta la key antes de reservar. Un reintento concurrente se bloquea en el índice
+    único hasta que el primero termina: si commiteó, devuelve None (hay que reproducir
+    su respuesta); si falló, la key queda libre y este intento sigue normalmente.
+    """
+    row = BookingIdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=fingerprint,
+        created_at=now,
+        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    )
+    try:
+        with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        return None
+    return row
+
+def purge_expired_idempotency_keys(db: Session, now: Optional[datetime] = None) -> int:
+    now = now or datetime.utcnow()
+    res = db.execute(delete(BookingIdempotencyKey).where(BookingIdempotencyKey.expires_at <= now))
+    db.commit()
+    return res.rowcount or 0
 
 # -------------------------
 # API del Service
 # -------------------------
 def create_booking(db: Session, user_id: int, court_id: int, start: datetime, end: datetime,
-                   status_: Optional[BookingStatusEnum] = None) -> tuple[Booking, BookingEmailContext]:
+                   status_: Optional[BookingStatusEnum] = None,
+                   idempotency_key: Optional[str] = None) -> tuple[Booking, bool]:
+    """
+    Devuelve (booking, created). Con `idempotency_key`, un reintento devuelve
+    (booking original, False): no se vuelve a encolar la notificación.
+    """
+    key_row: Optional[BookingIdempotencyKey] = None
+    if idempotency_key:
+        now = datetime.utcnow()
+        fingerprint = _request_fingerprint(court_id, start, end, status_)
+        prior = _find_idempotent_booking(db, user_id, idempotency_key, fingerprint, now)
+        if prior is None:
+            key_row = _claim_idempotency_key(db, user_id, idempotency_key, fingerprint, now)
+            if key_row is None:
+                # otra request con la misma key ganó la carrera y ya commiteó
+                prior = _find_idempotent_booking(db, user_id, idempotency_key, fingerprint, now)
+                if prior is None:
+                    raise HTTPException(status.HTTP_409_CONFLICT, "Ya hay una reserva en curso con esa Idempotency-Key.")
+        if prior is not None:
+            return prior, False
+
     court = _get_court_or_404(db, court_id)
-    _validate_within_schedule(db, court.id, start, end)
-    _assert_no_overlap(db, court.id, start, end)
-    price = _compute_price_total(db, court.id, start, end)
+    sched = _validate_within_schedule(db, court.id, start, end)
+    with _slot_conflicts_as_409(db):
+        occ = _assert_no_overlap(db, court.id, start, end, sched.slot_minutes)
+        price = quote_booking(db, court.id, start, end, sched.slot_minutes)
+
+        now = datetime.utcnow()
+
+        bk = Booking(
+            user_id=user_id,
+            court_id=court.id,
+            start_datetime=start,
+            end_datetime=end,
+            price_total=price,
+            status=status_ or BookingStatusEnum.PENDING,
+            expires_at=now + timedelta(minutes=20),
 
-    now = datetime.utcnow()
+        )
+        db.add(bk)
+        if key_row is not None:
+            key_row.booking = bk
+        if bk.is_active:
+            occupancy.occupy(occ, start, end)
+        enqueue_booking_created(db, bk)
+        db.commit()
+    db.refresh(bk)
+    _invalidate_booking_caches(db, bk.court_id, bk.start_datetime, user_id=bk.user_id)
 
-    bk = Booking(
-        user_id=user_id,
-        court_id=court.id,
-        start_datetime=start,
-        end_datetime=end,
-        price_total=price,
-        status=status_ or BookingStatusEnum.PENDING,
-        expires_at=now + timedelta(minutes=20),
+    return bk, True
 
-    )
-    db.add(bk)
-    db.commit()
-    db.refresh(bk)
+def create_booking_series(db: Session, user_id: int, court_id: int, start: datetime, end: datetime,
+                          weeks: int) -> tuple[str, list[Booking]]:
+    """
+    Serie semanal de `weeks` ocurrencias en UNA transacción. Todas caen en el mismo
+    weekday y horario, así que alcanza con validar schedule y precio una vez; el
+    solapamiento se chequea contra los bitmaps de todos los días (un SELECT ... FOR UPDATE).
+    """
+    court = _get_court_or_404(db, court_id)
+    sched = _validate_within_schedule(db, court.id, start, end)
+    occurrences = [(start + timedelta(weeks=i), end + timedelta(weeks=i)) for i in range(weeks)]
+
+    with _slot_conflicts_as_409(db):
+        occs = occupancy.lock_days(db, court.id, [s.date() for s, _ in occurrences], sched.slot_minutes)
+        taken = [s for s, e in occurrences if not occupancy.is_free(occs[s.date()], s, e)]
+        if taken:
+            raise HTTPException(
+                status.HTTP_409_CONFLICT,
+                "La franja horaria ya está reservada en: " + ", ".join(s.strftime("%d/%m/%Y %H:%M") for s in taken),
+            )
+
+        table = get_price_table(db, court.id)
+        price = quote_slots(table.for_weekday(start.weekday()), start, end, sched.slot_minutes)
+
+        now = datetime.utcnow()
+        series_id = str(uuid4())
+        bookings = [
+            Booking(
+                user_id=user_id,
+                court_id=court.id,
+                start_datetime=s,
+                end_datetime=e,
+                price_total=price,
+                status=BookingStatusEnum.PENDING,
+                expires_at=now + timedelta(minutes=20),
+                series_id=series_id,
+            )
+            for s, e in occurrences
+        ]
+        db.add_all(bookings)
+        for s, e in occurrences:
+            occupancy.occupy(occs[s.date()], s, e)
+        # un solo mail para toda la serie (el .ics lleva RRULE)
+        enqueue_booking_created(db, bookings[0], weeks=weeks)
+        db.commit()
+    # una sola query para recargar la serie (en vez de un refresh por ocurrencia)
+    bookings = list(db.execute(
+        select(Booking).where(Booking.series_id == series_id).order_by(Booking.start_datetime.asc())
+    ).scalars().all())
+    _invalidate_booking_caches(db, court_id, *(s for s, _ in occurrences), user_id=user_id)
 
-    # Armar contexto para email/ICS
-    venue: Venue | None = db.get(Venue, court.venue_id) if hasattr(court, "venue_id") else None
-    owner: User | None = db.get(User, venue.owner_user_id) if (venue and getattr(venue, "owner_user_id", None)) else None
-    player: User | None = db.get(User, user_id)
-
-    ctx = BookingEmailContext(
-        booking_id=bk.id,
-        venue_name=(getattr(venue, "name", f"Venue {venue.id if venue else ''}") or "").strip(),
-        court_label=getattr(court, "name", f"Court {court.id}"),
-        venue_address=getattr(venue, "address", getattr(venue, "name", "")) if venue else "",
-        start_dt=bk.start_datetime,
-        end_dt=bk.end_datetime,
-        price_total=float(bk.price_total or 0),
-        owner_email=(owner.email if owner and owner.email else None),
-        player_email=(player.email if player and player.email else None),
-        organizer_email=(owner.email if owner and owner.email else (player.email if player and player.email else None)),
-    )
-    return bk, ctx
+    return series_id, bookings
 
 def update_booking(db: Session, booking_id: int,
                    new_start: Optional[datetime] = None,
@@ -182,24 +309,35 @@ def update_booking(db: Session, booking_id: int,
                    new_status: Optional[BookingStatusEnum] = None) -> Booking:
     bk = _get_booking_or_404(db, booking_id)
 
+    old_start, old_end = bk.start_datetime, bk.end_datetime
     start = new_start or bk.start_datetime
     end   = new_end or bk.end_datetime
 
     # si cambia la ventana, recalcular y validar
-    if (new_start is not None) or (new_end is not None):
-        _validate_within_schedule(db, bk.court_id, start, end)
-        _assert_no_overlap(db, bk.court_id, start, end, exclude_id=bk.id)
-        bk.start_datetime, bk.end_datetime = start, end
-        bk.price_total = _compute_price_total(db, bk.court_id, start, end)
+    with _slot_conflicts_as_409(db):
+        if (new_start is not None) or (new_end is not None):
+            sched = _validate_within_schedule(db, bk.court_id, start, end)
+            occ = _assert_no_overlap(db, bk.court_id, start, end, sched.slot_minutes, exclude=bk)
+            if bk.is_active:
+                occupancy.release_bookings(db, [(bk.court_id, old_start, old_end)])
+                occupancy.occupy(occ, start, end)
+            bk.start_datetime, bk.end_datetime = start, end
+            bk.price_total = quote_booking(db, bk.court_id, start, end, sched.slot_minutes)
 
-    db.commit(); db.refresh(bk)
+        db.commit()
+    db.refresh(bk)
+    _invalidate_booking_caches(db, bk.court_id, bk.start_datetime, old_start, user_id=bk.user_id)
     return bk
 
 def cancel_booking(db: Session, booking_id: int) -> None:
     bk = _get_booking_or_404(db, booking_id)
     if bk.status != BookingStatusEnum.CANCELLED:
+        was_active = bk.is_active
         bk.status = BookingStatusEnum.CANCELLED
+        _release_if_unblocked(db, bk, was_active)
+        court_id, start, user_id = bk.court_id, bk.start_datetime, bk.user_id
         db.commit()
+        _invalidate_booking_caches(db, court_id, start, user_id=user_id)
 
 def get_booking(db: Session, booking_id: int) -> Booking:
     return _get_booking_or_404(db, booking_id)
@@ -241,7 +379,9 @@ def list_owner_bookings(db: Session, owner_id: int,
     return list(db.scalars(q).all())
 
     # --- SERVICE ---
-def list_bookings_svc(db: Session, filters: BookingListFilters) -> list[Booking]:
+def list_bookings_svc(db: Session, filters: BookingListFilters,
+                      limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None) -> tuple[list[Booking], Optional[str]]:
+    """Página keyset por (start_datetime, id): (bookings, next_cursor)."""
     q = select(Booking)
     effective_user_id = filters.user_id
     if filters.mine and filters.requester_user_id:
@@ -254,8 +394,7 @@ def list_bookings_svc(db: Session, filters: BookingListFilters) -> list[Booking]
         q = q.where(Booking.start_datetime >= filters.date_from)
     if filters.date_to is not None:
         q = q.where(Booking.start_datetime < filters.date_to)
-    q = q.order_by(Booking.start_datetime.asc())
-    return db.execute(q).scalars().all()
+    return keyset_page(db, q, Booking.start_datetime, Booking.id, limit, cursor)
 
 # ---------- CONFIRMAR (OWNER) ----------
 def confirm_booking_svc(db: Session, booking_id: int, actor: User, now: Optional[datetime] = None) -> Booking:
@@ -269,12 +408,10 @@ def confirm_booking_svc(db: Session, booking_id: int, actor: User, now: Optional
 
     old = bk.status
     bk.confirm(by_user_id=actor.id, at=now)
+    enqueue_booking_state_change(db, bk, old, bk.status)
 
     db.commit(); db.refresh(bk)
-    try:
-        notify_booking_state_change(bk.id, old, bk.status)
-    except Exception as e:
-        print(f"[notify confirm] #{bk.id}: {e}")
+    _invalidate_booking_caches(db, bk.court_id, bk.start_datetime, user_id=bk.user_id)
 
     return bk
 
@@ -294,11 +431,10 @@ def decline_booking_svc(db: Session, booking_id: int, actor: User, now: Optional
             raise HTTPException(409, f"No se puede declinar en estado {bk.status}")
         bk.status = BookingStatusEnum.CANCELLED
 
+    _release_if_unblocked(db, bk, was_active=old in Booking.blocking_statuses())
+    enqueue_booking_state_change(db, bk, old, bk.status)
     db.commit(); db.refresh(bk)
-    try:
-        notify_booking_state_change(bk.id, old, bk.status)
-    except Exception as e:
-        print(f"[notify decline] #{bk.id}: {e}")
+    _invalidate_booking_caches(db, bk.court_id, bk.start_datetime, user_id=bk.user_id)
     return bk
 
 # ---------- CANCELAR (USER) ----------
@@ -314,50 +450,102 @@ def cancel_booking_svc(db: Session, booking_id: int, actor: User,
         raise HTTPException(409, f"No se puede cancelar: {why}")
     old = bk.status
     bk.cancel(by_user_id=actor.id, now=now, late_window_hours=late_window_hours)
+    _release_if_unblocked(db, bk, was_active=old in Booking.blocking_statuses())
+    enqueue_booking_state_change(db, bk, old, bk.status)
 
     db.commit(); db.refresh(bk)
-    try:
-        notify_booking_state_change(bk.id, old, bk.status)
-    except Exception as e:
-        print(f"[notify cancel] #{bk.id}: {e}")
+    _invalidate_booking_caches(db, bk.court_id, bk.start_datetime, user_id=bk.user_id)
     return bk
 
 # ---------- EXPIRAR (JOB/CRON) ----------
-def expire_pending_bookings_svc(db: Session, now: Optional[datetime] = None) -> int:
-    now = now or datetime.utcnow()
-    q = select(Booking).where(
-        and_(Booking.status == BookingStatusEnum.PENDING,
-             Booking.expires_at != None,
-             Booking.expires_at <= now)
+# Mismo destino que DefaultStateMachine.expire (PENDING -> CANCELLED)
+_EXPIRED_STATUS = BookingStatusEnum.CANCELLED
+
+def _pick_batch(where, order_by, batch_size: int):
+    # SKIP LOCKED: varios workers (o el botón de admin) pueden correr a la vez sin pisarse
+    return (
+        select(Booking.id).where(where).order_by(order_by).limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
     )
-    rows = db.execute(q).scalars().all()
+
+def expire_pending_bookings_svc(db: Session, now: Optional[datetime] = None,
+                                batch_size: Optional[int] = None) -> int:
+    """
+    UPDATE ... RETURNING por lotes de `batch_size`, un commit por lote: no hidrata
+    objetos ORM y no sostiene locks sobre todas las filas a la vez. Por lote libera
+    el bitmap, encola las notificaciones e invalida la disponibilidad.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.BOOKING_EXPIRY_BATCH_SIZE
+    due = and_(Booking.status == BookingStatusEnum.PENDING,
+               Booking.expires_at != None,
+               Booking.expires_at <= now)
+
+    changed = 0
+    while True:
+        rows = db.execute(
+            update(Booking)
+            .where(Booking.id.in_(_pick_batch(due, Booking.expires_at.asc(), batch_size)))
+            .values(status=_EXPIRED_STATUS, ics_sequence=Booking.ics_sequence + 1)
+            .returning(Booking.id, Booking.court_id, Booking.start_datetime, Booking.end_datetime,
+                       Booking.ics_uid, Booking.ics_sequence, Booking.user_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not rows:
+            break
+
+        occupancy.release_bookings(db, [(court_id, s, e) for _, court_id, s, e, *_ in rows])
+        # 👈 notificar por cada booking, vía outbox en la misma transacción
+        enqueue_booking_state_changes(db, [
+            StateChange(bid, court_id, BookingStatusEnum.PENDING, _EXPIRED_STATUS, uid, seq)
+            for bid, court_id, _, _, uid, seq, _ in rows
+        ], digest_kind="expired")
+        db.commit()
+        changed += len(rows)
+
+        for court_id, day in {(court_id, s.date()) for _, court_id, s, *_ in rows}:
+            invalidate_availability(court_id, day)
+        invalidate_calendar_feeds(db, {(court_id, user_id) for _, court_id, *_, user_id in rows})
+
+        if len(rows) < batch_size:
+            break
+
+    return changed
+
+def mark_no_shows_svc(db: Session, now: Optional[datetime] = None,
+                      after_minutes: Optional[int] = None,
+                      batch_size: Optional[int] = None) -> int:
+    """
+    CONFIRMED que terminaron hace más de `after_minutes` -> NO_SHOW, por lotes.
+    Solo corre si está configurado (BOOKING_NO_SHOW_AFTER_MINUTES). Son turnos
+    pasados: no se toca el bitmap ni se notifica, pero el estado cambia en los
+    feeds .ics (se invalidan como en la expiración).
+    """
+    after_minutes = settings.BOOKING_NO_SHOW_AFTER_MINUTES if after_minutes is None else after_minutes
+    if after_minutes is None:
+        return 0
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.BOOKING_EXPIRY_BATCH_SIZE
+    due = and_(Booking.status == BookingStatusEnum.CONFIRMED,
+               Booking.end_datetime <= now - timedelta(minutes=after_minutes))
 
     changed = 0
-    changes: list[tuple[int, BookingStatusEnum, BookingStatusEnum]] = []  # (id, old, new)
-
-    for bk in rows:
-        old = bk.status
-        if hasattr(bk._sm(), "expire"):
-            try:
-                bk._sm().expire(bk, at=now)  # ideal → EXPIRED
-                changed += 1
-                changes.append((bk.id, old, bk.status))
-            except Exception:
-                pass
-        else:
-            if bk.status == BookingStatusEnum.PENDING:
-                bk.status = BookingStatusEnum.CANCELLED
-                changed += 1
-                changes.append((bk.id, old, bk.status))
-
-    if changed:
+    while True:
+        rows = db.execute(
+            update(Booking)
+            .where(Booking.id.in_(_pick_batch(due, Booking.end_datetime.asc(), batch_size)))
+            .values(status=BookingStatusEnum.NO_SHOW)
+            .returning(Booking.court_id, Booking.user_id)
+            .execution_options(synchronize_session=False)
+        ).all()
         db.commit()
-        for bid, old_status, new_status in changes:  # 👈 notificar por cada booking
-            try:
-                notify_booking_state_change(bid, old_status, new_status)
-            except Exception as e:
-                print(f"[notify expire] booking #{bid}: {e}")
+        changed += len(rows)
+
+        invalidate_calendar_feeds(db, set(rows))
 
+        if len(rows) < batch_size:
+            break
     return changed
 
 def svc_list_owner_bookings(
@@ -365,23 +553,24 @@ def svc_list_owner_bookings(
     owner_id: int,
     from_dt: Optional[datetime] = None,
     to_dt: Optional[datetime] = None,
-) -> list[Booking]:
-
-    v_ids = owned_venue_ids(db, owner_id)
-    if not v_ids:
-        return []
-
-    q = (
-        select(Booking)
-        .join(Court, Court.id == Booking.court_id)
-        .where(Court.venue_id.in_(v_ids))
-    )
-
-    if from_dt is not None:
-        q = q.where(Booking.start_datetime >= from_dt)
-    if to_dt is not None:
-        q = q.where(Booking.start_datetime < to_dt)
-
-    q = q.order_by(Booking.start_datetime.asc())
-
-    return list(db.execute(q).scalars().all())
\ No newline at end of file
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+) -> tuple[list[Booking], Optional[str]]:
+    # una página por cancha sobre ix_bookings_court_start_id y merge por (start, id):
+    # con `court_id IN (...)` la DB no puede seguir el orden del índice
+    court_ids = db.scalars(
+        select(Court.id)
+        .join(Venue, Venue.id == Court.venue_id)
+        .where(Venue.owner_user_id == owner_id)
+    ).all()
+
+    def per_court(court_id: int):
+        q = select(Booking).where(Booking.court_id == court_id)
+        if from_dt is not None:
+            q = q.where(Booking.start_datetime >= from_dt)
+        if to_dt is not None:
+            q = q.where(Booking.start_datetime < to_dt)
+        return q
+
+    return keyset_merge_page(db, (per_court(c) for c in court_ids),
+                             Booking.start_datetime, Booking.id, limit, cursor)
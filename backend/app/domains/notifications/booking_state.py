@@ -1,24 +1,27 @@
 # app/notifications/booking_state.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Literal
 from datetime import datetime
-from sqlalchemy.orm import Session
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 from uuid import uuid4
 
-from app.core.db import SessionLocal
 from app.domains.bookings.models import Booking
-from app.domains.venues.models import Court, Venue
+from app.domains.bookings.repo import BookingParties, load_booking_parties
+from app.domains.notifications.models import NotificationOutbox, OwnerDigestEvent
 from app.domains.users.models import User
+from app.domains.venues.models import Court, Venue
+from app.domains.notifications.outbox import enqueue, register_handler, update_payload
+from app.domains.notifications.rendering import RenderedEvent, RenderedMail, pending_sends, render_event
 from app.shared.enums import BookingStatusEnum
 from app.utils.email_templates import (
     booking_html_for_owner,
     booking_html_player_confirmed,
     booking_html_player_cancelled,
     booking_html_player_pending,
+    booking_html_player_series_pending,
 )
-from app.utils.email_smtp import send_html_email_gmail  # tu sender con ICS adjunto
 
 CalendarMethod = Literal["REQUEST", "CANCEL", "PUBLISH"]
 
@@ -30,22 +33,22 @@ class MailParams:
     method: CalendarMethod  # ICS METHOD
     add_button: bool = True
 
-def _load_ctx(db: Session, booking_id: int):
-    bk: Booking | None = db.get(Booking, booking_id)
-    if not bk:
-        return None
-    court: Court | None = db.get(Court, bk.court_id)
-    venue: Venue | None = (db.get(Venue, court.venue_id) if court else None)
-    player: User | None = db.get(User, bk.user_id)
-    owner: User | None = (db.get(User, venue.owner_user_id) if venue and getattr(venue, "owner_user_id", None) else None)
-    return bk, court, venue, player, owner
-
-def _ensure_uid_sequence(db: Session, bk: Booking):
-    # Inicializa UID si no existe; incrementa sequence para cada notificación
+RECIPIENTS = ("player", "owner")
+
+def _ensure_uid_sequence(bk: Booking):
+    # Inicializa UID si no existe; incrementa sequence para cada notificación.
+    # Se commitea junto con el cambio de estado (no en el worker).
     if not getattr(bk, "ics_uid", None):
         bk.ics_uid = str(uuid4())
     bk.ics_sequence = (bk.ics_sequence or 0) + 1
-    db.commit(); db.refresh(bk)
+
+def _event_uid(bk: Booking, uid: Optional[str]) -> str:
+    # filas viejas sin ics_uid: UID determinístico para que igual se actualicen entre sí
+    return uid or bk.ics_uid or f"booking-{bk.id}"
+
+def _recipient_email(parties: BookingParties, recipient: str) -> Optional[str]:
+    user = parties.player if recipient == "player" else parties.owner
+    return user.email if user and user.email else None
 
 def _mail_params_for_transition(old: BookingStatusEnum, new: BookingStatusEnum) -> MailParams | None:
     # Definí asunto/ICS METHOD por transición de estado
@@ -80,107 +83,244 @@ def _mail_params_for_transition(old: BookingStatusEnum, new: BookingStatusEnum)
 
     return None
 
-def notify_booking_state_change(booking_id: int, old_status: BookingStatusEnum, new_status: BookingStatusEnum) -> None:
-    if old_status == new_status:
-        return
+# -------------------------
+# Encolar (en la transacción del caller)
+# -------------------------
+# UID/SEQUENCE se fijan al encolar: el worker puede correr después de otros
+# cambios y el ICS tiene que describir ESTE evento.
+class OwnerRoute(NamedTuple):
+    owner_id: int
+    venue_id: int
+    digest: bool
 
-    db: Session = SessionLocal()
-    try:
-        loaded = _load_ctx(db, booking_id)
-        if not loaded:
-            return
-        bk, court, venue, player, owner = loaded
+class StateChange(NamedTuple):
+    """Cambio set-based (UPDATE ... RETURNING): no hay objeto ORM."""
+    booking_id: int
+    court_id: int
+    old: BookingStatusEnum
+    new: BookingStatusEnum
+    ics_uid: Optional[str]
+    ics_sequence: int   # ya incrementado
 
-        params = _mail_params_for_transition(old_status, new_status)
-        if not params:
-            return
+def _owner_routes(db: Session, court_ids: Iterable[int]) -> Dict[int, OwnerRoute]:
+    """court_id -> (owner, venue, ¿resumen?) con una query para todo el lote."""
+    ids = set(court_ids)
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(Court.id, Venue.owner_user_id, Venue.id, User.owner_digest)
+        .join(Venue, Venue.id == Court.venue_id)
+        .join(User, User.id == Venue.owner_user_id)
+        .where(Court.id.in_(ids))
+    ).all()
+    return {court_id: OwnerRoute(owner_id, venue_id, bool(digest)) for court_id, owner_id, venue_id, digest in rows}
 
-        _ensure_uid_sequence(db, bk)
+def _recipients(db: Session, route: Optional[OwnerRoute], digest_kind: Optional[str],
+                booking: Optional[Booking] = None, booking_id: Optional[int] = None,
+                detail: Optional[str] = None) -> tuple[str, ...]:
+    """
+    Owner con resumen: no recibe el mail inmediato; el evento (si `digest_kind`)
+    va a owner_digest_events en la misma transacción.
+    """
+    if route is None or not route.digest:
+        return RECIPIENTS
+    if digest_kind:
+        ev = OwnerDigestEvent(owner_user_id=route.owner_id, venue_id=route.venue_id,
+                              booking_id=booking_id, kind=digest_kind, detail=detail)
+        if booking is not None:
+            ev.booking = booking
+        db.add(ev)
+    return ("player",)
 
-        venue_name = getattr(venue, "name", f"Venue {venue.id if venue else ''}")
-        court_name = getattr(court, "name", f"Court {court.id if court else ''}")
+def _digest_kind(new_status: BookingStatusEnum) -> Optional[str]:
+    # confirmaciones las hace el propio owner: no van al resumen
+    if new_status in (BookingStatusEnum.CANCELLED, BookingStatusEnum.CANCELLED_LATE):
+        return "cancelled"
+    return None
+
+def enqueue_booking_created(db: Session, bk: Booking, weeks: Optional[int] = None) -> None:
+    """Mail de "pendiente" al crear; con `weeks` es el de una serie (un solo mail con RRULE)."""
+    route = _owner_routes(db, [bk.court_id]).get(bk.court_id)
+    recipients = _recipients(db, route, "created", booking=bk,
+                             detail=(f"serie de {weeks} semanas" if weeks else None))
+    if weeks:
+        # la serie es un evento recurrente propio: no comparte UID con la 1ra ocurrencia
+        enqueue(db, "booking_created", None, recipients, booking=bk, weeks=weeks,
+                uid=f"series-{bk.series_id}", sequence=0)
+    else:
+        if not bk.ics_uid:
+            bk.ics_uid = str(uuid4())
+        enqueue(db, "booking_created", None, recipients, booking=bk,
+                uid=bk.ics_uid, sequence=bk.ics_sequence or 0)
+
+def enqueue_booking_state_change(db: Session, bk: Booking,
+                                 old_status: BookingStatusEnum, new_status: BookingStatusEnum) -> None:
+    if old_status == new_status or not _mail_params_for_transition(old_status, new_status):
+        return
+    _ensure_uid_sequence(bk)
+    route = _owner_routes(db, [bk.court_id]).get(bk.court_id)
+    recipients = _recipients(db, route, _digest_kind(new_status), booking_id=bk.id)
+    enqueue(db, "booking_state_changed", bk.id, recipients,
+            old=old_status.value, new=new_status.value, uid=bk.ics_uid, sequence=bk.ics_sequence)
+
+def enqueue_booking_state_changes(db: Session, changes: list[StateChange],
+                                  digest_kind: Optional[str] = None) -> None:
+    """
+    Para cambios set-based. `digest_kind` pisa el tipo de evento del resumen
+    (p. ej. "expired" para el job de vencimiento).
+    """
+    changes = [c for c in changes if c.old != c.new and _mail_params_for_transition(c.old, c.new)]
+    routes = _owner_routes(db, (c.court_id for c in changes))
+    for c in changes:
+        recipients = _recipients(db, routes.get(c.court_id), digest_kind or _digest_kind(c.new),
+                                 booking_id=c.booking_id)
+        enqueue(db, "booking_state_changed", c.booking_id, recipients,
+                old=c.old.value, new=c.new.value, uid=c.ics_uid, sequence=c.ics_sequence)
+
+# -------------------------
+# Handlers del outbox (corren en el worker)
+# -------------------------
+def _render_once(row: NotificationOutbox, render) -> Optional[Dict[str, Callable[[], None]]]:
+    """
+    Primer intento: `render()` arma el evento y se guarda en el payload.
+    Reintentos: reusan ese render y sólo devuelven los envíos a quien falta.
+    """
+    data = row.payload or {}
+    if "rendered" in data:
+        event = RenderedEvent.from_payload(data["rendered"])
+    else:
+        event = render()
+        if event is None:
+            return None
+        update_payload(row, rendered=event.to_payload())
+    return pending_sends(event, skip=data.get("delivered", []))
+
+@register_handler("booking_created")
+def _send_booking_created(db: Session, row: NotificationOutbox):
+    def render() -> Optional[RenderedEvent]:
+        parties = load_booking_parties(db, row.booking_id)
+        if not parties:
+            return None
+        bk, court, venue = parties.booking, parties.court, parties.venue
+        venue_name = (getattr(venue, "name", f"Venue {venue.id}") or "").strip()
+        court_name = getattr(court, "name", f"Court {court.id}")
         price = float(bk.price_total or 0)
-        player_name = getattr(player, "name", None) if player else None
+        owner_email = _recipient_email(parties, "owner")
+        weeks = row.payload.get("weeks")
 
-        # ---------- ELEGIR TEMPLATE DEL JUGADOR SEGÚN new_status ----------
-        if new_status == BookingStatusEnum.CONFIRMED:
-            player_html = booking_html_player_confirmed(
-                player_name=player_name,
-                venue_name=venue_name,
-                court_name=court_name,
-                start=bk.start_datetime,
-                end=bk.end_datetime,
-                price=price,
-            )
-        elif new_status in (BookingStatusEnum.CANCELLED, BookingStatusEnum.CANCELLED_LATE):
-            player_html = booking_html_player_cancelled(
-                player_name=player_name,
-                venue_name=venue_name,
-                court_name=court_name,
-                start=bk.start_datetime,
-                end=bk.end_datetime,
-                price=price,
-                late=(new_status == BookingStatusEnum.CANCELLED_LATE),
-            )
-        elif old_status == BookingStatusEnum.PENDING and new_status == BookingStatusEnum.PENDING:
-            # Rara vez sucederá, pero por completitud
-            player_html = booking_html_player_pending(
-                player_name=player_name,
-                venue_name=venue_name,
-                court_name=court_name,
-                start=bk.start_datetime,
-                end=bk.end_datetime,
-                price=price,
+        if weeks:
+            html = booking_html_player_series_pending(
+                player_name=None, venue_name=venue_name, court_name=court_name,
+                start=bk.start_datetime, end=bk.end_datetime, price=price, weeks=weeks,
             )
+            subject = "Tu serie de reservas está pendiente de confirmación ⏳"
+            description = f"Serie de {weeks} reservas semanales pendiente. Precio por turno: $ {price:,.0f} ARS"
         else:
-            # fallback razonable: si no matchea, mandá “pendiente”
-            player_html = booking_html_player_pending(
-                player_name=player_name,
-                venue_name=venue_name,
-                court_name=court_name,
-                start=bk.start_datetime,
-                end=bk.end_datetime,
-                price=price,
+            html = booking_html_player_pending(
+                player_name=None, venue_name=venue_name, court_name=court_name,
+                start=bk.start_datetime, end=bk.end_datetime, price=price,
             )
+            subject = "Tu reserva está pendiente de confirmación ⏳"
+            description = f"Reserva #{bk.id} pendiente. Precio: $ {price:,.0f} ARS"
 
-        owner_html = booking_html_for_owner(
-            owner_name=getattr(owner, "name", None) if owner else None,
-            player_email=(player.email if player else "-"),
-            venue_name=venue_name,
-            court_name=court_name,
-            start=bk.start_datetime,
-            end=bk.end_datetime,
-            price=price,
+        return render_event(
+            uid=_event_uid(bk, row.payload.get("uid")),
+            sequence=row.payload.get("sequence", 0),
+            method="REQUEST",
+            summary=f"Reserva en {venue_name} - {court_name} (pendiente)",
+            description=description,
+            location=getattr(venue, "address", None) or venue_name,
+            start_dt=bk.start_datetime,
+            end_dt=bk.end_datetime,
+            organizer_email=owner_email or _recipient_email(parties, "player"),
+            rrule=(f"FREQ=WEEKLY;COUNT={weeks}" if weeks else None),
+            smtp_profile="calendar",   # TLS + auth por defecto (ver SENDER_PROFILES)
+            mails=[
+                RenderedMail(recipient=r, to=_recipient_email(parties, r), subject=subject, html=html)
+                for r in row.payload.get("recipients", RECIPIENTS)
+            ],
         )
 
-        subj_player = params.subject
-        subj_owner = ("📩 " + params.subject) if params.method != "CANCEL" else "🔔 Cambio en una reserva"
-
-        # ---------- ENVÍO (uno por uno) ----------
-        for addr, html, subj in [
-            (player.email if player and player.email else None, player_html, subj_player),
-            (owner.email if owner and owner.email else None, owner_html, subj_owner),
-        ]:
-            if not addr:
-                continue
-            try:
-                send_html_email_gmail(
-                    to_owner=None,
-                    to_player=addr,
-                    html_body=html,
-                    subject=subj,
-                    summary=f"{venue_name} - {court_name}",
-                    description=f"Reserva #{bk.id} - Estado: {new_status}",
-                    location=getattr(venue, "address", venue_name) if venue else venue_name,
-                    start_dt=bk.start_datetime,
-                    end_dt=bk.end_datetime,
-                    organizer_email=(owner.email if owner and owner.email else None),
-                    # Si tu send_html_email_gmail todavía NO acepta method/uid/sequence,
-                    # no los pases aún para evitar TypeError. Cuando lo actualices,
-                    # agregá: method=params.method, sequence=bk.ics_sequence, uid=bk.ics_uid
+    return _render_once(row, render)
+
+@register_handler("booking_state_changed")
+def _send_booking_state_change(db: Session, row: NotificationOutbox):
+    def render() -> Optional[RenderedEvent]:
+        old_status = BookingStatusEnum(row.payload["old"])
+        new_status = BookingStatusEnum(row.payload["new"])
+        params = _mail_params_for_transition(old_status, new_status)
+        parties = load_booking_parties(db, row.booking_id) if params else None
+        if not parties:
+            return None
+        bk, court, venue, player, owner = parties
+
+        venue_name = getattr(venue, "name", f"Venue {venue.id if venue else ''}")
+        court_name = getattr(court, "name", f"Court {court.id if court else ''}")
+        price = float(bk.price_total or 0)
+        player_name = getattr(player, "name", None) if player else None
+
+        mails = []
+        for recipient in row.payload.get("recipients", RECIPIENTS):
+            if recipient == "owner":
+                html = booking_html_for_owner(
+                    owner_name=getattr(owner, "name", None) if owner else None,
+                    player_email=(player.email if player else "-"),
+                    venue_name=venue_name,
+                    court_name=court_name,
+                    start=bk.start_datetime,
+                    end=bk.end_datetime,
+                    price=price,
                 )
-            except Exception as e:
-                print(f"[notify_booking_state_change] {addr} -> {e}")
+                subject = ("📩 " + params.subject) if params.method != "CANCEL" else "🔔 Cambio en una reserva"
+            else:
+                # ---------- ELEGIR TEMPLATE DEL JUGADOR SEGÚN new_status ----------
+                if new_status == BookingStatusEnum.CONFIRMED:
+                    html = booking_html_player_confirmed(
+                        player_name=player_name,
+                        venue_name=venue_name,
+                        court_name=court_name,
+                        start=bk.start_datetime,
+                        end=bk.end_datetime,
+                        price=price,
+                    )
+                elif new_status in (BookingStatusEnum.CANCELLED, BookingStatusEnum.CANCELLED_LATE):
+                    html = booking_html_player_cancelled(
+                        player_name=player_name,
+                        venue_name=venue_name,
+                        court_name=court_name,
+                        start=bk.start_datetime,
+                        end=bk.end_datetime,
+                        price=price,
+                        late=(new_status == BookingStatusEnum.CANCELLED_LATE),
+                    )
+                else:
+                    # fallback razonable: si no matchea, mandá “pendiente”
+                    html = booking_html_player_pending(
+                        player_name=player_name,
+                        venue_name=venue_name,
+                        court_name=court_name,
+                        start=bk.start_datetime,
+                        end=bk.end_datetime,
+                        price=price,
+                    )
+                subject = params.subject
+            mails.append(RenderedMail(recipient=recipient, to=_recipient_email(parties, recipient),
+                                      subject=subject, html=html))
+
+        # mismo UID que el mail de creación + SEQUENCE mayor: el cliente
+        # actualiza/cancela el evento existente en vez de crear otro
+        return render_event(
+            uid=_event_uid(bk, row.payload.get("uid")),
+            sequence=row.payload.get("sequence") or bk.ics_sequence or 0,
+            method=params.method,
+            summary=f"{venue_name} - {court_name}",
+            description=f"Reserva #{bk.id} - Estado: {new_status}",
+            location=getattr(venue, "address", venue_name) if venue else venue_name,
+            start_dt=bk.start_datetime,
+            end_dt=bk.end_datetime,
+            organizer_email=(owner.email if owner and owner.email else None),
+            smtp_profile="html",       # sin TLS/auth por defecto (Mailpit local)
+            mails=mails,
+        )
 
-    finally:
-        db.close()
\ No newline at end of file
+    return _render_once(row, render)
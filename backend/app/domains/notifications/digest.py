@@ -0,0 +1,96 @@
+# app/domains/notifications/digest.py
+"""
+Resumen para owners con users.owner_digest.
+
+`collect_owner_digests` (job periódico) busca owners cuyo evento pendiente más
+viejo ya cumplió OWNER_DIGEST_WINDOW_MINUTES, arma UN mail con todos sus
+eventos agrupados por sede y lo encola en el outbox (kind "owner_digest") en
+la misma transacción que marca los eventos como `digested_at`. El envío y los
+reintentos son los del outbox.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.domains.bookings.models import Booking
+from app.domains.notifications.models import NotificationOutbox, OwnerDigestEvent
+from app.domains.notifications.outbox import enqueue, register_handler
+from app.domains.users.models import User
+from app.domains.venues.models import Court, Venue
+from app.utils.email_smtp import send_basic_html_email
+from app.utils.email_templates import owner_digest_html
+
+
+def _due_owner_ids(db: Session, now: datetime, limit: int) -> list[int]:
+    cutoff = now - timedelta(minutes=settings.OWNER_DIGEST_WINDOW_MINUTES)
+    return list(db.execute(
+        select(OwnerDigestEvent.owner_user_id)
+        .where(OwnerDigestEvent.digested_at == None)
+        .group_by(OwnerDigestEvent.owner_user_id)
+        .having(func.min(OwnerDigestEvent.created_at) <= cutoff)
+        .limit(limit)
+    ).scalars().all())
+
+
+def _digest_for_owner(db: Session, owner_id: int, now: datetime) -> int:
+    """Junta y encola el resumen de un owner; devuelve cuántos eventos incluyó."""
+    player = aliased(User)
+    rows = db.execute(
+        select(OwnerDigestEvent, Booking, Court.number, Venue.name, player.email)
+        .join(Booking, Booking.id == OwnerDigestEvent.booking_id)
+        .join(Court, Court.id == Booking.court_id)
+        .join(Venue, Venue.id == OwnerDigestEvent.venue_id)
+        .join(player, player.id == Booking.user_id)
+        .where(and_(OwnerDigestEvent.owner_user_id == owner_id, OwnerDigestEvent.digested_at == None))
+        .order_by(Venue.name.asc(), Booking.start_datetime.asc(), OwnerDigestEvent.id.asc())
+        # otro worker con el mismo owner: que lo salte en vez de esperar
+        .with_for_update(skip_locked=True, of=OwnerDigestEvent)
+    ).all()
+    if not rows:
+        return 0
+
+    by_venue: dict[str, list[dict]] = defaultdict(list)
+    for ev, bk, court_number, venue_name, player_email in rows:
+        by_venue[venue_name].append({
+            "kind": ev.kind,
+            # Court no tiene nombre: mismo rótulo que venues/public.py
+            "court_name": f"Cancha {court_number}" if court_number else "Cancha",
+            "player_email": player_email,
+            "start": bk.start_datetime,
+            "end": bk.end_datetime,
+            "price": float(bk.price_total or 0),
+            "detail": ev.detail,
+        })
+        ev.digested_at = now
+
+    owner = db.get(User, owner_id)
+    html = owner_digest_html(getattr(owner, "name", None), list(by_venue.items()))
+    subject = f"📋 Resumen de reservas ({len(rows)} movimiento{'s' if len(rows) != 1 else ''})"
+    enqueue(db, "owner_digest", None, ("owner",), owner_id=owner_id, subject=subject, html=html)
+    return len(rows)
+
+
+def collect_owner_digests(db: Session, now: Optional[datetime] = None,
+                          batch_size: Optional[int] = None) -> int:
+    """Un commit por owner; devuelve cuántos resúmenes encoló."""
+    now = now or datetime.utcnow()
+    sent = 0
+    for owner_id in _due_owner_ids(db, now, batch_size or settings.OWNER_DIGEST_BATCH_SIZE):
+        if _digest_for_owner(db, owner_id, now):
+            sent += 1
+        db.commit()
+    return sent
+
+
+@register_handler("owner_digest")
+def _send_owner_digest(db: Session, row: NotificationOutbox):
+    owner = db.get(User, row.payload["owner_id"])
+    if not owner or not owner.email:
+        return None
+    return {"owner": partial(send_basic_html_email, owner.email, row.payload["subject"], row.payload["html"])}
@@ -0,0 +1,105 @@
+# app/domains/notifications/dispatch.py
+"""
+Pool acotado de threads para los envíos de notificaciones (un envío = un mail a
+un destinatario). Lo usa drain_outbox: renderiza en su thread (toca la DB) y
+reparte los envíos acá, así un lote de N filas no tarda N x destinatarios x RTT.
+
+- Backpressure: como mucho `max_workers + max_pending` envíos en vuelo; `submit`
+  bloquea al productor hasta que se libere lugar.
+- Métricas (queue depth, en curso, completados, fallidos, timeouts) para
+  GET /admin/notifications/metrics.
+"""
+from __future__ import annotations
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+class NotificationDispatcher:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max(1, max_workers)
+        self.capacity = self.max_workers + max(0, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notify")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    def submit(self, fn: Callable[[], None]) -> Future:
+        self._slots.acquire()  # 👈 backpressure: espera si el pool está lleno
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(self._run, fn)
+        except Exception:
+            self._done()
+            raise
+
+    def _run(self, fn: Callable[[], None]) -> None:
+        with self._lock:
+            self._running += 1
+        ok = False
+        try:
+            fn()
+            ok = True
+        finally:
+            with self._lock:
+                self._running -= 1
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            self._done()
+
+    def _done(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timed_out += 1
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "running": self._running,
+                "queue_depth": self._in_flight - self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher(
+                max_workers=settings.NOTIFY_MAX_WORKERS,
+                max_pending=settings.NOTIFY_MAX_PENDING,
+            )
+        return _dispatcher
+
+
+def shutdown_dispatcher() -> None:
+    global _dispatcher
+    with _dispatcher_lock:
+        d, _dispatcher = _dispatcher, None
+    if d is not None:
+        d.shutdown(wait=True)
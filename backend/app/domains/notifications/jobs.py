@@ -0,0 +1,35 @@
+# app/domains/notifications/jobs.py
+"""Workers de notificaciones: outbox y resúmenes de owners (ver app/core/scheduler.py)."""
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.scheduler import PeriodicScheduler
+from app.domains.notifications import booking_state  # noqa: F401  (registra los handlers)
+from app.domains.notifications.digest import collect_owner_digests
+from app.domains.notifications.outbox import drain_outbox
+
+
+def run_outbox_worker() -> None:
+    # drena lotes hasta vaciar lo vencido; una sesión por corrida
+    db = SessionLocal()
+    try:
+        while drain_outbox(db) >= settings.OUTBOX_BATCH_SIZE:
+            pass
+    finally:
+        db.close()
+
+
+def run_owner_digests() -> None:
+    db = SessionLocal()
+    try:
+        n = collect_owner_digests(db)
+        if n:
+            print(f"[digest job] resúmenes encolados={n}")
+    finally:
+        db.close()
+
+
+def register_jobs(scheduler: PeriodicScheduler) -> None:
+    scheduler.register("notifications-outbox", settings.OUTBOX_POLL_INTERVAL_SECONDS, run_outbox_worker)
+    scheduler.register("notifications-owner-digest", settings.OWNER_DIGEST_INTERVAL_SECONDS, run_owner_digests)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.db import Base
+
+
+class NotificationOutbox(Base):
+    """
+    Notificación pendiente de envío, escrita en la MISMA transacción que el cambio
+    que la origina. Una fila = un evento de booking; payload["recipients"] lista
+    los destinatarios (player/owner) y payload["delivered"] los que ya lo
+    recibieron, así un reintento no duplica el mail. payload["rendered"] guarda
+    el ICS/HTML armado en el primer intento (ver notifications/rendering.py).
+    La drena notifications/outbox.py (drain_outbox) desde el scheduler.
+    """
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    booking_id: Mapped[Optional[int]] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # agotó reintentos: queda para inspección, el worker no la vuelve a tomar
+    failed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    booking: Mapped[Optional["Booking"]] = relationship()
+
+    __table_args__ = (
+        Index("ix_outbox_due", "sent_at", "failed_at", "next_attempt_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<NotificationOutbox id={self.id} kind={self.kind} booking_id={self.booking_id}>"
+
+
+class OwnerDigestEvent(Base):
+    """
+    Evento para el resumen de un owner con users.owner_digest (en vez del mail
+    inmediato). Se escribe en la transacción del cambio; notifications/digest.py
+    los junta por owner y los marca `digested_at` al encolar el resumen.
+    """
+    __tablename__ = "owner_digest_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    owner_user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    venue_id: Mapped[int] = mapped_column(ForeignKey("venues.id", ondelete="CASCADE"), nullable=False)
+    booking_id: Mapped[int] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)   # created / cancelled / expired
+    detail: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    digested_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    booking: Mapped["Booking"] = relationship()
+
+    __table_args__ = (
+        Index("ix_digest_pending", "owner_user_id", "digested_at", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OwnerDigestEvent id={self.id} owner={self.owner_user_id} {self.kind} booking_id={self.booking_id}>"
@@ -0,0 +1,179 @@
+# app/domains/notifications/outbox.py
+"""
+Outbox transaccional de notificaciones.
+
+- `enqueue(...)` agrega filas a la sesión del caller; se commitean (o no) junto
+  con el cambio de estado que las origina.
+- `drain_outbox(db)` toma un lote vencido con FOR UPDATE SKIP LOCKED, ejecuta el
+  handler registrado para cada `kind`, deja un lease en next_attempt_at y
+  commitea; recién ahí reparte los envíos en el pool de
+  notifications/dispatch.py (sin locks ni conexión de DB tomados). Al volver
+  marca enviado, o reprograma con backoff exponencial hasta OUTBOX_MAX_ATTEMPTS,
+  en una segunda transacción corta.
+
+Los handlers reciben (db, fila), corren en el thread del worker (pueden usar la
+sesión) y devuelven {destinatario: envío}: callables SIN acceso a la DB que
+corren en el pool y LEVANTAN excepción si fallan. Los destinatarios que ya
+recibieron quedan en payload["delivered"] y no vuelven a pedirse.
+"""
+from __future__ import annotations
+import random
+from concurrent.futures import wait
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domains.notifications.dispatch import get_dispatcher
+from app.domains.notifications.models import NotificationOutbox
+
+Send = Callable[[], None]
+OutboxHandler = Callable[[Session, NotificationOutbox], Optional[Mapping[str, Send]]]
+
+_HANDLERS: Dict[str, OutboxHandler] = {}
+
+
+def register_handler(kind: str) -> Callable[[OutboxHandler], OutboxHandler]:
+    def deco(fn: OutboxHandler) -> OutboxHandler:
+        _HANDLERS[kind] = fn
+        return fn
+    return deco
+
+
+def enqueue(db: Session, kind: str, booking_id: Optional[int], recipients: Iterable[str],
+            booking=None, **payload) -> None:
+    """
+    Una fila por evento; los destinatarios van en payload["recipients"] y el
+    handler marca en payload["delivered"] a quién ya le llegó. Pasá `booking`
+    (en vez de / además de booking_id) si todavía no tiene PK: el flush del
+    commit resuelve el FK.
+    """
+    row = NotificationOutbox(
+        kind=kind,
+        booking_id=booking_id,
+        payload={**payload, "recipients": list(recipients)},
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    if booking is not None:
+        row.booking = booking
+    db.add(row)
+
+
+def update_payload(row: NotificationOutbox, **changes) -> None:
+    # JSON sin MutableDict: reasignar para que el ORM detecte el cambio
+    row.payload = {**(row.payload or {}), **changes}
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+    delay = min(base, settings.OUTBOX_RETRY_MAX_SECONDS)
+    # jitter ±20% para que los reintentos de un pico no vuelvan todos juntos
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _fail(row: NotificationOutbox, error: Exception, now: datetime) -> None:
+    row.attempts += 1
+    row.last_error = str(error)[:2000]
+    if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        row.failed_at = now
+        print(f"[outbox] #{row.id} {row.kind} descartada tras {row.attempts} intentos: {error}")
+    else:
+        row.next_attempt_at = now + _backoff(row.attempts)
+        print(f"[outbox] #{row.id} {row.kind} intento {row.attempts} falló: {error}")
+
+
+def _lease_until(now: datetime) -> datetime:
+    # mientras duran los envíos la fila no está lockeada: next_attempt_at en el
+    # futuro la saca de "vencidas" para otros workers. Tope del lote + el
+    # timeout de socket de un envío que siguió corriendo.
+    return now + timedelta(seconds=settings.NOTIFY_BATCH_TIMEOUT_SECONDS + settings.NOTIFY_SEND_TIMEOUT_SECONDS)
+
+
+def _claim_batch(db: Session, batch_size: int, now: datetime) -> Tuple[int, Dict[int, Mapping[str, Send]]]:
+    """
+    Transacción 1: lockea el lote (SKIP LOCKED), renderiza, deja el lease y
+    commitea. Devuelve (filas tomadas, {row_id: {destinatario: envío}}).
+    """
+    rows = db.execute(
+        select(NotificationOutbox)
+        .where(and_(NotificationOutbox.sent_at == None,
+                    NotificationOutbox.failed_at == None,
+                    NotificationOutbox.next_attempt_at <= now))
+        .order_by(NotificationOutbox.id.asc())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    claimed: Dict[int, Mapping[str, Send]] = {}
+    for row in rows:
+        handler = _HANDLERS.get(row.kind)
+        try:
+            if handler is None:
+                raise RuntimeError(f"sin handler para '{row.kind}'")
+            pending = handler(db, row) or {}
+        except Exception as e:
+            _fail(row, e, now)
+            continue
+        if not pending:
+            row.sent_at = datetime.utcnow()
+            continue
+        row.next_attempt_at = _lease_until(now)
+        claimed[row.id] = pending
+    db.commit()
+    return len(rows), claimed
+
+
+def _record_results(db: Session, delivered: Dict[int, List[str]],
+                    errors: Dict[int, Exception], now: datetime) -> None:
+    """Transacción 2 (corta): sólo las filas del lote, ya sin esperar a la red."""
+    rows = db.execute(
+        select(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(list(delivered)))
+        .with_for_update()
+    ).scalars().all()
+    for row in rows:
+        if row.sent_at is not None or row.failed_at is not None:
+            continue  # otro worker la tomó al vencer el lease y ya la cerró
+        if delivered[row.id]:
+            update_payload(row, delivered=list(row.payload.get("delivered", [])) + delivered[row.id])
+        if row.id in errors:
+            _fail(row, errors[row.id], now)
+        else:
+            row.sent_at = datetime.utcnow()
+    db.commit()
+
+
+def drain_outbox(db: Session, batch_size: Optional[int] = None, now: Optional[datetime] = None) -> int:
+    """
+    Procesa un lote; devuelve cuántas filas tomó (enviadas o reprogramadas).
+    Ninguna transacción queda abierta durante los envíos SMTP.
+    """
+    now = now or datetime.utcnow()
+    taken, claimed = _claim_batch(db, batch_size or settings.OUTBOX_BATCH_SIZE, now)
+    if not claimed:
+        return taken
+
+    # envíos en paralelo en el pool; un solo tope para todo el lote y cada
+    # envío además acotado por el timeout del socket SMTP
+    pool = get_dispatcher()
+    sends = [(row_id, recipient, pool.submit(send))
+             for row_id, pending in claimed.items() for recipient, send in pending.items()]
+    wait([f for _, _, f in sends], timeout=settings.NOTIFY_BATCH_TIMEOUT_SECONDS)
+
+    delivered: Dict[int, List[str]] = {row_id: [] for row_id in claimed}
+    errors: Dict[int, Exception] = {}
+    for row_id, recipient, fut in sends:
+        if not fut.done():
+            # sigue corriendo: si termina bien habrá un duplicado, preferible a perderlo
+            pool.record_timeout()
+            errors.setdefault(row_id, TimeoutError(f"envío a {recipient} excedió el tiempo"))
+        elif fut.exception() is not None:
+            errors.setdefault(row_id, fut.exception())
+        else:
+            delivered[row_id].append(recipient)
+
+    _record_results(db, delivered, errors, max(now, datetime.utcnow()))
+    return taken
@@ -0,0 +1,101 @@
+# app/domains/notifications/rendering.py
+"""
+Etapa de render de notificaciones: el ICS, el link de Google Calendar y el HTML
+de cada destinatario se arman UNA vez por evento de booking. El resultado se
+guarda en el payload de la fila del outbox, así los reintentos reusan
+exactamente el mismo ICS (mismo UID/SEQUENCE/DTSTAMP) y sólo reenvían a quien
+todavía no lo recibió. Los envíos en sí corren en el pool de dispatch.py.
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.utils.calendar_ics import add_calendar_button, build_booking_ics, build_google_calendar_link
+from app.utils.email_smtp import build_calendar_message
+from app.utils.mail_transport import sender_transport
+
+
+@dataclass
+class RenderedMail:
+    recipient: str      # "player" / "owner"
+    to: str
+    subject: str
+    html: str
+
+
+@dataclass
+class RenderedEvent:
+    ics: str
+    method: str
+    gcal_link: str
+    mails: List[RenderedMail] = field(default_factory=list)
+    # defaults TLS/auth del sender que reemplaza (ver mail_transport.SENDER_PROFILES)
+    smtp_profile: str = "calendar"
+
+    def to_payload(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_payload(cls, data: dict) -> "RenderedEvent":
+        return cls(
+            ics=data["ics"],
+            method=data["method"],
+            gcal_link=data["gcal_link"],
+            mails=[RenderedMail(**m) for m in data.get("mails", [])],
+            smtp_profile=data.get("smtp_profile", "calendar"),
+        )
+
+
+def render_event(
+    *,
+    uid: str,
+    sequence: int,
+    method: str,
+    summary: str,
+    description: str,
+    location: str,
+    start_dt: datetime,
+    end_dt: datetime,
+    organizer_email: Optional[str],
+    mails: Iterable[RenderedMail],
+    rrule: Optional[str] = None,
+    smtp_profile: str = "calendar",
+) -> RenderedEvent:
+    """
+    `mails` trae el HTML "crudo" por destinatario; el botón de Google Calendar
+    se agrega acá con el link calculado una sola vez.
+    """
+    mails = [m for m in mails if m.to]
+    ics = build_booking_ics(
+        uid=uid,
+        summary=summary,
+        description=description,
+        location=location,
+        start_dt=start_dt,
+        end_dt=end_dt,
+        organizer_email=organizer_email,
+        attendee_emails=[m.to for m in mails],
+        method=method,
+        sequence=sequence,
+        status_line=("STATUS:CANCELLED" if method == "CANCEL" else None),
+        rrule=rrule,
+    )
+    gcal_link = build_google_calendar_link(summary, description, location, start_dt, end_dt)
+    for m in mails:
+        m.html = add_calendar_button(m.html, gcal_link)
+    return RenderedEvent(ics=ics, method=method, gcal_link=gcal_link, mails=mails, smtp_profile=smtp_profile)
+
+
+def send_mail(event: RenderedEvent, mail: RenderedMail) -> None:
+    """Un envío (corre en el pool de dispatch.py): conexión del pool SMTP, timeout por socket."""
+    transport = sender_transport(event.smtp_profile, timeout=settings.NOTIFY_SEND_TIMEOUT_SECONDS)
+    transport.send(build_calendar_message(mail.to, mail.subject, mail.html, event.ics, event.method))
+
+
+def pending_sends(event: RenderedEvent, skip: Iterable[str] = ()) -> Dict[str, Callable[[], None]]:
+    """{destinatario: envío} para los que todavía no lo recibieron."""
+    skip = set(skip)
+    return {m.recipient: partial(send_mail, event, m) for m in event.mails if m.recipient not in skip}
@@ -0,0 +1,27 @@
+# app/domains/notifications/routers.py
+from fastapi import APIRouter, Depends
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, require_roles
+from app.domains.notifications.dispatch import get_dispatcher
+from app.domains.notifications.models import NotificationOutbox
+from app.shared.enums import RoleEnum
+
+router = APIRouter(prefix="/admin/notifications", tags=["admin-notifications"])
+
+
+@router.get("/metrics", response_model=dict, dependencies=[Depends(require_roles(RoleEnum.ADMIN))])
+def notification_metrics(db: Session = Depends(get_db)):
+    # pool de este proceso + estado global del outbox
+    pending, failed = db.execute(
+        select(
+            func.count(NotificationOutbox.id).filter(and_(NotificationOutbox.sent_at == None,
+                                                          NotificationOutbox.failed_at == None)),
+            func.count(NotificationOutbox.id).filter(NotificationOutbox.failed_at != None),
+        )
+    ).one()
+    return {
+        "dispatcher": get_dispatcher().metrics(),
+        "outbox": {"pending": pending, "failed": failed},
+    }
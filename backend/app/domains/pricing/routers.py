@@ -9,6 +9,8 @@ from app.core.deps import get_db, get_current_user
 from app.domains.venues.models import Court
 from app.domains.pricing.models import Price
 from app.domains.pricing.schemas import PriceCreate, PriceUpdate, PriceOut
+from app.domains.pricing.service import invalidate_price_table
+from app.domains.scheduling.service import invalidate_availability
 
 router = APIRouter(prefix="/venues/{venue_id}/courts/{court_id}/prices", tags=["prices"])
 
@@ -52,6 +54,8 @@ def create_price(venue_id: int, court_id: int, payload: PriceCreate, db: Session
     pr = Price(**payload.model_dump())
     db.add(pr)
     db.commit()
+    invalidate_price_table(court_id)
+    invalidate_availability(court_id)
     db.refresh(pr)
     return pr
 
@@ -77,6 +81,8 @@ def update_price(venue_id: int, court_id: int, price_id: int, payload: PriceUpda
         setattr(pr, k, v)
 
     db.commit()
+    invalidate_price_table(court_id)
+    invalidate_availability(court_id)
     db.refresh(pr)
     return pr
 
@@ -88,4 +94,6 @@ def delete_price(venue_id: int, court_id: int, price_id: int, db: Session = Depe
         raise HTTPException(status_code=404, detail="Price no encontrado")
     db.delete(pr)
     db.commit()
+    invalidate_price_table(court_id)
+    invalidate_availability(court_id)
     return
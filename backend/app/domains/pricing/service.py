@@ -0,0 +1,129 @@
+# app/domains/pricing/service.py
+from __future__ import annotations
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.shared.cache import TTLCache
+from app.domains.pricing.models import Price
+
+
+class PriceRuleIndex:
+    """
+    Reglas de precio de una cancha para UN weekday, compiladas a arrays ordenados
+    por start_time (bordes + precio por slot). No guarda objetos ORM, así que se
+    puede cachear entre requests/sesiones.
+    Como las reglas no se superponen (ver _assert_no_price_overlap), la única
+    candidata a cubrir un slot es la de mayor start_time <= inicio del slot.
+    """
+
+    __slots__ = ("_starts", "_ends", "_prices")
+
+    def __init__(self, rules: Iterable[Price]):
+        compiled = sorted(
+            (r.start_time, r.end_time, float(r.price_per_slot)) for r in rules
+        )
+        self._starts: List[time] = [c[0] for c in compiled]
+        self._ends: List[time] = [c[1] for c in compiled]
+        self._prices: List[float] = [c[2] for c in compiled]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def lookup(self, s_t: time, e_t: time) -> Optional[float]:
+        """Precio por slot de la regla que cubre completamente [s_t, e_t], o None."""
+        i = bisect_right(self._starts, s_t) - 1
+        if i < 0 or self._ends[i] < e_t:
+            return None
+        return self._prices[i]
+
+
+class CourtPriceTable:
+    """Tabla semanal compilada de una cancha: un PriceRuleIndex por weekday."""
+
+    __slots__ = ("court_id", "_by_weekday")
+
+    def __init__(self, court_id: int, rules: Iterable[Price]):
+        by_weekday: Dict[int, List[Price]] = defaultdict(list)
+        for r in rules:
+            by_weekday[r.weekday].append(r)
+        self.court_id = court_id
+        self._by_weekday: Dict[int, PriceRuleIndex] = {
+            wd: PriceRuleIndex(rs) for wd, rs in by_weekday.items()
+        }
+
+    def for_weekday(self, weekday: int) -> PriceRuleIndex:
+        return self._by_weekday.get(weekday) or _EMPTY_INDEX
+
+
+_EMPTY_INDEX = PriceRuleIndex([])
+
+# court_id -> tabla compilada. Se invalida desde pricing/routers.py.
+price_table_cache: TTLCache[int, CourtPriceTable] = TTLCache(
+    max_entries=settings.PRICE_TABLE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRICE_TABLE_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_price_table(court_id: int) -> None:
+    price_table_cache.delete(court_id)
+
+
+def get_price_tables(db: Session, court_ids: Iterable[int]) -> Dict[int, CourtPriceTable]:
+    """Tablas de varias canchas: las que no están en cache salen de UNA query."""
+    out: Dict[int, CourtPriceTable] = {}
+    missing: List[int] = []
+    for cid in dict.fromkeys(court_ids):
+        table = price_table_cache.get(cid)
+        if table is None:
+            missing.append(cid)
+        else:
+            out[cid] = table
+
+    if missing:
+        rules_by_court: Dict[int, List[Price]] = defaultdict(list)
+        for r in db.execute(select(Price).where(Price.court_id.in_(missing))).scalars().all():
+            rules_by_court[r.court_id].append(r)
+        for cid in missing:
+            table = CourtPriceTable(cid, rules_by_court.get(cid, []))
+            price_table_cache.set(cid, table)
+            out[cid] = table
+    return out
+
+
+def get_price_table(db: Session, court_id: int) -> CourtPriceTable:
+    return get_price_tables(db, [court_id])[court_id]
+
+
+def quote_slots(price_index: PriceRuleIndex, start: datetime, end: datetime, slot_minutes: int) -> float:
+    """Total de [start, end) sumando el precio de cada slot, sin tocar la DB."""
+    if start.weekday() != end.weekday():
+        raise HTTPException(422, "La reserva no puede cruzar días.")
+    slots = int((end - start).total_seconds() // 60) // slot_minutes
+    if slots <= 0:
+        raise HTTPException(422, "Duración inválida.")
+
+    step = timedelta(minutes=slot_minutes)
+    total = 0.0
+    s_i = start
+    for _ in range(slots):
+        e_i = s_i + step
+        s_t, e_t = s_i.time(), e_i.time()
+        price = price_index.lookup(s_t, e_t)
+        if price is None:
+            raise HTTPException(422, f"No hay regla de precio que cubra el slot {s_t.strftime('%H:%M')}–{e_t.strftime('%H:%M')}.")
+        total += price
+        s_i = e_i
+    return round(total, 2)
+
+
+def quote_booking(db: Session, court_id: int, start: datetime, end: datetime, slot_minutes: int) -> float:
+    """Tabla compilada (cache o una query) y el resto en memoria."""
+    table = get_price_table(db, court_id)
+    return quote_slots(table.for_weekday(start.weekday()), start, end, slot_minutes)
@@ -9,6 +9,7 @@ from app.core.deps import get_db, get_current_user, require_roles
 from app.domains.venues.models import Court
 from app.domains.schedules.models import CourtSchedule
 from app.domains.schedules.schemas import CourtScheduleCreate, CourtScheduleUpdate, CourtScheduleOut
+from app.domains.scheduling.service import invalidate_availability
 from app.domains.users.models import User
 
 router = APIRouter(prefix="/courts/{court_id}/schedules", tags=["schedules"])
@@ -65,6 +66,7 @@ def create_schedule(
         db.rollback()
         # índice único por (court_id, weekday)
         raise HTTPException(status_code=409, detail="Ya existe un horario para ese día en esta cancha.")
+    invalidate_availability(court_id)
     db.refresh(sched)
     return sched
 
@@ -104,6 +106,7 @@ def update_schedule(
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=409, detail="Ya existe un horario para ese día en esta cancha.")
+    invalidate_availability(court_id)
     db.refresh(sched)
     return sched
 
@@ -123,4 +126,5 @@ def delete_schedule(
         return
     db.delete(sched)
     db.commit()
+    invalidate_availability(court_id)
     return
@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from sqlalchemy import Date, DateTime, Integer, LargeBinary, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.db import Base
+
+class CourtOccupancy(Base):
+    """
+    Ocupación materializada de una cancha en un día: un bit por bloque de
+    `bit_minutes` contado desde las 00:00 (bit i = [i*bit_minutes, (i+1)*bit_minutes)).
+    Solo refleja bookings en Booking.blocking_statuses(); se mantiene en la misma
+    transacción que el cambio de estado (ver scheduling/occupancy.py).
+    """
+    __tablename__ = "court_occupancy"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    court_id: Mapped[int] = mapped_column(ForeignKey("courts.id", ondelete="CASCADE"), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    bit_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    bits: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, default=b"\x00")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("uq_occupancy_court_day", "court_id", "day", unique=True),
+    )
+
+    @property
+    def mask(self) -> int:
+        return int.from_bytes(self.bits or b"\x00", "big")
+
+    @mask.setter
+    def mask(self, value: int) -> None:
+        self.bits = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+
+    def __repr__(self) -> str:
+        return f"<CourtOccupancy court_id={self.court_id} day={self.day} bits={self.mask:b}>"
@@ -0,0 +1,225 @@
+# app/domains/scheduling/occupancy.py
+"""
+Bitmap de ocupación por (court, día). Lecturas: una fila por índice único +
+operaciones de bits. Escrituras: SELECT ... FOR UPDATE sobre la fila del día,
+dentro de la misma transacción que inserta/cambia el booking.
+
+Si la fila no existe (o cambió la resolución del schedule) se materializa desde
+`bookings` en el momento, así que no hace falta backfill.
+
+En Postgres la espera por el lock está acotada (settings.BOOKING_LOCK_TIMEOUT_MS):
+bajo contención el perdedor falla rápido en vez de encolarse. Como red de
+seguridad, la constraint ex_bookings_court_no_overlap rechaza solapamientos
+que se escapen de este camino.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from math import gcd
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domains.bookings.models import Booking
+from app.domains.scheduling.models import CourtOccupancy
+
+DAY_MINUTES = 24 * 60
+
+
+def bit_minutes_for(slot_minutes: int) -> int:
+    # Inicios válidos: hh:mm con mm % slot == 0; duraciones múltiplo de slot.
+    # Todo borde cae entonces en múltiplos de gcd(slot, 60) contados desde las 00:00
+    # (== slot_minutes para los divisores de 60: 15, 30, 60...).
+    return gcd(slot_minutes, 60)
+
+
+def _minute_of_day(day: date, dt: datetime) -> int:
+    m = int((dt - datetime.combine(day, time.min)).total_seconds() // 60)
+    return min(max(m, 0), DAY_MINUTES)
+
+
+def range_mask(day: date, start: datetime, end: datetime, bit_minutes: int) -> int:
+    """Bits que toca [start, end) en `day`. Bordes desalineados se redondean hacia afuera."""
+    i0 = _minute_of_day(day, start) // bit_minutes
+    i1 = -(-_minute_of_day(day, end) // bit_minutes)
+    if i1 <= i0:
+        return 0
+    return ((1 << (i1 - i0)) - 1) << i0
+
+
+def _day_window(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def _build_masks(db: Session, court_id: int, days: Iterable[date], bit_minutes: int) -> Dict[date, int]:
+    """Masks de varios días con UNA query (OR de rangos, usa ix_bookings_court_start_id)."""
+    days = sorted(set(days))
+    masks = {d: 0 for d in days}
+    if not days:
+        return masks
+    windows = [_day_window(d) for d in days]
+    rows = db.execute(
+        select(Booking.start_datetime, Booking.end_datetime).where(
+            and_(
+                Booking.court_id == court_id,
+                Booking.status.in_(Booking.blocking_statuses()),
+                or_(*[and_(Booking.start_datetime < we, Booking.end_datetime > ws) for ws, we in windows]),
+            )
+        )
+    ).all()
+    for s, e in rows:
+        # las reservas no cruzan días
+        d = s.date()
+        if d in masks:
+            masks[d] |= range_mask(d, s, e, bit_minutes)
+    return masks
+
+
+def _build_mask(db: Session, court_id: int, day: date, bit_minutes: int) -> int:
+    return _build_masks(db, court_id, [day], bit_minutes)[day]
+
+
+def _bound_lock_wait(db: Session) -> None:
+    # SET LOCAL vía set_config(..., true): vale hasta el fin de la transacción
+    ms = settings.BOOKING_LOCK_TIMEOUT_MS
+    if ms > 0 and db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.set_config("lock_timeout", f"{ms}ms", True)))
+
+
+def _select(db: Session, court_id: int, day: date, for_update: bool) -> Optional[CourtOccupancy]:
+    q = select(CourtOccupancy).where(
+        and_(CourtOccupancy.court_id == court_id, CourtOccupancy.day == day)
+    )
+    if for_update:
+        q = q.with_for_update()
+    return db.execute(q).scalar_one_or_none()
+
+
+# -------------------------
+# Lectura
+# -------------------------
+def read_day(db: Session, court_id: int, day: date, slot_minutes: int) -> Optional[CourtOccupancy]:
+    """Fila materializada sin lock, o None si falta o tiene otra resolución."""
+    occ = _select(db, court_id, day, for_update=False)
+    if occ is None or occ.bit_minutes != bit_minutes_for(slot_minutes):
+        return None
+    return occ
+
+
+def busy_checker(occ: CourtOccupancy) -> Callable[[datetime, datetime], bool]:
+    taken = occ.mask
+    return lambda s, e: bool(taken & range_mask(occ.day, s, e, occ.bit_minutes))
+
+
+# -------------------------
+# Escritura (el caller commitea)
+# -------------------------
+def lock_day(db: Session, court_id: int, day: date, slot_minutes: int) -> CourtOccupancy:
+    """SELECT ... FOR UPDATE de la fila del día; la materializa si hace falta."""
+    bit = bit_minutes_for(slot_minutes)
+    _bound_lock_wait(db)
+    occ = _select(db, court_id, day, for_update=True)
+    if occ is not None and occ.bit_minutes == bit:
+        return occ
+
+    db.flush()  # que el rebuild vea los cambios pendientes de la sesión
+    if occ is not None:
+        occ.bit_minutes = bit
+        occ.mask = _build_mask(db, court_id, day, bit)
+        return occ
+
+    occ = CourtOccupancy(court_id=court_id, day=day, bit_minutes=bit)
+    occ.mask = _build_mask(db, court_id, day, bit)
+    try:
+        with db.begin_nested():
+            db.add(occ)
+    except IntegrityError:
+        # otra transacción la materializó en paralelo: usar (y lockear) la suya
+        occ = _select(db, court_id, day, for_update=True)
+    return occ
+
+
+def lock_days(db: Session, court_id: int, days: Iterable[date], slot_minutes: int) -> Dict[date, CourtOccupancy]:
+    """
+    Igual que lock_day para varios días: un SELECT ... FOR UPDATE (ordenado por día)
+    y una sola query de bookings para materializar los que falten.
+    """
+    bit = bit_minutes_for(slot_minutes)
+    days = sorted(set(days))
+    _bound_lock_wait(db)
+    found: Dict[date, CourtOccupancy] = {
+        occ.day: occ
+        for occ in db.execute(
+            select(CourtOccupancy)
+            .where(and_(CourtOccupancy.court_id == court_id, CourtOccupancy.day.in_(days)))
+            .order_by(CourtOccupancy.day.asc())
+            .with_for_update()
+        ).scalars().all()
+    }
+    stale = [d for d in days if d not in found or found[d].bit_minutes != bit]
+    if not stale:
+        return found
+
+    db.flush()
+    masks = _build_masks(db, court_id, stale, bit)
+    new_rows: List[CourtOccupancy] = []
+    for d in stale:
+        occ = found.get(d)
+        if occ is None:
+            occ = CourtOccupancy(court_id=court_id, day=d, bit_minutes=bit)
+            new_rows.append(occ)
+            found[d] = occ
+        occ.bit_minutes = bit
+        occ.mask = masks[d]
+    if new_rows:
+        try:
+            with db.begin_nested():
+                db.add_all(new_rows)
+        except IntegrityError:
+            # carrera con otra materialización: caer al camino de a un día
+            for occ in new_rows:
+                found[occ.day] = lock_day(db, court_id, occ.day, slot_minutes)
+    return found
+
+
+def is_free(
+    occ: CourtOccupancy,
+    start: datetime,
+    end: datetime,
+    exclude: Optional[Tuple[datetime, datetime]] = None,
+) -> bool:
+    taken = occ.mask
+    if exclude is not None:
+        taken &= ~range_mask(occ.day, exclude[0], exclude[1], occ.bit_minutes)
+    return not (taken & range_mask(occ.day, start, end, occ.bit_minutes))
+
+
+def occupy(occ: CourtOccupancy, start: datetime, end: datetime) -> None:
+    occ.mask = occ.mask | range_mask(occ.day, start, end, occ.bit_minutes)
+
+
+def release(occ: CourtOccupancy, start: datetime, end: datetime) -> None:
+    occ.mask = occ.mask & ~range_mask(occ.day, start, end, occ.bit_minutes)
+
+
+def release_bookings(db: Session, items: Iterable[Tuple[int, datetime, datetime]]) -> None:
+    """
+    Libera (court_id, start, end) de bookings que dejaron de bloquear.
+    Lockea en orden (court_id, día) para no generar deadlocks entre batches.
+    Días no materializados se ignoran: se reconstruirán desde bookings.
+    """
+    by_key: dict[Tuple[int, date], list[Tuple[datetime, datetime]]] = defaultdict(list)
+    for court_id, s, e in items:
+        by_key[(court_id, s.date())].append((s, e))
+    if by_key:
+        _bound_lock_wait(db)
+    for court_id, day in sorted(by_key):
+        occ = _select(db, court_id, day, for_update=True)
+        if occ is None:
+            continue
+        for s, e in by_key[(court_id, day)]:
+            release(occ, s, e)
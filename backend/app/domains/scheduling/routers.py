@@ -1,111 +1,73 @@
 # app/routers/availability.py
-from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import date
+from typing import List
 from fastapi import APIRouter, HTTPException, Query, Depends
-from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 # from zoneinfo import ZoneInfo  # si usás tz aware
 
 from app.core.deps import get_db
-from app.domains.schedules.models import CourtSchedule
-from app.domains.bookings.models import Booking
-from app.shared.enums import BookingStatusEnum
-from app.domains.pricing.models import Price
+from app.domains.scheduling.service import (
+    MAX_RANGE_COURTS,
+    MAX_RANGE_DAYS,
+    get_day_availability,
+    get_range_availability,
+)
 
 router = APIRouter(prefix="/courts", tags=["availability"])
 
-@router.get("/{court_id}/availability")
-def get_availability(
-    court_id: int,
-    date_str: str = Query(..., alias="date", description="YYYY-MM-DD"),
-    db: Session = Depends(get_db),
-):
-    # 1) Validar fecha
+def _parse_date(value: str, name: str) -> date:
     try:
-        target_date = date.fromisoformat(date_str)
+        return date.fromisoformat(value)
     except ValueError:
-        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
-
-    weekday = target_date.weekday()
+        raise HTTPException(status_code=400, detail=f"{name} must be YYYY-MM-DD")
 
-    # 2) Traer schedule del día
-    sched: Optional[CourtSchedule] = db.execute(
-        select(CourtSchedule).where(
-            and_(CourtSchedule.court_id == court_id, CourtSchedule.weekday == weekday)
-        )
-    ).scalar_one_or_none()
-
-    if not sched:
-        return {"court_id": court_id, "date": date_str, "slot_minutes": None, "slots": []}
-
-    slot_minutes = sched.slot_minutes
-
-    # tz = ZoneInfo("America/Argentina/Buenos_Aires")  # si trabajás aware
-    day_open = datetime.combine(target_date, sched.open_time)  # .replace(tzinfo=tz)
-    day_close = datetime.combine(target_date, sched.close_time)  # .replace(tzinfo=tz)
-
-    if day_open >= day_close:
-        # defensa básica ante datos mal cargados
-        return {"court_id": court_id, "date": date_str, "slot_minutes": slot_minutes, "slots": []}
-
-    # 3) Bookings activos que se solapen con la ventana del día
-    bookings: List[Booking] = db.execute(
-        select(Booking).where(
-            and_(
-                Booking.court_id == court_id,
-                Booking.status != BookingStatusEnum.CANCELLED,
-                Booking.start_datetime < day_close,
-                Booking.end_datetime > day_open,
-            )
-        )
-    ).scalars().all()
-
-    # 4) Generar slots teóricos y marcar disponibilidad
-    slots: List[Dict[str, Any]] = []
-    current = day_open
-    step = timedelta(minutes=slot_minutes)
+def _parse_court_ids(raw: str) -> List[int]:
+    try:
+        ids = [int(x) for x in raw.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="court_ids must be a comma-separated list of integers")
+    if not ids:
+        raise HTTPException(status_code=400, detail="court_ids is required")
+    return ids
+
+@router.get("/availability")
+def get_availability_range(
+    court_ids: str = Query(..., description="IDs separados por coma, ej: 1,2,3"),
+    from_str: str = Query(..., alias="from", description="YYYY-MM-DD"),
+    to_str: str = Query(..., alias="to", description="YYYY-MM-DD (inclusive)"),
+    db: Session = Depends(get_db),
+):
+    ids = _parse_court_ids(court_ids)
+    from_date = _parse_date(from_str, "from")
+    to_date = _parse_date(to_str, "to")
 
-    while current + step <= day_close:
-        next_dt = current + step
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="to must be >= from")
+    if (to_date - from_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"range cannot exceed {MAX_RANGE_DAYS} days")
+    if len(set(ids)) > MAX_RANGE_COURTS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_RANGE_COURTS} courts per request")
 
-        # Convención de solapamiento semiabierto: [start, end)
-        is_free = True
-        for bk in bookings:
-            if current < bk.end_datetime and next_dt > bk.start_datetime:
-                is_free = False
-                break
+    return {
+        "from": from_date.isoformat(),
+        "to": to_date.isoformat(),
+        "courts": get_range_availability(db, ids, from_date, to_date),
+    }
 
-        # 5) Resolver precio: regla que cubra completamente el slot
-        s_t, e_t = current.time(), next_dt.time()
-        price_rule: Optional[Price] = db.execute(
-            select(Price).where(
-                and_(
-                    Price.court_id == court_id,
-                    Price.weekday == weekday,
-                    Price.start_time <= s_t,
-                    Price.end_time >= e_t,
-                )
-            )
-            # .order_by(Price.priority.desc())   # si tenés un campo de prioridad
-        ).scalar_one_or_none()
+@router.get("/{court_id}/availability")
+def get_availability(
+    court_id: int,
+    date_str: str = Query(..., alias="date", description="YYYY-MM-DD"),
+    db: Session = Depends(get_db),
+):
+    target_date = _parse_date(date_str, "date")
 
-        slots.append({
-            "start": current.isoformat(),
-            "end": next_dt.isoformat(),
-            "available": is_free,
-            "price_per_slot": float(price_rule.price_per_slot) if price_rule else None,
-            "currency": "ARS",
-        })
-        current = next_dt
+    # copia superficial: el payload viene del cache compartido
+    day = {**get_day_availability(db, court_id, target_date), "date": date_str}
 
     # (Opcional) Ocultar slots pasados si la fecha es hoy
     # now = datetime.now(tz)  # si usás tz aware
     # if target_date == now.date():
     #     slots = [s for s in slots if datetime.fromisoformat(s["start"]) > now]
 
-    return {
-        "court_id": court_id,
-        "date": date_str,
-        "slot_minutes": slot_minutes,
-        "slots": slots,
-    }
+    return day
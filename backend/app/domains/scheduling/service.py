@@ -0,0 +1,216 @@
+# app/domains/scheduling/service.py
+from __future__ import annotations
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.shared.cache import TTLCache
+from app.domains.schedules.models import CourtSchedule
+from app.domains.bookings.models import Booking
+from app.domains.scheduling import occupancy
+from app.domains.pricing.service import PriceRuleIndex, get_price_table, get_price_tables
+
+MAX_RANGE_DAYS = 31
+MAX_RANGE_COURTS = 50
+
+# (court_id, date) -> payload de get_day_availability. Se invalida explícitamente
+# desde bookings/schedules/prices; el TTL acota staleness entre workers.
+availability_cache: TTLCache[tuple[int, date], Dict[str, Any]] = TTLCache(
+    max_entries=settings.AVAILABILITY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AVAILABILITY_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_availability(court_id: int, *days: date) -> None:
+    """Sin `days` invalida todas las fechas cacheadas de la cancha."""
+    if days:
+        for d in days:
+            availability_cache.delete((court_id, d))
+    else:
+        availability_cache.delete_where(lambda k: k[0] == court_id)
+
+
+def _empty_day(court_id: int, target_date: date, slot_minutes: Optional[int]) -> Dict[str, Any]:
+    return {"court_id": court_id, "date": target_date.isoformat(), "slot_minutes": slot_minutes, "slots": []}
+
+
+BusyFn = Callable[[datetime, datetime], bool]
+
+
+def sweep_checker(bookings: Sequence[Booking]) -> BusyFn:
+    """
+    Barrido sobre bookings ordenados por start_datetime: `busy_until` es el mayor
+    fin entre los que arrancan antes del fin del slot (cubre reservas multi-slot
+    y desalineadas). Hay que consultarlo con slots crecientes. O(slots + bookings).
+    """
+    bk_idx = 0
+    busy_until: Optional[datetime] = None
+
+    def busy(current: datetime, next_dt: datetime) -> bool:
+        nonlocal bk_idx, busy_until
+        while bk_idx < len(bookings) and bookings[bk_idx].start_datetime < next_dt:
+            bk_end = bookings[bk_idx].end_datetime
+            if busy_until is None or bk_end > busy_until:
+                busy_until = bk_end
+            bk_idx += 1
+        # Convención de solapamiento semiabierto: [start, end)
+        return busy_until is not None and busy_until > current
+
+    return busy
+
+
+def build_day_slots(
+    target_date: date,
+    sched: CourtSchedule,
+    busy: BusyFn,
+    price_index: PriceRuleIndex,
+) -> List[Dict[str, Any]]:
+    """Genera los slots del día a partir del schedule; `busy` se consulta en orden."""
+    # tz = ZoneInfo("America/Argentina/Buenos_Aires")  # si trabajás aware
+    day_open = datetime.combine(target_date, sched.open_time)  # .replace(tzinfo=tz)
+    day_close = datetime.combine(target_date, sched.close_time)  # .replace(tzinfo=tz)
+
+    slots: List[Dict[str, Any]] = []
+    current = day_open
+    step = timedelta(minutes=sched.slot_minutes)
+
+    while current + step <= day_close:
+        next_dt = current + step
+        is_free = not busy(current, next_dt)
+
+        # Resolver precio: regla que cubra completamente el slot
+        price = price_index.lookup(current.time(), next_dt.time())
+
+        slots.append({
+            "start": current.isoformat(),
+            "end": next_dt.isoformat(),
+            "available": is_free,
+            "price_per_slot": price,
+            "currency": "ARS",
+        })
+        current = next_dt
+
+    return slots
+
+
+def get_day_availability(db: Session, court_id: int, target_date: date) -> Dict[str, Any]:
+    """Cacheado por (court_id, fecha). El payload es compartido: no mutarlo."""
+    key = (court_id, target_date)
+    day = availability_cache.get(key)
+    if day is None:
+        day = _compute_day_availability(db, court_id, target_date)
+        availability_cache.set(key, day)
+    return day
+
+
+def _compute_day_availability(db: Session, court_id: int, target_date: date) -> Dict[str, Any]:
+    weekday = target_date.weekday()
+
+    # 1) Schedule del día
+    sched: Optional[CourtSchedule] = db.execute(
+        select(CourtSchedule).where(
+            and_(CourtSchedule.court_id == court_id, CourtSchedule.weekday == weekday)
+        )
+    ).scalar_one_or_none()
+
+    if not sched:
+        return _empty_day(court_id, target_date, None)
+
+    day_open = datetime.combine(target_date, sched.open_time)
+    day_close = datetime.combine(target_date, sched.close_time)
+    if day_open >= day_close:
+        # defensa básica ante datos mal cargados
+        return _empty_day(court_id, target_date, sched.slot_minutes)
+
+    # 2) Ocupación: bitmap materializado (una fila) o, si el día no está
+    #    materializado, bookings bloqueantes que se solapen con la ventana
+    occ = occupancy.read_day(db, court_id, target_date, sched.slot_minutes)
+    if occ is not None:
+        busy = occupancy.busy_checker(occ)
+    else:
+        bookings: List[Booking] = db.execute(
+            select(Booking).where(
+                and_(
+                    Booking.court_id == court_id,
+                    Booking.status.in_(Booking.blocking_statuses()),
+                    Booking.start_datetime < day_close,
+                    Booking.end_datetime > day_open,
+                )
+            ).order_by(Booking.start_datetime.asc())
+        ).scalars().all()
+        busy = sweep_checker(bookings)
+
+    # 3) Tabla de precios compilada (cache o una query), lookup en memoria por slot
+    price_index = get_price_table(db, court_id).for_weekday(weekday)
+
+    day = _empty_day(court_id, target_date, sched.slot_minutes)
+    day["slots"] = build_day_slots(target_date, sched, busy, price_index)
+    return day
+
+
+def get_range_availability(
+    db: Session, court_ids: Iterable[int], from_date: date, to_date: date
+) -> List[Dict[str, Any]]:
+    """
+    Disponibilidad de varias canchas en [from_date, to_date] (ambos inclusive)
+    con tres queries como máximo: schedules, precios (solo canchas fuera del
+    cache de tablas) y bookings.
+    """
+    court_ids = list(dict.fromkeys(court_ids))
+    days = [from_date + timedelta(days=i) for i in range((to_date - from_date).days + 1)]
+    range_start = datetime.combine(from_date, datetime.min.time())
+    range_end = datetime.combine(to_date + timedelta(days=1), datetime.min.time())
+
+    scheds: Dict[tuple[int, int], CourtSchedule] = {
+        (s.court_id, s.weekday): s
+        for s in db.execute(
+            select(CourtSchedule).where(CourtSchedule.court_id.in_(court_ids))
+        ).scalars().all()
+    }
+
+    price_tables = get_price_tables(db, court_ids)
+
+    bookings_by_court: Dict[int, List[Booking]] = defaultdict(list)
+    for bk in db.execute(
+        select(Booking).where(
+            and_(
+                Booking.court_id.in_(court_ids),
+                Booking.status.in_(Booking.blocking_statuses()),
+                Booking.start_datetime < range_end,
+                Booking.end_datetime > range_start,
+            )
+        ).order_by(Booking.court_id.asc(), Booking.start_datetime.asc())
+    ).scalars().all():
+        bookings_by_court[bk.court_id].append(bk)
+
+    out: List[Dict[str, Any]] = []
+    for court_id in court_ids:
+        court_bookings = bookings_by_court.get(court_id, [])
+        court_starts = [bk.start_datetime for bk in court_bookings]
+        court_days: List[Dict[str, Any]] = []
+        for d in days:
+            sched = scheds.get((court_id, d.weekday()))
+            if not sched:
+                court_days.append(_empty_day(court_id, d, None))
+                continue
+            day = _empty_day(court_id, d, sched.slot_minutes)
+            day_open = datetime.combine(d, sched.open_time)
+            day_close = datetime.combine(d, sched.close_time)
+            if day_open < day_close:
+                # Las reservas no cruzan días (ver _validate_within_schedule):
+                # alcanza con cortar por inicio dentro del día, sin re-escanear.
+                lo = bisect_left(court_starts, datetime.combine(d, datetime.min.time()))
+                hi = bisect_left(court_starts, day_close)
+                day_bookings = [bk for bk in court_bookings[lo:hi] if bk.end_datetime > day_open]
+                day["slots"] = build_day_slots(
+                    d, sched, sweep_checker(day_bookings),
+                    price_tables[court_id].for_weekday(d.weekday()),
+                )
+            court_days.append(day)
+        out.append({"court_id": court_id, "days": court_days})
+    return out
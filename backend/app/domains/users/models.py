@@ -1,5 +1,5 @@
 # models/user
-from sqlalchemy import String, DateTime, func, Enum as SAEnum
+from sqlalchemy import Boolean, Integer, String, DateTime, func, Enum as SAEnum, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List, Optional
 from datetime import datetime
@@ -18,6 +18,10 @@ class User(Base):
     phone: Mapped[str | None] = mapped_column(String(20), nullable=True, unique=True)
     role: Mapped[RoleEnum] = mapped_column(SAEnum(RoleEnum), default=RoleEnum.PLAYER, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    # owners: en vez de un mail por reserva, un resumen cada OWNER_DIGEST_WINDOW_MINUTES
+    owner_digest: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
+    # versión del link de GET /users/me/calendar.ics (claim cal_v); rotar la incrementa
+    calendar_feed_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     bookings: Mapped[List["Booking"]] = relationship(back_populates="user")
     owned_venues: Mapped[List["Venue"]] = relationship(
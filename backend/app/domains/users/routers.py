@@ -1,6 +1,6 @@
 # router/users
 import os
-from fastapi import APIRouter, Depends, status, HTTPException, Header
+from fastapi import APIRouter, Depends, status, HTTPException, Header, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from passlib.hash import bcrypt
@@ -9,6 +9,9 @@ from app.domains.users.models import User
 from app.shared.enums import RoleEnum
 from app.domains.users.schemas import UserCreate, UserOut, UserRoleUpdate, UserUpdate
 from app.domains.bookings.models import Booking
+from app.domains.bookings.calendar_feed import feed_response, feed_token, key_from_token, rotate_feed_token
+from app.domains.bookings.schemas import CalendarFeedOut
+from app.shared.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, NEXT_CURSOR_HEADER, keyset_page, set_next_cursor
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -30,6 +33,9 @@ def update_user_basic(
     if payload.phone is not None:
         # reutilizá tu validador E164 si querés, o validá acá
         user.phone = payload.phone
+    if payload.owner_digest is not None:
+        # sólo cambia los mails al owner; los del jugador siguen siendo inmediatos
+        user.owner_digest = payload.owner_digest
 
     db.add(user)
     db.commit()
@@ -86,9 +92,19 @@ def update_user_role(
     return user
 
 @router.get("/me/bookings", response_model=list[dict])  # podés tipar con un Schema si ya lo tenés
-def my_bookings(db: Session = Depends(get_db), me: User = Depends(get_current_user)):
+def my_bookings(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: str | None = Query(None, description=f"Valor de {NEXT_CURSOR_HEADER} de la página anterior"),
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
     # Devolvé lo esencial; si tenés schema BookingOut, usalo
-    rows = db.scalars(select(Booking).where(Booking.user_id == me.id)).all()
+    rows, next_cursor = keyset_page(
+        db, select(Booking).where(Booking.user_id == me.id),
+        Booking.start_datetime, Booking.id, limit, cursor,
+    )
+    set_next_cursor(response, next_cursor)
     return [
         {
             "id": b.id,
@@ -102,3 +118,26 @@ def my_bookings(db: Session = Depends(get_db), me: User = Depends(get_current_us
         }
         for b in rows
     ]
+
+@router.get("/me/calendar-feed", response_model=CalendarFeedOut)
+def my_calendar_feed_link(request: Request, me: User = Depends(get_current_user)):
+    # el token va en la URL: los clientes de calendario no mandan Authorization
+    token = feed_token(("user", me.id), me.calendar_feed_version)
+    url = request.url_for("my_calendar_feed").include_query_params(token=token)
+    return CalendarFeedOut(url=str(url), token=token)
+
+@router.post("/me/calendar-feed/rotate", response_model=CalendarFeedOut)
+def rotate_my_calendar_feed_link(request: Request, db: Session = Depends(get_db),
+                                 me: User = Depends(get_current_user)):
+    # el link anterior deja de funcionar (p. ej. si se filtró)
+    token = rotate_feed_token(db, ("user", me.id))
+    url = request.url_for("my_calendar_feed").include_query_params(token=token)
+    return CalendarFeedOut(url=str(url), token=token)
+
+@router.get("/me/calendar.ics", name="my_calendar_feed")
+def my_calendar_feed(
+    token: str = Query(..., description="Token de GET /users/me/calendar-feed"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db),
+):
+    return feed_response(db, key_from_token(db, token), if_none_match)
@@ -31,6 +31,7 @@ class UserOut(BaseModel):
     phone: Optional[str] = None
     role: RoleEnum
     created_at: datetime
+    owner_digest: bool = False
     model_config = ConfigDict(from_attributes=True)
 
 class UserRoleUpdate(BaseModel):
@@ -39,6 +40,7 @@ class UserRoleUpdate(BaseModel):
 class UserUpdate(BaseModel):
     name: Optional[str] = None
     phone: Optional[str] = None
+    owner_digest: Optional[bool] = None
 
     @field_validator("phone")
     @classmethod
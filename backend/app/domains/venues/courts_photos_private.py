@@ -6,6 +6,7 @@ from sqlalchemy import select
 from app.core.deps import get_db, require_owner
 from app.domains.users.models import User
 from app.domains.venues.models import Venue, Court, CourtPhoto
+from app.domains.venues.covers import sync_court_cover
 from app.domains.venues.schemas import CourtPhotoCreate, CourtPhotoUpdate, CourtPhotoOut
 
 router = APIRouter(
@@ -48,6 +49,7 @@ def add_photo(
             .update({CourtPhoto.is_cover: False})
     ph = CourtPhoto(court_id=court_id, **payload.model_dump())
     db.add(ph)
+    sync_court_cover(db, court_id)
     db.commit()
     db.refresh(ph)
     return ph
@@ -69,6 +71,7 @@ def update_photo(
         ).update({CourtPhoto.is_cover: False})
     for f, v in payload.model_dump(exclude_unset=True).items():
         setattr(ph, f, v)
+    sync_court_cover(db, court_id)
     db.commit()
     db.refresh(ph)
     return ph
@@ -84,4 +87,5 @@ def delete_photo(
     if not ph or ph.court_id != court_id:
         raise HTTPException(404, "Foto no encontrada")
     db.delete(ph)
+    sync_court_cover(db, court_id)
     db.commit()
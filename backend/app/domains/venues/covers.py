@@ -0,0 +1,51 @@
+# app/domains/venues/covers.py
+"""
+Portadas denormalizadas: venues.cover_url y courts.cover_url guardan la URL de
+la foto que hoy ganaría el orden (is_cover desc, sort_order, id). Los routers de
+fotos llaman a sync_* después de cualquier alta/edición/baja, en la misma
+transacción, así las lecturas públicas no ordenan fotos por fila.
+"""
+from __future__ import annotations
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.domains.venues.models import Court, CourtPhoto, Venue, VenuePhoto
+
+
+def venue_cover_select(venue_id_col):
+    return (
+        select(VenuePhoto.url)
+        .where(VenuePhoto.venue_id == venue_id_col)
+        .order_by(VenuePhoto.is_cover.desc(), VenuePhoto.sort_order.asc(), VenuePhoto.id.asc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def court_cover_select(court_id_col):
+    return (
+        select(CourtPhoto.url)
+        .where(CourtPhoto.court_id == court_id_col)
+        .order_by(CourtPhoto.is_cover.desc(), CourtPhoto.sort_order.asc(), CourtPhoto.id.asc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def sync_venue_cover(db: Session, venue_id: int) -> None:
+    db.flush()  # autoflush=False: que el UPDATE vea los cambios pendientes
+    db.execute(
+        update(Venue).where(Venue.id == venue_id)
+        .values(cover_url=venue_cover_select(venue_id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def sync_court_cover(db: Session, court_id: int) -> None:
+    db.flush()
+    db.execute(
+        update(Court).where(Court.id == court_id)
+        .values(cover_url=court_cover_select(court_id))
+        .execution_options(synchronize_session=False)
+    )
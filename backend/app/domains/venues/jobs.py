@@ -0,0 +1,21 @@
+# app/domains/venues/jobs.py
+"""Jobs periódicos de venues (ver app/core/scheduler.py)."""
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.scheduler import PeriodicScheduler
+from app.domains.venues.suggest import load_suggest_index
+
+
+def run_suggest_rebuild() -> None:
+    # reconcilia con cambios hechos por otros procesos
+    db = SessionLocal()
+    try:
+        load_suggest_index(db)
+    finally:
+        db.close()
+
+
+def register_jobs(scheduler: PeriodicScheduler) -> None:
+    scheduler.register("venues-suggest-rebuild", settings.SUGGEST_REBUILD_INTERVAL_SECONDS, run_suggest_rebuild)
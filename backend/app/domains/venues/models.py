@@ -1,6 +1,6 @@
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, func, Numeric, Integer
+from sqlalchemy import String, DateTime, ForeignKey, func, Numeric, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.db import Base
 
@@ -10,6 +10,15 @@ from app.shared.enums import SportEnum, SurfaceEnum
 
 class Venue(Base):
     __tablename__ = "venues"
+    __table_args__ = (
+        # prefiltro por caja de la búsqueda por radio (venues/public.py: bbox_filter)
+        Index("ix_venues_lat_lng", "latitude", "longitude"),
+        # búsqueda de texto (venues/search.py); en SQLite queda como índice común
+        Index(
+            "ix_venues_search_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
@@ -20,6 +29,12 @@ class Venue(Base):
     longitude: Mapped[Optional[float]] = mapped_column(Numeric(9, 6))
 
     owner_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # portada denormalizada (ver venues/covers.py); la mantienen los routers de fotos
+    cover_url: Mapped[Optional[str]] = mapped_column(String(600), nullable=True)
+    # nombre + dirección + ciudad normalizados (ver venues/search.py)
+    search_text: Mapped[str] = mapped_column(String(600), nullable=False, server_default="", default="")
+    # versión del link de GET /venues/{id}/calendar.ics (claim cal_v); rotar la incrementa
+    calendar_feed_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     owner: Mapped["User"] = relationship(
         "User",
@@ -48,6 +63,8 @@ class Court(Base):
     indoor: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     number: Mapped[Optional[str]] = mapped_column(String(20))
     notes: Mapped[Optional[str]] = mapped_column(Text)
+    # portada propia (sin fallback a la del venue); ver venues/covers.py
+    cover_url: Mapped[Optional[str]] = mapped_column(String(600), nullable=True)
 
     venue: Mapped["Venue"] = relationship(back_populates="courts")
     schedules: Mapped[List["CourtSchedule"]] = relationship(back_populates="court", cascade="all, delete-orphan")
@@ -1,13 +1,20 @@
 #venues/public
+import math
+from datetime import date, datetime, time
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, or_, case
+from sqlalchemy import select, func, or_, and_, case, exists
 
+from app.core.config import settings
 from app.core.deps import get_db
-from app.domains.venues.models import Venue, Court, CourtPhoto, VenuePhoto
+from app.domains.venues.models import Venue, Court, CourtPhoto
+from app.domains.venues.search import court_number_match, query_tokens, venue_text_match, venue_text_rank
+from app.domains.venues.suggest import suggest_index
 from app.domains.pricing.models import Price
+from app.domains.schedules.models import CourtSchedule
+from app.domains.bookings.models import Booking
 from pydantic import BaseModel
 
 router = APIRouter(tags=["venues-public"])
@@ -15,7 +22,7 @@ router = APIRouter(tags=["venues-public"])
 # -------- Helpers --------
 def haversine_km(lat1, lng1, lat2, lng2):
     # Aproximación; en prod preferí PostGIS
-    return 6371 * func.acos(
+    return EARTH_RADIUS_KM * func.acos(
         func.least(
             1.0,
             func.cos(func.radians(lat1)) * func.cos(func.radians(lat2)) *
@@ -24,6 +31,34 @@ def haversine_km(lat1, lng1, lat2, lng2):
         )
     )
 
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = EARTH_RADIUS_KM * math.pi / 180  # ~111.19
+
+
+def bbox_filter(lat: float, lng: float, radius_km: float, lat_col, lng_col):
+    """
+    Prefiltro por caja lat/lng que contiene el círculo de `radius_km`: comparaciones
+    simples que usan ix_venues_lat_lng. Es conservador (la caja cubre el círculo),
+    así que el haversine posterior da exactamente el mismo resultado.
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    min_lat, max_lat = lat - dlat, lat + dlat
+    conds = [lat_col.between(min_lat, max_lat)]
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if max_lat >= 90 or min_lat <= -90 or cos_lat <= 1e-9:
+        return and_(*conds)  # la caja toca un polo: cualquier longitud
+    dlng = dlat / cos_lat
+    if dlng >= 180:
+        return and_(*conds)
+    min_lng, max_lng = lng - dlng, lng + dlng
+    if min_lng < -180:   # cruza el antimeridiano: dos rangos
+        conds.append(or_(lng_col >= min_lng + 360, lng_col <= max_lng))
+    elif max_lng > 180:
+        conds.append(or_(lng_col >= min_lng, lng_col <= max_lng - 360))
+    else:
+        conds.append(lng_col.between(min_lng, max_lng))
+    return and_(*conds)
+
 # -------- Courts públicos --------
 @router.get("/venues/courts/search")
 def search_courts(
@@ -32,29 +67,33 @@ def search_courts(
     lng: Optional[float] = None,
     radius_km: Optional[float] = Query(None, ge=0),
     sport: Optional[str] = None,   # si querés, tipalo con tu enum y casteá str()
+    date_: Optional[date] = Query(None, alias="date", description="YYYY-MM-DD; requiere from_time/to_time"),
+    from_time: Optional[time] = Query(None, description="HH:MM"),
+    to_time: Optional[time] = Query(None, description="HH:MM"),
     limit: int = Query(24, ge=1, le=100),
     db: Session = Depends(get_db),
 ) -> List[Dict[str, Any]]:
 
-    # --- subqueries: portada court y portada venue ---
-    court_cover_sq = (
-        select(CourtPhoto.url)
-        .where(CourtPhoto.court_id == Court.id)
-        .order_by(CourtPhoto.is_cover.desc(), CourtPhoto.sort_order.asc(), CourtPhoto.id.asc())
-        .limit(1)
-        .scalar_subquery()
-    )
-
-    venue_cover_sq = (
-        select(VenuePhoto.url)
-        .where(VenuePhoto.venue_id == Court.venue_id)
-        .order_by(VenuePhoto.is_cover.desc(), VenuePhoto.sort_order.asc(), VenuePhoto.id.asc())
+    window_params = (date_, from_time, to_time)
+    if any(p is not None for p in window_params) and not all(p is not None for p in window_params):
+        raise HTTPException(status_code=422, detail="date, from_time y to_time van juntos")
+    if from_time is not None and to_time is not None and from_time >= to_time:
+        raise HTTPException(status_code=422, detail="from_time debe ser < to_time")
+
+    # --- portada: columnas denormalizadas (court y, si no tiene, la del venue) ---
+    photo_url_expr = func.coalesce(Court.cover_url, Venue.cover_url).label("photo_url")  # 👈 usar este
+
+    # price_hint: primera regla por (weekday, start_time).
+    # Correlacionada en el mismo statement; uq_price_rule la resuelve con un index scan
+    price_hint_sq = (
+        select(Price.price_per_slot)
+        .where(Price.court_id == Court.id)
+        .order_by(Price.weekday.asc(), Price.start_time.asc())
         .limit(1)
         .scalar_subquery()
+        .label("price_hint")
     )
 
-    photo_url_expr = func.coalesce(court_cover_sq, venue_cover_sq).label("photo_url")  # 👈 usar este
-
     # --- base select ---
     stmt = (
         select(
@@ -65,34 +104,61 @@ def search_courts(
             Venue.name.label("venue_name"),
             Venue.address, Venue.latitude, Venue.longitude,
             photo_url_expr,  # 👈 portada
+            price_hint_sq,
         )
         .join(Venue, Venue.id == Court.venue_id)
     )
 
     # --- filtros ---
-    if q:
-        pattern = f"%{q.strip()}%"
-        stmt = stmt.where(
-            or_(
-                Venue.name.ilike(pattern),
-                Venue.address.ilike(pattern),
-                Court.number.ilike(pattern),
-            )
-        )
+    tokens = query_tokens(q)
+    if tokens:
+        # cada lado por separado (sin correlacionar) para que el de venues use
+        # ix_venues_search_trgm; un OR entre tablas del join no puede usarlo
+        venue_hits = select(Venue.id).where(venue_text_match(db, tokens)).correlate(None)
+        court_hits = select(Court.id).where(court_number_match(tokens)).correlate(None)
+        stmt = stmt.where(or_(Venue.id.in_(venue_hits), Court.id.in_(court_hits)))
 
     if sport:
         # si sport viene como string "PADEL"/"TENNIS", y Court.sport es Enum, esto suele funcionar,
         # pero si tu DB guarda el enum como nombre distinto, castealo según tu ORM/enum.
         stmt = stmt.where(Court.sport == sport)
 
+    if date_ is not None:
+        # Ventana libre completa: el schedule del día la cubre y ningún booking
+        # bloqueante se solapa (semiabierto [start, end)). Todo en el mismo statement.
+        win_start = datetime.combine(date_, from_time)
+        win_end = datetime.combine(date_, to_time)
+        stmt = stmt.join(
+            CourtSchedule,
+            and_(
+                CourtSchedule.court_id == Court.id,
+                CourtSchedule.weekday == date_.weekday(),
+                CourtSchedule.open_time <= from_time,
+                CourtSchedule.close_time >= to_time,
+            ),
+        ).where(
+            ~exists().where(
+                and_(
+                    Booking.court_id == Court.id,
+                    Booking.status.in_(Booking.blocking_statuses()),
+                    Booking.start_datetime < win_end,
+                    Booking.end_datetime > win_start,
+                )
+            )
+        )
+
     # --- distancia y orden ---
     distance_col = None
     if lat is not None and lng is not None:
         distance_col = haversine_km(lat, lng, Venue.latitude, Venue.longitude).label("distance_km")
         stmt = stmt.add_columns(distance_col)
         if radius_km:
+            # caja indexada primero; haversine sólo sobre los sobrevivientes
+            stmt = stmt.where(bbox_filter(lat, lng, radius_km, Venue.latitude, Venue.longitude))
             stmt = stmt.where(distance_col <= radius_km)
         stmt = stmt.order_by(distance_col.asc(), Venue.name.asc())
+    elif tokens:
+        stmt = stmt.order_by(venue_text_rank(db, tokens).desc(), Venue.name.asc())
     else:
         stmt = stmt.order_by(Venue.name.asc())
 
@@ -102,13 +168,7 @@ def search_courts(
     results: List[Dict[str, Any]] = []
     for r in rows:
         m = r._mapping
-
-        price_hint = db.execute(
-            select(Price.price_per_slot)
-            .where(Price.court_id == m["court_id"])
-            .order_by(Price.weekday.asc(), Price.start_time.asc())
-            .limit(1)
-        ).scalar_one_or_none()
+        price_hint = float(m["price_hint"]) if m["price_hint"] is not None else None
 
         lat_val = float(m["latitude"]) if m["latitude"] is not None else None
         lng_val = float(m["longitude"]) if m["longitude"] is not None else None
@@ -125,29 +185,15 @@ def search_courts(
             "lng": lng_val,
             "address": m["address"],
             "distance_km": float(m["distance_km"]) if distance_col is not None and m.get("distance_km") is not None else None,
-            "price_hint": float(price_hint) if price_hint is not None else None,
+            "price_hint": price_hint,
             "photo_url": m["photo_url"],        # 👈 usar alias correcto
         })
     return results
 
 @router.get("/venues/courts/{court_id}")
 def get_court_public(court_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
-    # subqueries: cover court y cover venue
-    court_cover_sq = (
-        select(CourtPhoto.url)
-        .where(CourtPhoto.court_id == Court.id)
-        .order_by(CourtPhoto.is_cover.desc(), CourtPhoto.sort_order.asc(), CourtPhoto.id.asc())
-        .limit(1)
-        .scalar_subquery()
-    )
-    venue_cover_sq = (
-        select(VenuePhoto.url)
-        .where(VenuePhoto.venue_id == Court.venue_id)
-        .order_by(VenuePhoto.is_cover.desc(), VenuePhoto.sort_order.asc(), VenuePhoto.id.asc())
-        .limit(1)
-        .scalar_subquery()
-    )
-    cover_expr = func.coalesce(court_cover_sq, venue_cover_sq).label("cover_url")
+    # portada denormalizada: court y, si no tiene, la del venue
+    cover_expr = func.coalesce(Court.cover_url, Venue.cover_url).label("cover_url")
 
     row = db.execute(
         select(
@@ -214,6 +260,7 @@ class VenuePublicOut(BaseModel):
     city: str
     latitude: float | None = None
     longitude: float | None = None
+    cover_url: str | None = None
 
     class Config:
         from_attributes = True
@@ -247,6 +294,14 @@ def list_public_venues_geojson(
 
     return JSONResponse({"type": "FeatureCollection", "features": features})
 
+@router.get("/venues/public/suggest")
+def suggest_public_venues(
+    prefix: str = Query(..., min_length=1, max_length=80, description="Lo tipeado hasta ahora"),
+    limit: int = Query(8, ge=1),
+) -> List[Dict[str, Any]]:
+    # sin DB: índice en memoria (venues/suggest.py)
+    return suggest_index.suggest(prefix, min(limit, settings.SUGGEST_MAX_RESULTS))
+
 @router.get("/venues/public", response_model=Paginated)
 def list_public_venues(
     db: Session = Depends(get_db),
@@ -257,34 +312,19 @@ def list_public_venues(
     page_size: int = Query(24, ge=1, le=200),
 ):
     stmt = select(Venue)
-    if q:
-        like = f"%{q}%"
-        stmt = stmt.where(
-            (Venue.name.ilike(like)) |
-            (Venue.address.ilike(like)) |
-            (Venue.city.ilike(like))
-        )
+    tokens = query_tokens(q)
+    if tokens:
+        stmt = stmt.where(venue_text_match(db, tokens))
     if city:
         stmt = stmt.where(Venue.city.ilike(f"%{city}%"))
 
     if sport:
-        stmt = (
-            select(Venue)
-            .join(Court, Court.venue_id == Venue.id)
-            .where(Court.sport == sport)
-            .distinct()
-        )
-        if q:
-            like = f"%{q}%"
-            stmt = stmt.where(
-                (Venue.name.ilike(like)) |
-                (Venue.address.ilike(like)) |
-                (Venue.city.ilike(like))
-            )
-        if city:
-            stmt = stmt.where(Venue.city.ilike(f"%{city}%"))
+        # semijoin en vez de join + DISTINCT: deja ordenar por relevancia
+        stmt = stmt.where(Venue.id.in_(select(Court.venue_id).where(Court.sport == sport)))
 
     total = db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+    if tokens:
+        stmt = stmt.order_by(venue_text_rank(db, tokens).desc(), Venue.name.asc(), Venue.id.asc())
     items = db.scalars(stmt.offset((page - 1) * page_size).limit(page_size)).all()
 
     return Paginated(
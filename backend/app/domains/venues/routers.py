@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from sqlalchemy.exc import IntegrityError
@@ -10,7 +10,11 @@ from app.shared.integrations.geocoding import geocode_nominatim
 from .courts_photos_private import router as court_photos_private_router  # 👈 nuevo
 from app.domains.venues.schemas import CourtCreate, CourtUpdate, CourtOut, VenueCreate, VenueUpdate, VenueOut, VenuePhotoCreate, VenuePhotoOut, VenuePhotoUpdate
 from app.domains.venues.models import Venue, VenuePhoto
+from app.domains.venues.search import sync_search_text
+from app.domains.venues.suggest import suggest_index
 from app.domains.users.models import User
+from app.domains.bookings.calendar_feed import feed_response, feed_token, key_from_token, rotate_feed_token
+from app.domains.bookings.schemas import CalendarFeedOut
 
 from . import private as _private   # tu archivo con CRUD owner (/venues, /{venue_id}, /{venue_id}/courts)
 from . import public as _public
@@ -39,9 +43,11 @@ async def create_venue(payload: VenueCreate, db: Session = Depends(get_db), user
         longitude=lng,
         owner_user_id=user.id,  # ajusta según tu auth
     )
+    sync_search_text(venue)
     db.add(venue)
     db.commit()
     db.refresh(venue)
+    suggest_index.upsert(venue.id, venue.name, venue.city)
     return venue
 
 @router.get("", response_model=List[VenueOut])
@@ -103,8 +109,10 @@ async def update_venue(venue_id: int, payload: VenueUpdate, db: Session = Depend
                 # pero avisar con 422 si prefieres exigir éxito.
                 pass
 
+    sync_search_text(venue)
     db.commit()
     db.refresh(venue)
+    suggest_index.upsert(venue.id, venue.name, venue.city)
     return venue
 
 @router.delete("/{venue_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -121,8 +129,51 @@ def delete_venue(
 
     db.delete(venue)
     db.commit()
+    suggest_index.remove(venue_id)
     return None
 
+def _owned_venue(db: Session, venue_id: int, owner: User) -> Venue:
+    venue = db.get(Venue, venue_id)
+    if not venue:
+        raise HTTPException(status_code=404, detail="Venue no encontrado")
+    if venue.owner_user_id != owner.id:
+        raise HTTPException(status_code=403, detail="No sos owner de este venue")
+    return venue
+
+def _venue_feed_link(request: Request, venue_id: int, token: str) -> CalendarFeedOut:
+    url = request.url_for("venue_calendar_feed", venue_id=venue_id).include_query_params(token=token)
+    return CalendarFeedOut(url=str(url), token=token)
+
+@router.get("/{venue_id}/calendar-feed", response_model=CalendarFeedOut)
+def venue_calendar_feed_link(
+    venue_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_owner: User = Depends(require_owner),
+):
+    venue = _owned_venue(db, venue_id, current_owner)
+    return _venue_feed_link(request, venue_id, feed_token(("venue", venue_id), venue.calendar_feed_version))
+
+@router.post("/{venue_id}/calendar-feed/rotate", response_model=CalendarFeedOut)
+def rotate_venue_calendar_feed_link(
+    venue_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_owner: User = Depends(require_owner),
+):
+    # el link anterior deja de funcionar (p. ej. si se compartió con alguien que ya no corresponde)
+    _owned_venue(db, venue_id, current_owner)
+    return _venue_feed_link(request, venue_id, rotate_feed_token(db, ("venue", venue_id)))
+
+@router.get("/{venue_id}/calendar.ics", name="venue_calendar_feed")
+def venue_calendar_feed(
+    venue_id: int,
+    token: str = Query(..., description="Token de GET /venues/{venue_id}/calendar-feed"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db),
+):
+    return feed_response(db, key_from_token(db, token, venue_id=venue_id), if_none_match)
+
 router.include_router(_private.router)         # /venues/* (owner)
 router.include_router(_public.router)          # /venues/public/* y /venues/courts/search etc.
 router.include_router(court_photos_private_router)     # /venues/{venue_id}/courts/{court_id}/photos (owner)
@@ -0,0 +1,92 @@
+# app/domains/venues/search.py
+"""
+Búsqueda de texto del catálogo (venues y canchas).
+
+- venues.search_text guarda nombre + dirección + ciudad normalizados en Python
+  (minúsculas, sin tildes, sólo alfanuméricos): "Club Ñandú, Av. Córdoba" ->
+  "club nandu av cordoba". Lo mantienen los routers de venues con
+  `sync_search_text` en alta/edición, igual que las portadas de covers.py.
+- En Postgres la columna tiene un índice GIN pg_trgm (ix_venues_search_trgm),
+  que resuelve tanto `LIKE '%token%'` como la similitud por palabra (`<%`, para
+  typos). En SQLite (tests/dev) el mismo LIKE funciona sin índice.
+- La consulta se normaliza igual y se parte en tokens: todos tienen que
+  aparecer (AND). El ranking es word_similarity en Postgres y un CASE simple
+  (empieza con la frase > contiene la frase > resto) en SQLite.
+"""
+from __future__ import annotations
+import re
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import and_, case, func, literal, or_, text
+from sqlalchemy.orm import Session
+
+from app.domains.venues.models import Court, Venue
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Minúsculas, sin tildes ni puntuación, espacios colapsados."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped).strip()
+
+
+def venue_search_text(name: Optional[str], address: Optional[str], city: Optional[str]) -> str:
+    return " ".join(p for p in (normalize_text(name), normalize_text(address), normalize_text(city)) if p)
+
+
+def sync_search_text(venue: Venue) -> None:
+    """Recalcula la columna antes del commit (create/update de venues)."""
+    venue.search_text = venue_search_text(venue.name, venue.address, venue.city)
+
+
+def query_tokens(q: Optional[str]) -> List[str]:
+    return normalize_text(q).split()
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def venue_text_match(db: Session, tokens: List[str]):
+    """
+    Condición sobre Venue.search_text: cada token como substring (los tokens ya
+    no tienen % ni _). En Postgres además acepta el token por similitud de
+    palabra, así "palermo" encuentra "palerno".
+    """
+    conds = []
+    for tok in tokens:
+        cond = Venue.search_text.like(f"%{tok}%")
+        if _is_postgres(db) and len(tok) >= 3:
+            cond = or_(cond, literal(tok).op("<%", is_comparison=True)(Venue.search_text))
+        conds.append(cond)
+    return and_(*conds)
+
+
+def court_number_match(tokens: List[str]):
+    """Número/etiqueta de cancha contiene la frase (tabla chica, sin índice de texto)."""
+    return func.lower(Court.number).like(f"%{' '.join(tokens)}%")
+
+
+def venue_text_rank(db: Session, tokens: List[str]):
+    """Mayor = más relevante; para ORDER BY ... DESC."""
+    phrase = " ".join(tokens)
+    if _is_postgres(db):
+        return func.word_similarity(phrase, Venue.search_text)
+    return case(
+        (Venue.search_text.like(f"{phrase}%"), 2),
+        (Venue.search_text.like(f"%{phrase}%"), 1),
+        else_=0,
+    )
+
+
+def ensure_search_extensions(engine) -> None:
+    """pg_trgm tiene que existir antes de create_all (índice gin_trgm_ops)."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
@@ -0,0 +1,112 @@
+# app/domains/venues/suggest.py
+"""
+Autocompletado en memoria para GET /venues/public/suggest (typeahead).
+
+- Arreglo ordenado de (clave, tipo, etiqueta, venue_id) + bisect: cada nombre y
+  ciudad se indexa por cada palabra desde donde puede empezar el prefijo
+  ("club nandu palermo" -> "club nandu palermo", "nandu palermo", "palermo").
+  Claves normalizadas con search.normalize_text (sin tildes ni mayúsculas).
+- Las lecturas no toman lock: los writers arman un arreglo nuevo y reemplazan
+  la referencia (copy-on-write); un alta/edición de venue es O(n) y rara.
+- Se carga al arrancar, se actualiza desde los routers de venues y un job la
+  reconstruye cada SUGGEST_REBUILD_INTERVAL_SECONDS (otros workers/procesos
+  también editan venues).
+"""
+from __future__ import annotations
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domains.venues.models import Venue
+from app.domains.venues.search import normalize_text
+
+# (clave normalizada, tipo "venue"/"city", etiqueta original, venue_id)
+Entry = Tuple[str, str, str, int]
+
+
+def _entries_for(venue_id: int, name: Optional[str], city: Optional[str]) -> List[Entry]:
+    out: List[Entry] = []
+    for kind, label in (("venue", name), ("city", city)):
+        words = normalize_text(label).split()
+        for i in range(len(words)):
+            out.append((" ".join(words[i:]), kind, label, venue_id))
+    return out
+
+
+class SuggestIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: List[Entry] = []
+        self._by_venue: Dict[int, List[Entry]] = {}
+
+    def rebuild(self, venues: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> None:
+        by_venue = {vid: _entries_for(vid, name, city) for vid, name, city in venues}
+        entries = sorted(e for es in by_venue.values() for e in es)
+        with self._lock:
+            self._entries, self._by_venue = entries, by_venue
+
+    def upsert(self, venue_id: int, name: Optional[str], city: Optional[str]) -> None:
+        new = _entries_for(venue_id, name, city)
+        with self._lock:
+            entries = list(self._entries)
+            _remove(entries, self._by_venue.get(venue_id, ()))
+            for e in new:
+                insort(entries, e)
+            by_venue = dict(self._by_venue)
+            by_venue[venue_id] = new
+            self._entries, self._by_venue = entries, by_venue
+
+    def remove(self, venue_id: int) -> None:
+        with self._lock:
+            old = self._by_venue.get(venue_id)
+            if not old:
+                return
+            entries = list(self._entries)
+            _remove(entries, old)
+            by_venue = dict(self._by_venue)
+            del by_venue[venue_id]
+            self._entries, self._by_venue = entries, by_venue
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[dict]:
+        """Sugerencias por prefijo; las ciudades salen una sola vez aunque tengan varios venues."""
+        key = normalize_text(prefix)
+        if not key:
+            return []
+        entries = self._entries  # referencia estable: los writers no la mutan
+        out: List[dict] = []
+        seen = set()
+        i = bisect_left(entries, (key,))
+        while i < len(entries) and len(out) < limit:
+            k, kind, label, venue_id = entries[i]
+            if not k.startswith(key):
+                break
+            i += 1
+            dedupe = (kind, venue_id if kind == "venue" else normalize_text(label))
+            if dedupe in seen:
+                continue
+            seen.add(dedupe)
+            out.append({"type": kind, "label": label, "venue_id": venue_id if kind == "venue" else None})
+        return out
+
+    def __len__(self) -> int:
+        return len(self._by_venue)
+
+
+def _remove(entries: List[Entry], old: Iterable[Entry]) -> None:
+    for e in old:
+        i = bisect_left(entries, e)
+        if i < len(entries) and entries[i] == e:
+            del entries[i]
+
+
+suggest_index = SuggestIndex()
+
+
+def load_suggest_index(db: Session) -> int:
+    """Reconstruye el índice desde la DB; devuelve cuántos venues cargó."""
+    rows = db.execute(select(Venue.id, Venue.name, Venue.city)).all()
+    suggest_index.rebuild((r[0], r[1], r[2]) for r in rows)
+    return len(rows)
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, func, update, delete
 from app.core.deps import get_db, get_current_user, require_owner
 from app.domains.venues.models import Venue, VenuePhoto, Court, CourtPhoto
+from app.domains.venues.covers import sync_court_cover, sync_venue_cover
 from .schemas import VenuePhotoBase, VenuePhotoOut, CourtPhotoBase, CourtPhotoOut
 
 router = APIRouter(tags=["photos"])
@@ -65,6 +66,7 @@ def create_venue_photo(venue_id: int, body: VenuePhotoBase, db: Session = Depend
     if p.is_cover:
         _ensure_unique_cover_for_venue(db, venue_id, p.id)
     _normalize_sort_orders_for_venue(db, venue_id)
+    sync_venue_cover(db, venue_id)
     db.commit(); db.refresh(p)
     return p
 
@@ -79,6 +81,7 @@ def update_venue_photo(venue_id: int, photo_id: int, body: VenuePhotoBase, db: S
     if p.is_cover:
         _ensure_unique_cover_for_venue(db, venue_id, p.id)
     _normalize_sort_orders_for_venue(db, venue_id)
+    sync_venue_cover(db, venue_id)
     db.commit(); db.refresh(p)
     return p
 
@@ -89,6 +92,7 @@ def delete_venue_photo(venue_id: int, photo_id: int, db: Session = Depends(get_d
     if not p or p.venue_id != venue_id: raise HTTPException(404, "Foto no encontrada")
     db.delete(p); db.flush()
     _normalize_sort_orders_for_venue(db, venue_id)
+    sync_venue_cover(db, venue_id)
     db.commit()
 
 # -------- COURT PHOTOS --------
@@ -105,6 +109,7 @@ def create_court_photo(venue_id: int, court_id: int, body: CourtPhotoBase, db: S
     if p.is_cover:
         _ensure_unique_cover_for_court(db, court_id, p.id)
     _normalize_sort_orders_for_court(db, court_id)
+    sync_court_cover(db, court_id)
     db.commit(); db.refresh(p)
     return p
 
@@ -119,6 +124,7 @@ def update_court_photo(venue_id: int, court_id: int, photo_id: int, body: CourtP
     if p.is_cover:
         _ensure_unique_cover_for_court(db, court_id, p.id)
     _normalize_sort_orders_for_court(db, court_id)
+    sync_court_cover(db, court_id)
     db.commit(); db.refresh(p)
     return p
 
@@ -129,4 +135,5 @@ def delete_court_photo(venue_id: int, court_id: int, photo_id: int, db: Session
     if not p or p.court_id != court_id: raise HTTPException(404, "Foto no encontrada")
     db.delete(p); db.flush()
     _normalize_sort_orders_for_court(db, court_id)
+    sync_court_cover(db, court_id)
     db.commit()
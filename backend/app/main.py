@@ -5,14 +5,23 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from app.core.db import Base, engine, SessionLocal
+from app.core.scheduler import scheduler
+from app.utils.mail_transport import close_all_transports
 from app.domains.auth import routers as auth
 from app.domains.users import routers as users
 from app.domains.venues import routers as venues
 from app.domains.scheduling import routers as availability
 from app.domains.schedules import routers as schedules
 from app.domains.bookings import routers as bookings
+from app.domains.bookings.jobs import register_jobs as register_booking_jobs
+from app.domains.notifications.jobs import register_jobs as register_notification_jobs
+from app.domains.notifications.dispatch import shutdown_dispatcher
+from app.domains.notifications import routers as notifications
 from app.domains.pricing import routers as prices
 from app.domains.venues.public import router as venues_public
+from app.domains.venues.search import ensure_search_extensions
+from app.domains.venues.suggest import load_suggest_index
+from app.domains.venues.jobs import register_jobs as register_venue_jobs
 from app.domains.admin_stats.admin_roles import router as admin_roles
 from app.domains.admin_stats.routers import router as admin_stats
 
@@ -31,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # paginación keyset de listados de reservas
 )
 
 # --- Routers ---
@@ -44,15 +54,43 @@ app.include_router(prices.router, prefix="/api/v1", tags=["prices"])
 app.include_router(venues_public, prefix="/api/v1", tags=["venues-public"])
 app.include_router(admin_stats, prefix="/api/v1")
 app.include_router(admin_roles, prefix="/api/v1")
+app.include_router(notifications.router, prefix="/api/v1")
 
 
 # --- Startup: init DB ---
 @app.on_event("startup")
 def init_db():
     print(f"[INIT_DB] Creando tablas en: {engine.url}")
+    ensure_search_extensions(engine)
     Base.metadata.create_all(bind=engine)
 
 
+@app.on_event("startup")
+def warm_suggest_index():
+    db = SessionLocal()
+    try:
+        n = load_suggest_index(db)
+        print(f"[SUGGEST] Índice de autocompletado con {n} venues")
+    finally:
+        db.close()
+
+
+# --- Jobs periódicos en proceso ---
+@app.on_event("startup")
+def start_scheduler():
+    register_booking_jobs(scheduler)
+    register_notification_jobs(scheduler)
+    register_venue_jobs(scheduler)
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.stop()
+    shutdown_dispatcher()
+    close_all_transports()
+
+
 @app.get("/")
 def root():
     return {"ok": True, "service": "reservas-api"}
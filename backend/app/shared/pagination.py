@@ -0,0 +1,86 @@
+# app/shared/pagination.py
+"""
+Paginación keyset sobre (start_datetime, id).
+
+El cursor es opaco para el cliente: base64 url-safe de "<iso start>|<id>" del
+último elemento devuelto. La página siguiente es `(start, id) > cursor`, así que
+con un índice que termine en (start_datetime, id) cada página es un range scan,
+sin OFFSET.
+
+Cuando el filtro es un IN sobre el prefijo del índice (p. ej. las canchas de un
+owner), un solo ORDER BY no puede recorrer el índice en orden: `keyset_merge_page`
+pide una página por valor del prefijo y las mezcla.
+"""
+from __future__ import annotations
+import base64
+import heapq
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(start: datetime, id_: int) -> str:
+    raw = f"{start.isoformat()}|{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start, id_ = raw.rsplit("|", 1)
+        return datetime.fromisoformat(start), int(id_)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="cursor inválido")
+
+
+def keyset_page(db: Session, q: Select, start_col, id_col,
+                limit: int, cursor: Optional[str]) -> Tuple[List[T], Optional[str]]:
+    """
+    Aplica cursor + orden (start, id) + LIMIT a `q` (que selecciona una entidad).
+    Pide limit+1 filas para saber si hay página siguiente sin un COUNT.
+    """
+    if cursor:
+        q = q.where(tuple_(start_col, id_col) > tuple_(*decode_cursor(cursor)))
+    q = q.order_by(start_col.asc(), id_col.asc()).limit(limit + 1)
+    rows = list(db.execute(q).scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, start_col.key), getattr(last, id_col.key))
+
+
+def keyset_merge_page(db: Session, queries: Iterable[Select], start_col, id_col,
+                      limit: int, cursor: Optional[str]) -> Tuple[List[T], Optional[str]]:
+    """
+    Igual que keyset_page sobre la unión de `queries` (conjuntos disjuntos).
+    Cada query trae a lo sumo limit+1 filas por su propio range scan y el merge
+    por (start, id) se hace en memoria.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    key = lambda row: (getattr(row, start_col.key), getattr(row, id_col.key))
+    runs = []
+    for q in queries:
+        if after:
+            q = q.where(tuple_(start_col, id_col) > tuple_(*after))
+        q = q.order_by(start_col.asc(), id_col.asc()).limit(limit + 1)
+        runs.append(list(db.execute(q).scalars().all()))
+    rows = list(heapq.merge(*runs, key=key))[: limit + 1]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
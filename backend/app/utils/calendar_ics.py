@@ -14,50 +14,105 @@ def ics_datetime(dt: datetime) -> str:
     dt = to_utc(dt)
     return dt.strftime("%Y%m%dT%H%M%SZ")
 
-def build_booking_ics(
+def build_vevent(
     uid: str,
     summary: str,
     description: str,
     location: str,
     start_dt: datetime,
     end_dt: datetime,
-    organizer_email: str | None,
-    attendee_emails: list[str],
-    method: str = "REQUEST",        # 👈 nuevo
-    sequence: int = 0,              # 👈 nuevo
-    status_line: str | None = None, # p.ej. "STATUS:CANCELLED"
+    organizer_email: str | None = None,
+    attendee_emails: list[str] | None = None,
+    sequence: int = 0,
+    status_line: str | None = None,
+    rrule: str | None = None,
+    dtstamp: datetime | None = None,
+    alarm: bool = True,
 ) -> str:
-    dtstamp = ics_datetime(datetime.now(timezone.utc))
+    """Un VEVENT suelto (sin VCALENDAR): lo usan el .ics de los mails y los feeds."""
+    dtstamp = ics_datetime(dtstamp or datetime.now(timezone.utc))
     dtstart = ics_datetime(start_dt)
     dtend   = ics_datetime(end_dt)
     organizer = f"ORGANIZER:mailto:{organizer_email}\r\n" if organizer_email else ""
-    attendees = "".join([f"ATTENDEE;ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION:mailto:{e}\r\n" for e in attendee_emails if e])
+    attendees = "".join([f"ATTENDEE;ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION:mailto:{e}\r\n" for e in (attendee_emails or []) if e])
+    status = f"{status_line}\r\n" if status_line else ""
+    recurrence = f"RRULE:{rrule}\r\n" if rrule else ""
+    valarm = (
+        "BEGIN:VALARM\r\n"
+        "TRIGGER:-PT30M\r\n"
+        "ACTION:DISPLAY\r\n"
+        "DESCRIPTION:Recordatorio de reserva\r\n"
+        "END:VALARM\r\n"
+    ) if alarm else ""
 
     return (
-        "BEGIN:VCALENDAR\r\n"
-        "PRODID:-//ProyectoReserva//ES\r\n"
-        "VERSION:2.0\r\n"
-        f"METHOD:{method}\r\n"
-        "CALSCALE:GREGORIAN\r\n"
         "BEGIN:VEVENT\r\n"
         f"UID:{uid}\r\n"
         f"SEQUENCE:{sequence}\r\n"
         f"DTSTAMP:{dtstamp}\r\n"
         f"DTSTART:{dtstart}\r\n"
         f"DTEND:{dtend}\r\n"
+        f"{recurrence}"
         f"SUMMARY:{summary}\r\n"
         f"DESCRIPTION:{description}\r\n"
         f"LOCATION:{location}\r\n"
         f"{organizer}"
         f"{attendees}"
-        f"{(status_line + '\\r\\n') if status_line else ''}"
-        "BEGIN:VALARM\r\n"
-        "TRIGGER:-PT30M\r\n"
-        "ACTION:DISPLAY\r\n"
-        "DESCRIPTION:Recordatorio de reserva\r\n"
-        "END:VALARM\r\n"
+        f"{status}"
+        f"{valarm}"
         "END:VEVENT\r\n"
-        "END:VCALENDAR\r\n"
+    )
+
+def ics_calendar_header(method: str | None = "REQUEST", name: str | None = None,
+                        refresh_minutes: int | None = None) -> str:
+    # `name`/`refresh_minutes` sólo tienen sentido en feeds suscribibles
+    extra = ""
+    if name:
+        extra += f"X-WR-CALNAME:{name}\r\n"
+    if refresh_minutes:
+        extra += f"REFRESH-INTERVAL;VALUE=DURATION:PT{refresh_minutes}M\r\n"
+        extra += f"X-PUBLISHED-TTL:PT{refresh_minutes}M\r\n"
+    return (
+        "BEGIN:VCALENDAR\r\n"
+        "PRODID:-//ProyectoReserva//ES\r\n"
+        "VERSION:2.0\r\n"
+        + (f"METHOD:{method}\r\n" if method else "")
+        + "CALSCALE:GREGORIAN\r\n"
+        + extra
+    )
+
+ICS_CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+def build_booking_ics(
+    uid: str,
+    summary: str,
+    description: str,
+    location: str,
+    start_dt: datetime,
+    end_dt: datetime,
+    organizer_email: str | None,
+    attendee_emails: list[str],
+    method: str = "REQUEST",        # 👈 nuevo
+    sequence: int = 0,              # 👈 nuevo
+    status_line: str | None = None, # p.ej. "STATUS:CANCELLED"
+    rrule: str | None = None,       # p.ej. "FREQ=WEEKLY;COUNT=12" (series)
+) -> str:
+    return (
+        ics_calendar_header(method)
+        + build_vevent(
+            uid=uid,
+            summary=summary,
+            description=description,
+            location=location,
+            start_dt=start_dt,
+            end_dt=end_dt,
+            organizer_email=organizer_email,
+            attendee_emails=attendee_emails,
+            sequence=sequence,
+            status_line=status_line,
+            rrule=rrule,
+        )
+        + ICS_CALENDAR_FOOTER
     )
 
 
@@ -72,3 +127,16 @@ def build_google_calendar_link(summary: str, description: str, location: str, st
         f"&location={quote(location)}"
         f"&dates={st}/{en}"
     )
+
+
+def add_calendar_button(html_body: str, gcal_link: str) -> str:
+    # Botón "Agregar a Google Calendar" antes del primer cierre de </div>
+    return html_body.replace(
+        "</div>",
+        f"""<p style="margin-top:16px">
+              <a href="{gcal_link}"
+                 style="display:inline-block;padding:10px 14px;border-radius:6px;background:#1a73e8;color:#fff;text-decoration:none">
+                 Agregar a Google Calendar
+              </a>
+            </p></div>""",
+    )
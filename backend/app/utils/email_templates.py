@@ -17,6 +17,22 @@ def booking_html_player_pending(player_name: str | None, venue_name: str, court_
     </div>
     """
 
+def booking_html_player_series_pending(player_name: str | None, venue_name: str, court_name: str,
+                                       start: datetime, end: datetime, price: float, weeks: int) -> str:
+    return f"""
+    <div style="font-family:Arial,Helvetica,sans-serif;line-height:1.5">
+      <h2>Serie de reservas pendiente de confirmación</h2>
+      <p>Hola {player_name or "jugador/a"}, tu serie semanal fue creada y el dueño debe confirmarla.</p>
+      <ul>
+        <li><b>Sede:</b> {venue_name}</li>
+        <li><b>Cancha:</b> {court_name}</li>
+        <li><b>Primera fecha:</b> {start.strftime("%d/%m/%Y %H:%M")} – {end.strftime("%H:%M")}</li>
+        <li><b>Repeticiones:</b> {weeks} semanas</li>
+        <li><b>Precio por turno:</b> $ {price:,.0f} ARS</li>
+      </ul>
+    </div>
+    """
+
 def booking_html_player_confirmed(player_name: str | None, venue_name: str, court_name: str,
                                   start: datetime, end: datetime, price: float) -> str:
     return f"""
@@ -70,6 +86,44 @@ def booking_html_for_owner(owner_name: str, player_email: str, venue_name: str,
     </div>
     """
 
+def owner_digest_html(owner_name: str | None, venues: list[tuple[str, list[dict]]]) -> str:
+    """
+    Resumen de varias reservas por sede. `venues`: [(venue_name, items)], cada item
+    con kind (created/cancelled/expired), court_name, player_email, start, end, price, detail.
+    """
+    labels = {"created": "🆕 Nueva", "cancelled": "❌ Cancelada", "expired": "⌛ Vencida sin confirmar"}
+    sections = ""
+    for venue_name, items in venues:
+        rows = "".join(
+            f"""
+          <tr>
+            <td style="padding:4px 8px">{labels.get(it["kind"], it["kind"])}</td>
+            <td style="padding:4px 8px">{it["court_name"]}</td>
+            <td style="padding:4px 8px">{it["start"].strftime("%d/%m/%Y %H:%M")} - {it["end"].strftime("%H:%M")}</td>
+            <td style="padding:4px 8px">{it["player_email"] or "-"}</td>
+            <td style="padding:4px 8px">$ {it["price"]:,.0f}{(" · " + it["detail"]) if it.get("detail") else ""}</td>
+          </tr>"""
+            for it in items
+        )
+        sections += f"""
+      <h3 style="margin-top:20px">{venue_name}</h3>
+      <table style="border-collapse:collapse;font-size:14px">
+        <tr style="background:#f1f5f9">
+          <th style="padding:4px 8px;text-align:left">Evento</th>
+          <th style="padding:4px 8px;text-align:left">Cancha</th>
+          <th style="padding:4px 8px;text-align:left">Turno</th>
+          <th style="padding:4px 8px;text-align:left">Cliente</th>
+          <th style="padding:4px 8px;text-align:left">Precio (ARS)</th>
+        </tr>{rows}
+      </table>"""
+    return f"""
+    <div style="font-family:Arial,Helvetica,sans-serif;line-height:1.5">
+      <h2>Resumen de reservas</h2>
+      <p>Hola {owner_name or "owner"}, estos son los movimientos desde el último resumen.</p>{sections}
+      <p style="color:#64748b;font-size:12px;margin-top:12px">Podés volver a recibir un mail por reserva desactivando el resumen en tu perfil.</p>
+    </div>
+    """
+
 def role_request_html(admin_name: str,
                       requester_name: str,
                       requester_email: str,
@@ -0,0 +1,233 @@
+# app/utils/mail_transport.py
+"""
+Transporte SMTP compartido: un pool chico de conexiones ya autenticadas
+(EHLO + STARTTLS + LOGIN una vez) que se reusan entre mails y destinatarios.
+
+Uso:
+    transport = get_transport()
+    with transport.session() as smtp:
+        for msg in msgs:
+            smtp.send(msg)     # reconecta una vez si el server cortó
+
+Config por env (igual que los senders): SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS,
+SMTP_POOL_SIZE (default 4, alineado con NOTIFY_MAX_WORKERS), SMTP_TIMEOUT (default 20), SMTP_IDLE_SECONDS (default 60: más viejo que eso se
+valida con NOOP antes de usar).
+SMTP_FORCE_TLS / SMTP_FORCE_AUTH: sin setear, cada sender conserva sus defaults
+de siempre (`sender_transport(profile)`, ver SENDER_PROFILES).
+"""
+from __future__ import annotations
+import os
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Dict, Iterator, Optional, Tuple
+
+# NOOP fallido = conexión muerta (SMTPException hereda de OSError)
+_CONNECTION_ERRORS = (OSError,)
+
+
+@dataclass(frozen=True)
+class SMTPConfig:
+    host: str
+    port: int
+    user: Optional[str]
+    password: Optional[str]
+    # "off": nunca; "auto": si el server anuncia STARTTLS; "force": siempre
+    starttls: str = "auto"
+    require_auth: bool = False
+    timeout: float = 20.0
+
+
+class _Conn:
+    __slots__ = ("smtp", "last_used")
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+
+
+class MailTransport:
+    def __init__(self, config: SMTPConfig, pool_size: int = 2, idle_seconds: float = 60.0):
+        self.config = config
+        self.idle_seconds = idle_seconds
+        self._idle: "queue.LifoQueue[_Conn]" = queue.LifoQueue()
+        # limita conexiones abiertas en total (en uso + ociosas)
+        self._slots = threading.BoundedSemaphore(max(1, pool_size))
+
+    # ---- conexión ----
+    def _connect(self) -> _Conn:
+        c = self.config
+        smtp = smtplib.SMTP(c.host, c.port, timeout=c.timeout)
+        try:
+            smtp.ehlo()
+            if c.starttls == "force" or (c.starttls == "auto" and smtp.has_extn("starttls")):
+                smtp.starttls()
+                smtp.ehlo()
+            if c.user and c.password:
+                smtp.login(c.user, c.password)
+            elif c.require_auth:
+                raise RuntimeError("Faltan credenciales SMTP_USER / SMTP_PASS")
+        except Exception:
+            _quit(smtp)
+            raise
+        return _Conn(smtp)
+
+    def _acquire(self) -> _Conn:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - conn.last_used < self.idle_seconds:
+                return conn
+            try:
+                if conn.smtp.noop()[0] == 250:
+                    return conn
+            except _CONNECTION_ERRORS:
+                pass
+            _quit(conn.smtp)
+
+    def _release(self, conn: Optional[_Conn]) -> None:
+        if conn is None:
+            return
+        conn.last_used = time.monotonic()
+        self._idle.put(conn)
+
+    # ---- API ----
+    @contextmanager
+    def session(self) -> Iterator["_Session"]:
+        """Toma UNA conexión del pool para varios envíos seguidos."""
+        self._slots.acquire()
+        sess = _Session(self)
+        try:
+            yield sess
+        finally:
+            self._release(sess.conn)
+            self._slots.release()
+
+    def send(self, msg: EmailMessage) -> None:
+        with self.session() as smtp:
+            smtp.send(msg)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit(conn.smtp)
+
+
+class _Session:
+    def __init__(self, transport: MailTransport):
+        self._transport = transport
+        self.conn: Optional[_Conn] = None
+
+    def send(self, msg: EmailMessage) -> None:
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = self._transport._acquire()
+            try:
+                self.conn.smtp.send_message(msg)
+                self.conn.last_used = time.monotonic()
+                return
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+                # rechazo del server (smtplib ya hizo RSET): la conexión sigue sana
+                raise
+            except smtplib.SMTPServerDisconnected:
+                self._drop()
+                if attempt == 2:
+                    raise
+            except smtplib.SMTPException:
+                self._drop()
+                raise
+            except OSError:
+                # socket roto / timeout: conexión nueva y un reintento
+                self._drop()
+                if attempt == 2:
+                    raise
+
+    def _drop(self) -> None:
+        if self.conn is not None:
+            _quit(self.conn.smtp)
+            self.conn = None
+
+
+def _quit(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except Exception:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+
+_transports: Dict[Tuple, MailTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(starttls: str = "auto", require_auth: bool = False,
+                  timeout: Optional[float] = None) -> MailTransport:
+    """
+    Transporte compartido para la config SMTP actual del entorno. Cada combinación
+    (host, user, modo TLS...) tiene su propio pool.
+    """
+    config = SMTPConfig(
+        host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+        port=int(os.getenv("SMTP_PORT", "587")),
+        user=os.getenv("SMTP_USER"),
+        password=os.getenv("SMTP_PASS"),
+        starttls=starttls,
+        require_auth=require_auth,
+        timeout=timeout or float(os.getenv("SMTP_TIMEOUT", "20")),
+    )
+    key = (config.host, config.port, config.user, config.password, starttls, require_auth, config.timeout)
+    with _transports_lock:
+        t = _transports.get(key)
+        if t is None:
+            t = MailTransport(
+                config,
+                pool_size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+                idle_seconds=float(os.getenv("SMTP_IDLE_SECONDS", "60")),
+            )
+            _transports[key] = t
+        return t
+
+
+# Defaults de cada sender cuando SMTP_FORCE_TLS / SMTP_FORCE_AUTH no están en el
+# entorno: (TLS por defecto, modo STARTTLS si está activo, auth obligatoria por defecto)
+SENDER_PROFILES: Dict[str, Tuple[bool, str, bool]] = {
+    "calendar": (True, "auto", True),    # mail de reserva creada (con .ics)
+    "html": (False, "auto", False),      # cambios de estado; Mailpit sin TLS
+    "basic": (False, "force", False),    # send_basic_html_email: fuerza STARTTLS si se pide
+}
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes", "y")
+
+
+def sender_transport(profile: str, timeout: Optional[float] = None) -> MailTransport:
+    """Transporte con los defaults TLS/auth del sender `profile` (ver SENDER_PROFILES)."""
+    tls_default, tls_mode, auth_default = SENDER_PROFILES[profile]
+    return get_transport(
+        starttls=tls_mode if _env_flag("SMTP_FORCE_TLS", tls_default) else "off",
+        require_auth=_env_flag("SMTP_FORCE_AUTH", auth_default),
+        timeout=timeout,
+    )
+
+
+def close_all_transports() -> None:
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for t in transports:
+        t.close()
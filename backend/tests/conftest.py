@@ -0,0 +1,58 @@
+# tests/conftest.py
+"""
+Harness de tests: SQLite en un archivo temporal, tablas con create_all (igual
+que init_db) y TestClient SIN los eventos de startup (no arranca el scheduler
+ni los jobs). Los envíos SMTP se reemplazan con `sent_mail`.
+"""
+import os
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="reservas-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-0123456789abcdef0123456789")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.db import Base, SessionLocal, engine
+from app.domains.bookings.calendar_feed import etag_cache
+from app.domains.pricing.service import price_table_cache
+from app.domains.scheduling.service import availability_cache
+from app.domains.venues.suggest import suggest_index
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def _fresh_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # caches en memoria por id: los ids se repiten entre tests
+    for cache in (etag_cache, price_table_cache, availability_cache):
+        cache.clear()
+    suggest_index.rebuild([])
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def sent_mail(monkeypatch):
+    """Reemplaza los envíos del outbox; devuelve la lista de (destinatario, asunto)."""
+    from app.domains.notifications import digest, rendering
+
+    sent = []
+    monkeypatch.setattr(rendering, "send_mail", lambda event, mail: sent.append((mail.to, mail.subject)))
+    monkeypatch.setattr(digest, "send_basic_html_email", lambda to, subject, html: sent.append((to, subject)))
+    return sent
@@ -0,0 +1,66 @@
+# tests/factories.py
+"""Datos mínimos para los tests (ver conftest.py para la DB y el client)."""
+from datetime import datetime, time, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.domains.pricing.models import Price
+from app.domains.schedules.models import CourtSchedule
+from app.domains.users.models import User
+from app.domains.venues.models import Court, Venue
+from app.shared.enums import RoleEnum, SportEnum, SurfaceEnum
+
+API = "/api/v1"
+
+
+def auth(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+def make_user(db, email: str, role: RoleEnum = RoleEnum.PLAYER, **extra) -> User:
+    user = User(name=email.split("@")[0], email=email, password_hash="x", role=role, **extra)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def make_court(db, owner: User, number: str = "1", venue_name: str = "Club Test") -> Court:
+    """Venue + cancha abierta todos los días 08-23 (turnos de 60') con precio fijo."""
+    venue = Venue(name=venue_name, address="Av. Siempre Viva 742", city="Córdoba", owner_user_id=owner.id)
+    court = Court(venue=venue, sport=SportEnum.PADEL, surface=SurfaceEnum.SYNTHETIC_TURF, number=number)
+    db.add_all([venue, court])
+    db.flush()
+    for wd in range(7):
+        db.add(CourtSchedule(court_id=court.id, weekday=wd, open_time=time(8), close_time=time(23), slot_minutes=60))
+        db.add(Price(court_id=court.id, weekday=wd, start_time=time(8), end_time=time(23), price_per_slot=1000))
+    db.commit()
+    db.refresh(court)
+    return court
+
+
+def create_venue(client: TestClient, owner: User, name: str, city: str = "Córdoba",
+                 address: str = "Av. Siempre Viva 742") -> dict:
+    """Alta por la API (mantiene search_text y el índice de sugerencias); coords fijas, sin geocoding."""
+    resp = client.post(f"{API}/venues", headers=auth(owner), json={
+        "name": name, "address": address, "city": city, "latitude": -31.4167, "longitude": -64.1833,
+    })
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def slot(days_ahead: int = 2, hour: int = 10) -> tuple[datetime, datetime]:
+    start = datetime.combine(datetime.utcnow().date() + timedelta(days=days_ahead), time(hour))
+    return start, start + timedelta(hours=1)
+
+
+def book(client: TestClient, player: User, court: Court, days_ahead: int = 2, hour: int = 10) -> dict:
+    start, end = slot(days_ahead, hour)
+    resp = client.post(f"{API}/bookings", headers=auth(player), json={
+        "court_id": court.id,
+        "start_datetime": start.isoformat(),
+        "end_datetime": end.isoformat(),
+    })
+    assert resp.status_code == 201, resp.text
+    return resp.json()
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.domains.bookings.service import _slot_conflicts_as_409
+
+
+class _PgError(Exception):
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def _raise_inside(db, exc):
+    with _slot_conflicts_as_409(db):
+        raise exc
+
+
+def test_lock_timeout_becomes_409_with_retry_after(db):
+    with pytest.raises(HTTPException) as info:
+        _raise_inside(db, OperationalError("SELECT ... FOR UPDATE", {}, _PgError("55P03")))
+    assert info.value.status_code == 409
+    assert info.value.headers == {"Retry-After": "1"}
+
+
+def test_exclusion_violation_becomes_409(db):
+    with pytest.raises(HTTPException) as info:
+        _raise_inside(db, IntegrityError("INSERT INTO bookings ...", {}, _PgError("23P01")))
+    assert info.value.status_code == 409
+    assert info.value.headers is None
+
+
+@pytest.mark.parametrize("exc", [
+    OperationalError("SELECT 1", {}, _PgError("57014")),   # statement_timeout: no es contención del día
+    IntegrityError("INSERT ...", {}, _PgError("23505")),   # unique_violation
+    IntegrityError("INSERT ...", {}, Exception("sqlite")),
+])
+def test_other_db_errors_propagate(db, exc):
+    with pytest.raises(type(exc)):
+        _raise_inside(db, exc)
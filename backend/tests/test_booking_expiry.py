@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from app.domains.bookings.models import Booking
+from app.domains.bookings.service import expire_pending_bookings_svc, mark_no_shows_svc
+from app.shared.enums import BookingStatusEnum, RoleEnum
+from tests.factories import API, auth, book, make_court, make_user, slot
+
+
+def _feed(client, player):
+    url = client.get(f"{API}/users/me/calendar-feed", headers=auth(player)).json()["url"]
+    resp = client.get(url)
+    assert resp.status_code == 200, resp.text
+    return url, resp.headers["ETag"]
+
+
+def test_expiry_is_set_based_and_frees_the_slot(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    other = make_user(db, "other@test.com")
+    court = make_court(db, owner)
+    due = [book(client, player, court, days_ahead=2, hour=h) for h in (10, 11, 12)]
+    kept = book(client, player, court, days_ahead=2, hour=13)
+    url, etag = _feed(client, player)
+
+    past = datetime.utcnow() - timedelta(minutes=1)
+    for b in due:
+        db.get(Booking, b["id"]).expires_at = past
+    db.commit()
+
+    # lotes de 2: dos vueltas del UPDATE ... RETURNING
+    assert expire_pending_bookings_svc(db, batch_size=2) == 3
+    db.expire_all()
+    assert {db.get(Booking, b["id"]).status for b in due} == {BookingStatusEnum.CANCELLED}
+    assert db.get(Booking, kept["id"]).status == BookingStatusEnum.PENDING
+
+    # el bitmap quedó libre y el feed cambió
+    book(client, other, court, days_ahead=2, hour=10)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+    assert expire_pending_bookings_svc(db, batch_size=2) == 0
+
+
+def test_no_shows_invalidate_calendar_feeds(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    start, end = slot(days_ahead=-1, hour=10)
+    bk = Booking(user_id=player.id, court_id=court.id, start_datetime=start, end_datetime=end,
+                 status=BookingStatusEnum.CONFIRMED, price_total=1000)
+    db.add(bk)
+    db.commit()
+    url, etag = _feed(client, player)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    assert mark_no_shows_svc(db, after_minutes=30) == 1
+    db.expire_all()
+    assert db.get(Booking, bk.id).status == BookingStatusEnum.NO_SHOW
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert "BEGIN:VEVENT" not in resp.text
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.domains.bookings.models import Booking, BookingIdempotencyKey
+from app.domains.bookings.service import purge_expired_idempotency_keys
+from app.domains.notifications.models import NotificationOutbox
+from app.shared.enums import RoleEnum
+from tests.factories import API, auth, make_court, make_user, slot
+
+
+def _post(client, player, court, key, hour=10):
+    start, end = slot(2, hour)
+    return client.post(f"{API}/bookings", headers={**auth(player), "Idempotency-Key": key}, json={
+        "court_id": court.id, "start_datetime": start.isoformat(), "end_datetime": end.isoformat(),
+    })
+
+
+def test_replayed_key_returns_the_same_booking(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+
+    first = _post(client, player, court, "k-1")
+    assert first.status_code == 201, first.text
+    assert "Idempotent-Replayed" not in first.headers
+
+    again = _post(client, player, court, "k-1")
+    assert again.status_code == 201
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json()["id"] == first.json()["id"]
+    # ni otra reserva ni otro mail
+    assert db.scalar(select(func.count(Booking.id))) == 1
+    assert db.scalar(select(func.count(NotificationOutbox.id))) == 1
+
+
+def test_key_is_scoped_and_bound_to_the_request(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    other = make_user(db, "other@test.com")
+    court = make_court(db, owner)
+    assert _post(client, player, court, "k-1", hour=10).status_code == 201
+
+    # misma key con otros datos: el fingerprint no coincide
+    assert _post(client, player, court, "k-1", hour=11).status_code == 422
+    # la key es por usuario: otro jugador no reproduce la reserva ajena
+    assert _post(client, other, court, "k-1", hour=12).status_code == 201
+    assert db.scalar(select(func.count(Booking.id))) == 2
+
+
+def test_expired_key_is_released(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    assert _post(client, player, court, "k-1", hour=10).status_code == 201
+
+    db.execute(BookingIdempotencyKey.__table__.update().values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    resp = _post(client, player, court, "k-1", hour=11)
+    assert resp.status_code == 201
+    assert "Idempotent-Replayed" not in resp.headers
+
+    later = datetime.utcnow() + timedelta(days=30)
+    assert purge_expired_idempotency_keys(db, now=later) == 1
@@ -0,0 +1,55 @@
+from app.shared.enums import RoleEnum
+from tests.factories import API, auth, book, make_court, make_user
+
+
+def _all_pages(client, user, url, params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        resp = client.get(url, headers=auth(user), params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200, resp.text
+        ids += [b["id"] for b in resp.json()]
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids, pages
+
+
+def _ordered_ids(rows):
+    return [b["id"] for b in sorted(rows, key=lambda b: (b["start_datetime"], b["id"]))]
+
+
+def test_my_bookings_pages_have_no_gaps_or_duplicates(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court_a = make_court(db, owner, number="1")
+    court_b = make_court(db, owner, number="2", venue_name="Club B")
+    # mismo horario en dos canchas: el desempate por id cae en el borde de página
+    made = [book(client, player, court, days_ahead=d, hour=h)
+            for d in (2, 3) for h in (10, 12) for court in (court_a, court_b)]
+
+    ids, pages = _all_pages(client, player, f"{API}/bookings", {"mine": 1, "limit": 3})
+    assert ids == _ordered_ids(made)
+    assert pages == 3
+
+
+def test_owner_pages_merge_courts_in_order(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    other = make_user(db, "other@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court_a = make_court(db, owner, number="1")
+    court_b = make_court(db, owner, number="2", venue_name="Club B")
+    foreign = make_court(db, other, number="9", venue_name="Club Ajeno")
+    made = [book(client, player, court, days_ahead=d, hour=h)
+            for d in (2, 3) for h in (9, 10, 11) for court in (court_a, court_b)]
+    book(client, player, foreign, days_ahead=2, hour=10)
+
+    ids, pages = _all_pages(client, owner, f"{API}/bookings/admin/bookings", {"limit": 5})
+    assert ids == _ordered_ids(made)
+    assert pages == 3
+
+    # el cursor se combina con el rango de fechas
+    first_day = [b for b in made if b["start_datetime"] < made[-1]["start_datetime"][:10]]
+    ids, _ = _all_pages(client, owner, f"{API}/bookings/admin/bookings", {
+        "limit": 4, "to": made[-1]["start_datetime"][:10] + "T00:00:00",
+    })
+    assert ids == _ordered_ids(first_day)
@@ -0,0 +1,28 @@
+from sqlalchemy import event
+
+from app.core.db import engine
+from app.domains.bookings.repo import load_booking_parties
+from app.shared.enums import RoleEnum
+from tests.factories import book, make_court, make_user
+
+
+def test_parties_load_in_a_single_select(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner, number="4", venue_name="Club Sur")
+    created = book(client, player, court)
+
+    statements = []
+    listener = lambda conn, cursor, stmt, *args: statements.append(stmt)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        parties = load_booking_parties(db, created["id"])
+        # atributos ya cargados: no disparan lazy loads
+        seen = (parties.booking.id, parties.court.number, parties.venue.name,
+                parties.player.email, parties.owner.email)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert seen == (created["id"], "4", "Club Sur", "player@test.com", "owner@test.com")
+    assert len(statements) == 1
+    assert load_booking_parties(db, created["id"] + 100) is None
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.domains.bookings.models import Booking
+from app.domains.notifications.models import NotificationOutbox
+from app.domains.scheduling.models import CourtOccupancy
+from app.shared.enums import RoleEnum
+from tests.factories import API, auth, book, make_court, make_user, slot
+
+
+def _series(client, player, court, days_ahead=2, hour=20, weeks=3):
+    start, end = slot(days_ahead, hour)
+    return client.post(f"{API}/bookings/series", headers=auth(player), json={
+        "court_id": court.id, "start_datetime": start.isoformat(), "end_datetime": end.isoformat(), "weeks": weeks,
+    })
+
+
+def test_series_creates_weekly_bookings_in_one_go(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+
+    resp = _series(client, player, court, weeks=3)
+    assert resp.status_code == 201, resp.text
+    data = resp.json()
+    starts = [b["start_datetime"] for b in data["bookings"]]
+    first = slot(2, 20)[0]
+    assert starts == [(first + timedelta(weeks=i)).isoformat() for i in range(3)]
+    assert {b["series_id"] for b in data["bookings"]} == {data["series_id"]}
+    assert {b["price_total"] for b in data["bookings"]} == {1000}
+
+    # un bitmap por semana y un solo mail (con RRULE) para toda la serie
+    masks = db.execute(select(CourtOccupancy.day, CourtOccupancy.bits)).all()
+    assert sorted(d for d, _ in masks) == [(first + timedelta(weeks=i)).date() for i in range(3)]
+    assert db.scalar(select(func.count(NotificationOutbox.id))) == 1
+
+
+def test_series_conflict_rejects_the_whole_series(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    taken = book(client, player, court, days_ahead=9, hour=20)  # segunda semana
+
+    resp = _series(client, player, court, weeks=3)
+    assert resp.status_code == 409
+    assert slot(9, 20)[0].strftime("%d/%m/%Y %H:%M") in resp.json()["detail"]
+    assert [b.id for b in db.execute(select(Booking)).scalars()] == [taken["id"]]
@@ -0,0 +1,129 @@
+# tests/test_calendar_feed.py
+from tests.factories import API, auth, book, make_court, make_user
+from app.shared.enums import RoleEnum
+
+
+def _vevents(body: str) -> list[dict]:
+    """VEVENTs del feed como dicts {PROPIEDAD: valor} (sin VALARM)."""
+    events, current, depth = [], None, 0
+    for line in body.split("\r\n"):
+        if line == "BEGIN:VEVENT":
+            current, depth = {}, 0
+        elif line == "END:VEVENT":
+            events.append(current)
+            current = None
+        elif current is not None:
+            if line.startswith("BEGIN:"):
+                depth += 1
+            elif line.startswith("END:"):
+                depth -= 1
+            elif depth == 0 and ":" in line:
+                name, value = line.split(":", 1)
+                current[name.split(";", 1)[0]] = value
+    return events
+
+
+def _fetch(client, link_path: str, headers: dict):
+    link = client.get(link_path, headers=headers)
+    assert link.status_code == 200, link.text
+    url = link.json()["url"]
+    return url, client.get(url)
+
+
+def test_player_and_venue_feeds_with_etag(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner, number="3", venue_name="Club Norte")
+    first = book(client, player, court, days_ahead=2)
+    second = book(client, player, court, days_ahead=3)
+
+    # feed del jugador
+    url, resp = _fetch(client, f"{API}/users/me/calendar-feed", auth(player))
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("text/calendar")
+    body = resp.text
+    assert body.startswith("BEGIN:VCALENDAR") and body.rstrip().endswith("END:VCALENDAR")
+    events = _vevents(body)
+    assert [e["DESCRIPTION"].split(" ")[1] for e in events] == [f"#{first['id']}", f"#{second['id']}"]
+    assert all(e["SUMMARY"] == "Reserva en Club Norte - Cancha 3" for e in events)
+    assert all(e["STATUS"] == "TENTATIVE" for e in events)
+
+    etag = resp.headers["ETag"]
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    # feed del venue (sólo el owner pide el link)
+    venue_id = court.venue_id
+    url, resp = _fetch(client, f"{API}/venues/{venue_id}/calendar-feed", auth(owner))
+    assert resp.status_code == 200, resp.text
+    events = _vevents(resp.text)
+    assert [e["SUMMARY"] for e in events] == [f"Cancha 3 - Reserva #{first['id']}", f"Cancha 3 - Reserva #{second['id']}"]
+
+    etag = resp.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # una reserva nueva invalida el ETag del venue: vuelve el feed completo
+    book(client, player, court, days_ahead=4)
+    fresh = client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert len(_vevents(fresh.text)) == 3
+
+
+def test_feed_token_is_scoped_to_its_venue(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    court_a = make_court(db, owner, venue_name="A")
+    court_b = make_court(db, owner, venue_name="B")
+    link = client.get(f"{API}/venues/{court_a.venue_id}/calendar-feed", headers=auth(owner)).json()
+    resp = client.get(f"{API}/venues/{court_b.venue_id}/calendar.ics", params={"token": link["token"]})
+    assert resp.status_code == 403
+
+
+def test_venue_feed_sees_bookings_on_courts_added_later(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    url, resp = _fetch(client, f"{API}/venues/{court.venue_id}/calendar-feed", auth(owner))
+    etag = resp.headers["ETag"]
+
+    # cancha nueva del mismo venue, creada después de cachear el ETag
+    extra = make_court(db, owner, number="2")
+    extra.venue_id = court.venue_id
+    db.commit()
+    book(client, player, extra)
+
+    fresh = client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert [e["SUMMARY"].split(" - ")[0] for e in _vevents(fresh.text)] == ["Cancha 2"]
+
+
+def test_rotating_a_feed_link_revokes_the_old_token(client, db):
+    from app.core.security import create_access_token
+
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    old_url, resp = _fetch(client, f"{API}/users/me/calendar-feed", auth(player))
+    assert resp.status_code == 200
+    # links emitidos antes de versionar (sin cal_v) valen como versión 0
+    legacy = create_access_token(subject=player.id, claims={"cal": "user"})
+    assert client.get(f"{API}/users/me/calendar.ics", params={"token": legacy}).status_code == 200
+
+    rotated = client.post(f"{API}/users/me/calendar-feed/rotate", headers=auth(player))
+    assert rotated.status_code == 200, rotated.text
+    assert client.get(old_url).status_code == 401
+    assert client.get(f"{API}/users/me/calendar.ics", params={"token": legacy}).status_code == 401
+    assert client.get(rotated.json()["url"]).status_code == 200
+    # el link que se pide después es el de la versión nueva
+    assert _fetch(client, f"{API}/users/me/calendar-feed", auth(player))[1].status_code == 200
+
+    venue_path = f"{API}/venues/{court.venue_id}/calendar-feed"
+    old_venue_url, _ = _fetch(client, venue_path, auth(owner))
+    other = make_user(db, "other@test.com", RoleEnum.OWNER)
+    assert client.post(f"{venue_path}/rotate", headers=auth(other)).status_code == 403
+    assert client.get(old_venue_url).status_code == 200
+
+    rotated = client.post(f"{venue_path}/rotate", headers=auth(owner))
+    assert rotated.status_code == 200, rotated.text
+    assert client.get(old_venue_url).status_code == 401
+    assert client.get(rotated.json()["url"]).status_code == 200
@@ -0,0 +1,31 @@
+from app.shared.enums import RoleEnum
+from tests.factories import API, book, make_court, make_user, slot
+
+
+def _search(client, **params):
+    resp = client.get(f"{API}/venues/courts/search", params=params)
+    assert resp.status_code == 200, resp.text
+    return [c["id"] for c in resp.json()]
+
+
+def test_time_window_keeps_only_fully_free_courts(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    free = make_court(db, owner, number="1")
+    busy = make_court(db, owner, number="2")
+    book(client, player, busy, days_ahead=2, hour=19)
+    day = slot(2)[0].date().isoformat()
+
+    assert _search(client, date=day, from_time="18:00", to_time="20:00") == [free.id]
+    # [start, end) semiabierto: termina justo cuando empieza la reserva
+    assert sorted(_search(client, date=day, from_time="18:00", to_time="19:00")) == sorted([free.id, busy.id])
+    # fuera del horario (08-23) no hay ninguna
+    assert _search(client, date=day, from_time="22:00", to_time="23:30") == []
+
+
+def test_time_window_params_go_together(client):
+    resp = client.get(f"{API}/venues/courts/search", params={"date": "2030-01-07", "from_time": "18:00"})
+    assert resp.status_code == 422
+    resp = client.get(f"{API}/venues/courts/search",
+                      params={"date": "2030-01-07", "from_time": "20:00", "to_time": "18:00"})
+    assert resp.status_code == 422
@@ -0,0 +1,49 @@
+# tests/test_mail_transport.py
+import pytest
+
+from app.domains.notifications.models import NotificationOutbox
+from app.shared.enums import RoleEnum
+from app.utils import mail_transport
+from tests.factories import API, auth, book, make_court, make_user
+
+
+@pytest.fixture(autouse=True)
+def _clean_env(monkeypatch):
+    for name in ("SMTP_FORCE_TLS", "SMTP_FORCE_AUTH", "SMTP_USER", "SMTP_PASS"):
+        monkeypatch.delenv(name, raising=False)
+    yield
+    mail_transport.close_all_transports()
+
+
+def _config(profile):
+    c = mail_transport.sender_transport(profile).config
+    return c.starttls, c.require_auth
+
+
+def test_sender_defaults_without_env():
+    assert _config("calendar") == ("auto", True)
+    assert _config("html") == ("off", False)
+    assert _config("basic") == ("off", False)
+
+
+def test_env_overrides_every_sender(monkeypatch):
+    monkeypatch.setenv("SMTP_FORCE_TLS", "true")
+    monkeypatch.setenv("SMTP_FORCE_AUTH", "false")
+    assert _config("calendar") == ("auto", False)
+    assert _config("html") == ("auto", False)
+    assert _config("basic") == ("force", False)
+
+
+def test_outbox_events_keep_their_sender_profile(client, db, sent_mail):
+    from app.domains.notifications.outbox import drain_outbox
+
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    booking = book(client, player, make_court(db, owner))
+    assert client.post(f"{API}/bookings/{booking['id']}/confirm", headers=auth(owner)).status_code == 200
+    drain_outbox(db)
+
+    profiles = {row.kind: row.payload["rendered"]["smtp_profile"]
+                for row in db.query(NotificationOutbox).all()}
+    # creación y cambios de estado conservan cada uno sus defaults de TLS/auth
+    assert profiles == {"booking_created": "calendar", "booking_state_changed": "html"}
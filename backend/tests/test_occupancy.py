@@ -0,0 +1,82 @@
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
+
+from app.domains.scheduling import occupancy
+from app.domains.scheduling.models import CourtOccupancy
+from app.shared.enums import RoleEnum
+from tests.factories import API, auth, book, make_court, make_user, slot
+
+
+def _bits(db, court_id: int, day: date) -> set[int]:
+    db.expire_all()
+    occ = db.execute(
+        select(CourtOccupancy).where(CourtOccupancy.court_id == court_id, CourtOccupancy.day == day)
+    ).scalar_one()
+    return {i for i in range(occ.mask.bit_length()) if occ.mask >> i & 1}
+
+
+def test_bit_size_is_gcd_of_slot_and_hour():
+    assert occupancy.bit_minutes_for(60) == 60
+    assert occupancy.bit_minutes_for(30) == 30
+    # turnos de 45' empiezan en :00/:45/:30/:15 -> bloques de 15'
+    assert occupancy.bit_minutes_for(45) == 15
+    assert occupancy.bit_minutes_for(90) == 30
+
+    day = date(2030, 1, 7)
+    mask = occupancy.range_mask(day, datetime.combine(day, time(10)), datetime.combine(day, time(11, 30)), 15)
+    assert mask == 0b111111 << 40
+    # bordes desalineados se redondean hacia afuera
+    assert occupancy.range_mask(day, datetime.combine(day, time(10, 10)),
+                                datetime.combine(day, time(10, 20)), 15) == 0b11 << 40
+
+
+def test_bits_follow_create_patch_and_cancel(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    day = slot(days_ahead=2)[0].date()
+
+    first = book(client, player, court, days_ahead=2, hour=10)
+    book(client, player, court, days_ahead=2, hour=15)
+    assert _bits(db, court.id, day) == {10, 15}
+
+    # el turno ocupado se rechaza sin mirar bookings
+    start, end = slot(days_ahead=2, hour=10)
+    resp = client.post(f"{API}/bookings", headers=auth(player), json={
+        "court_id": court.id, "start_datetime": start.isoformat(), "end_datetime": end.isoformat(),
+    })
+    assert resp.status_code == 409
+
+    start, end = slot(days_ahead=2, hour=12)
+    resp = client.patch(f"{API}/bookings/{first['id']}", headers=auth(player), json={
+        "start_datetime": start.isoformat(), "end_datetime": end.isoformat(),
+    })
+    assert resp.status_code == 200, resp.text
+    assert _bits(db, court.id, day) == {12, 15}
+
+    assert client.delete(f"{API}/bookings/{first['id']}", headers=auth(player)).status_code == 204
+    assert _bits(db, court.id, day) == {15}
+    # el hueco liberado se puede volver a reservar
+    book(client, player, court, days_ahead=2, hour=12)
+    assert _bits(db, court.id, day) == {12, 15}
+
+
+def test_stale_row_is_rebuilt_from_bookings(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner)
+    book(client, player, court, days_ahead=2, hour=9)
+    day = slot(days_ahead=2)[0].date()
+
+    # resolución vieja (p. ej. el schedule pasó de 30' a 60'): lock_days la rehace
+    occ = db.execute(select(CourtOccupancy).where(CourtOccupancy.court_id == court.id)).scalar_one()
+    occ.bit_minutes, occ.mask = 30, 0
+    db.commit()
+    next_day = day + timedelta(days=1)
+    rows = occupancy.lock_days(db, court.id, [next_day, day], slot_minutes=60)
+    assert rows[day].bit_minutes == 60
+    assert rows[day].mask == 1 << 9
+    # el día sin fila se materializa en la misma pasada
+    assert rows[next_day].mask == 0
+    db.rollback()
@@ -0,0 +1,64 @@
+# tests/test_outbox.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.db import SessionLocal
+from app.domains.notifications import rendering
+from app.domains.notifications.models import NotificationOutbox
+from app.domains.notifications.outbox import drain_outbox
+from app.shared.enums import RoleEnum
+from tests.factories import book, make_court, make_user
+
+
+def _only_row(db) -> NotificationOutbox:
+    db.expire_all()
+    return db.execute(select(NotificationOutbox)).scalar_one()
+
+
+def test_sends_run_after_the_claim_commits(client, db, monkeypatch):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    book(client, player, make_court(db, owner))
+
+    seen = []
+
+    def send(event, mail):
+        # otra conexión ya ve el lease: la transacción del claim está commiteada
+        other = SessionLocal()
+        try:
+            row = other.execute(select(NotificationOutbox)).scalar_one()
+            seen.append((mail.recipient, row.next_attempt_at > datetime.utcnow(), "rendered" in row.payload))
+        finally:
+            other.close()
+
+    monkeypatch.setattr(rendering, "send_mail", send)
+    assert drain_outbox(db) == 1
+    assert sorted(seen) == [("owner", True, True), ("player", True, True)]
+    assert _only_row(db).sent_at is not None
+
+
+def test_failed_recipient_is_retried_alone(client, db, monkeypatch):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    player = make_user(db, "player@test.com")
+    book(client, player, make_court(db, owner))
+
+    sent = []
+
+    def flaky(event, mail):
+        if mail.recipient == "owner":
+            raise OSError("smtp caído")
+        sent.append(mail.recipient)
+
+    monkeypatch.setattr(rendering, "send_mail", flaky)
+    drain_outbox(db)
+    row = _only_row(db)
+    assert row.sent_at is None and row.attempts == 1
+    assert row.payload["delivered"] == ["player"]
+    assert "smtp caído" in row.last_error
+
+    # reintento vencido: sólo el owner, con el mismo render
+    monkeypatch.setattr(rendering, "send_mail", lambda event, mail: sent.append(mail.recipient))
+    drain_outbox(db, now=row.next_attempt_at + timedelta(seconds=1))
+    assert sent == ["player", "owner"]
+    assert _only_row(db).sent_at is not None
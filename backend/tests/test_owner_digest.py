@@ -0,0 +1,44 @@
+# tests/test_owner_digest.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.domains.notifications.digest import collect_owner_digests
+from app.domains.notifications.models import NotificationOutbox, OwnerDigestEvent
+from app.domains.notifications.outbox import drain_outbox
+from app.shared.enums import RoleEnum
+from tests.factories import book, make_court, make_user
+
+
+def test_digest_owner_gets_one_summary(client, db, sent_mail):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER, owner_digest=True)
+    player = make_user(db, "player@test.com")
+    court = make_court(db, owner, number="3")
+    book(client, player, court, days_ahead=2)
+    book(client, player, court, days_ahead=3)
+
+    # mail inmediato sólo al jugador; el owner queda para el resumen
+    drain_outbox(db)
+    assert [to for to, _ in sent_mail] == ["player@test.com", "player@test.com"]
+    assert len(db.execute(select(OwnerDigestEvent)).scalars().all()) == 2
+
+    # antes de la ventana no se junta nada
+    assert collect_owner_digests(db) == 0
+
+    later = datetime.utcnow() + timedelta(minutes=settings.OWNER_DIGEST_WINDOW_MINUTES + 1)
+    assert collect_owner_digests(db, now=later) == 1
+    digest_row = db.execute(
+        select(NotificationOutbox).where(NotificationOutbox.kind == "owner_digest")
+    ).scalar_one()
+    assert "Cancha 3" in digest_row.payload["html"]
+
+    sent_mail.clear()
+    drain_outbox(db)
+    assert sent_mail == [("owner@test.com", "📋 Resumen de reservas (2 movimientos)")]
+
+    db.expire_all()
+    assert db.get(NotificationOutbox, digest_row.id).sent_at is not None
+    assert all(ev.digested_at is not None for ev in db.execute(select(OwnerDigestEvent)).scalars())
+    # ya resumidos: la próxima corrida no vuelve a mandar
+    assert collect_owner_digests(db, now=later) == 0
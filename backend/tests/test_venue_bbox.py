@@ -0,0 +1,53 @@
+import math
+import random
+
+import pytest
+from sqlalchemy import select
+
+from app.domains.venues.models import Venue
+from app.domains.venues.public import EARTH_RADIUS_KM, bbox_filter
+from app.shared.enums import RoleEnum
+from tests.factories import make_user
+
+
+def _haversine(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((p2 - p1) / 2) ** 2
+         + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _inside_box(db, lat, lng, radius_km, points):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    db.add_all([Venue(name=f"V{i}", address="-", city="-", owner_user_id=owner.id, latitude=la, longitude=lo)
+                for i, (la, lo) in enumerate(points)])
+    db.commit()
+    rows = db.execute(
+        select(Venue.name).where(bbox_filter(lat, lng, radius_km, Venue.latitude, Venue.longitude))
+    ).scalars()
+    return {int(name[1:]) for name in rows}
+
+
+@pytest.mark.parametrize("lat,lng,radius_km", [
+    (-31.4167, -64.1833, 15),   # Córdoba
+    (64.1466, -21.9426, 300),   # latitud alta: la caja se ensancha en longitud
+    (-16.5, 179.8, 80),         # cruza el antimeridiano
+])
+def test_box_never_drops_a_point_inside_the_radius(db, lat, lng, radius_km):
+    # muestra en el doble del radio alrededor del centro (longitudes normalizadas a [-180, 180))
+    rnd = random.Random(7)
+    dlat = 2 * radius_km / 111.0
+    dlng = dlat / math.cos(math.radians(lat))
+    points = [(round(lat + rnd.uniform(-dlat, dlat), 6), round(((lng + rnd.uniform(-dlng, dlng) + 180) % 360) - 180, 6))
+              for _ in range(400)]
+    within = {i for i, (la, lo) in enumerate(points) if _haversine(lat, lng, la, lo) <= radius_km}
+    boxed = _inside_box(db, lat, lng, radius_km, points)
+    assert within, "el muestreo tiene que caer algún punto adentro"
+    assert within <= boxed
+    # y sí descarta: la caja es un prefiltro, no "todo"
+    assert len(boxed) < len(points)
+
+
+def test_box_touching_a_pole_ignores_longitude(db):
+    points = [(89.9, 0.0), (89.95, 120.0), (89.92, -150.0), (80.0, 0.0)]
+    assert _inside_box(db, 89.9, 10.0, 50, points) == {0, 1, 2}
@@ -0,0 +1,57 @@
+from app.domains.venues.suggest import SuggestIndex, load_suggest_index
+from app.shared.enums import RoleEnum
+from tests.factories import API, auth, create_venue, make_user
+
+
+def _suggest(client, prefix, **params):
+    resp = client.get(f"{API}/venues/public/suggest", params={"prefix": prefix, **params})
+    assert resp.status_code == 200, resp.text
+    return [(s["type"], s["label"]) for s in resp.json()]
+
+
+def test_index_matches_word_prefixes_and_dedupes_cities():
+    index = SuggestIndex()
+    index.rebuild([(1, "Club Ñandú Palermo", "Buenos Aires"), (2, "Palermo Pádel", "Buenos Aires")])
+
+    # orden por clave: "palermo" (sufijo de 1) < "palermo padel"
+    assert [(s["type"], s["venue_id"]) for s in index.suggest("paler")] == [("venue", 1), ("venue", 2)]
+    assert index.suggest("ÑAND") == [{"type": "venue", "label": "Club Ñandú Palermo", "venue_id": 1}]
+    # la ciudad aparece una sola vez aunque tenga dos venues
+    assert index.suggest("aires") == [{"type": "city", "label": "Buenos Aires", "venue_id": None}]
+    assert len(index.suggest("p", limit=1)) == 1
+    assert index.suggest("  ") == []
+
+    index.upsert(2, "Pádel Sur", "Buenos Aires")
+    assert [s["venue_id"] for s in index.suggest("paler")] == [1]
+    index.remove(1)
+    assert index.suggest("paler") == []
+    assert len(index) == 1
+
+
+def test_suggest_follows_venue_create_update_delete(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    venue = create_venue(client, owner, "Club Atlético Norte", city="Rosario")
+    assert _suggest(client, "atle") == [("venue", "Club Atlético Norte")]
+    assert _suggest(client, "ros") == [("city", "Rosario")]
+
+    resp = client.patch(f"{API}/venues/{venue['id']}", headers=auth(owner),
+                        json={"name": "Club Sur", "latitude": -32.9, "longitude": -60.6})
+    assert resp.status_code == 200, resp.text
+    assert _suggest(client, "atle") == []
+    assert _suggest(client, "sur") == [("venue", "Club Sur")]
+
+    assert client.delete(f"{API}/venues/{venue['id']}", headers=auth(owner)).status_code == 204
+    assert _suggest(client, "sur") == []
+    assert _suggest(client, "ros") == []
+
+
+def test_rebuild_from_db_and_result_cap(client, db, monkeypatch):
+    from app.core.config import settings
+
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    for i in range(4):
+        create_venue(client, owner, f"Cancha {i}")
+    assert load_suggest_index(db) == 4
+
+    monkeypatch.setattr(settings, "SUGGEST_MAX_RESULTS", 2)
+    assert len(_suggest(client, "cancha", limit=50)) == 2
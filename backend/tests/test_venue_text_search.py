@@ -0,0 +1,61 @@
+from app.domains.venues.models import Court
+from app.domains.venues.public import list_public_venues
+from app.domains.venues.search import normalize_text, query_tokens, venue_search_text
+from app.shared.enums import RoleEnum, SportEnum, SurfaceEnum
+from tests.factories import API, auth, create_venue, make_user
+
+
+def _public(db, q):
+    # llamada directa: en /api/v1 la ruta /venues/public queda detrás de /venues/{venue_id}
+    page = list_public_venues(db=db, q=q, city=None, sport=None, page=1, page_size=24)
+    return [v.name for v in page.items]
+
+
+def test_normalization_drops_accents_case_and_punctuation():
+    assert normalize_text("Club Ñandú, Av. Córdoba") == "club nandu av cordoba"
+    assert venue_search_text("Club Ñandú", "Av. Córdoba 1200", None) == "club nandu av cordoba 1200"
+    # % y _ no llegan al LIKE
+    assert query_tokens("  100%_Pádel ") == ["100", "padel"]
+
+
+def test_search_is_accent_insensitive_and_ands_tokens(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    create_venue(client, owner, "Club Ñandú", city="Córdoba", address="Av. Colón 1200")
+    create_venue(client, owner, "Pádel Norte", city="Rosario")
+    create_venue(client, owner, "Norte Tenis", city="Córdoba")
+
+    assert _public(db, "nandu") == ["Club Ñandú"]
+    assert _public(db, "COLON") == ["Club Ñandú"]
+    assert _public(db, "norte cordoba") == ["Norte Tenis"]
+    # empieza con la frase antes que la contiene
+    assert _public(db, "norte") == ["Norte Tenis", "Pádel Norte"]
+
+
+def test_search_text_follows_updates(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    venue = create_venue(client, owner, "Club Viejo")
+
+    resp = client.patch(f"{API}/venues/{venue['id']}", headers=auth(owner), json={"name": "Club Renovado"})
+    assert resp.status_code == 200, resp.text
+    assert _public(db, "renovado") == ["Club Renovado"]
+    assert _public(db, "viejo") == []
+
+
+def test_court_search_matches_venue_text_or_court_number(client, db):
+    owner = make_user(db, "owner@test.com", RoleEnum.OWNER)
+    nandu = create_venue(client, owner, "Club Ñandú")
+    other = create_venue(client, owner, "Otro Club")
+    db.add_all([
+        Court(venue_id=nandu["id"], sport=SportEnum.PADEL, surface=SurfaceEnum.SYNTHETIC_TURF, number="1"),
+        Court(venue_id=other["id"], sport=SportEnum.PADEL, surface=SurfaceEnum.SYNTHETIC_TURF, number="Central"),
+    ])
+    db.commit()
+
+    def search(q):
+        resp = client.get(f"{API}/venues/courts/search", params={"q": q})
+        assert resp.status_code == 200, resp.text
+        return [(c["venue_name"], c["court_name"]) for c in resp.json()]
+
+    assert search("ñandu") == [("Club Ñandú", "Cancha 1")]
+    assert search("central") == [("Otro Club", "Cancha Central")]
+    assert search("club") == [("Club Ñandú", "Cancha 1"), ("Otro Club", "Cancha Central")]
@@ -64,6 +64,25 @@ export function durationMinutes(b: Pick<Booking, "start_datetime" | "end_datetim
 
 export const isActiveStatus = (s: BookingStatus) => s === "PENDING" || s === "CONFIRMED";
 
+// Listados paginados por cursor: el backend devuelve una página (limit) y,
+// si hay más, el cursor de la siguiente en el header X-Next-Cursor.
+// Las vistas piden la siguiente página recién cuando el usuario la necesita.
+export interface BookingPage {
+  items: Booking[];
+  nextCursor: string | null;
+}
+
+export interface PageParams {
+  limit?: number;
+  cursor?: string | null;
+}
+
+async function getBookingPage(url: string, params: Record<string, unknown> = {}): Promise<BookingPage> {
+  const { cursor, ...rest } = params;
+  const res = await http.get(url, { params: cursor ? { ...rest, cursor } : rest });
+  return { items: res.data as Booking[], nextCursor: res.headers["x-next-cursor"] ?? null };
+}
+
 // ---------------------------------
 // Court-scoped endpoints (canonical with venues)
 // e.g. /venues/:venueId/courts/:courtId/bookings
@@ -77,9 +96,8 @@ export async function listCourtBookings(
   return data as Booking[];
 }
 
-export async function listBookings(params: ListBookingsParams = {}): Promise<Booking[]> {
-    const { data } = await http.get(`/bookings`, { params });
-    return data as Booking[];
+export async function listBookings(params: ListBookingsParams & PageParams = {}): Promise<BookingPage> {
+    return getBookingPage(`/bookings`, { ...params });
   }
 
   export interface CreateBookingTopLevel {
@@ -91,8 +109,10 @@ export async function listBookings(params: ListBookingsParams = {}): Promise<Boo
     user_id?: number;          // 👈 opcional (ni se manda)
   }
 
-  export async function createBooking(body: CreateBookingDTO): Promise<Booking> {
-    const { data } = await http.post(`/bookings`, body);
+  // idempotencyKey: reusar la misma en reintentos del mismo submit
+  export async function createBooking(body: CreateBookingDTO, idempotencyKey?: string): Promise<Booking> {
+    const headers = idempotencyKey ? { "Idempotency-Key": idempotencyKey } : undefined;
+    const { data } = await http.post(`/bookings`, body, { headers });
     return data as Booking;
   }
 
@@ -140,13 +160,15 @@ export async function cancelBooking(bookingId: number): Promise<Booking> {
 // ---------------------------------
 // Convenience: current user's bookings
 // ---------------------------------
-export async function listMyBookings(params: { date_from?: string; date_to?: string } = {}): Promise<Booking[]> {
-  const { data } = await http.get(`/bookings?mine=1`, { params });
-  return data as Booking[];
+export async function listMyBookings(
+  params: { date_from?: string; date_to?: string } & PageParams = {}
+): Promise<BookingPage> {
+  return getBookingPage(`/bookings`, { ...params, mine: 1 });
 }
 
-export async function listOwnerBookings(params: { from?: string; to?: string } = {}): Promise<Booking[]> {
-  const { data } = await http.get(`/bookings/admin/bookings`, { params });
-  return data as Booking[];
+export async function listOwnerBookings(
+  params: { from?: string; to?: string } & PageParams = {}
+): Promise<BookingPage> {
+  return getBookingPage(`/bookings/admin/bookings`, { ...params });
 }
 
@@ -167,6 +167,16 @@ export type AvailabilityResponse = {
   slots: AvailabilitySlot[];
 };
 
+// Disponibilidad en rango /courts/availability?court_ids=1,2&from=...&to=...
+export type AvailabilityRangeResponse = {
+  from: string;          // "YYYY-MM-DD"
+  to: string;            // "YYYY-MM-DD" (inclusive)
+  courts: Array<{
+    court_id: number;
+    days: AvailabilityResponse[];
+  }>;
+};
+
 // Búsqueda pública /courts/search
 export type CourtSearchResult = {
   id: number;
@@ -190,6 +200,9 @@ export type SearchCourtsParams = {
   lng?: number;
   radius_km?: number;
   sport?: string;
+  date?: string;        // "YYYY-MM-DD", junto con from_time/to_time
+  from_time?: string;   // "HH:MM"
+  to_time?: string;     // "HH:MM"
   limit?: number;
 };
 
@@ -209,6 +222,17 @@ export async function getAvailabilityPublic(
   return data;
 }
 
+export async function getAvailabilityRangePublic(
+  courtIds: number[],
+  from: string,
+  to: string
+): Promise<AvailabilityRangeResponse> {
+  const { data } = await http.get<AvailabilityRangeResponse>(`/courts/availability`, {
+    params: { court_ids: courtIds.join(","), from, to },
+  });
+  return data;
+}
+
 export async function searchCourtsPublic(params: SearchCourtsParams) {
   const { data } = await http.get<CourtSearchResult[]>(`/venues/courts/search`, { params });
   return data;
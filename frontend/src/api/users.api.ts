@@ -13,6 +13,7 @@ export interface User {
   phone?: string | null;
   role: Role;
   created_at: string; // ISO8601
+  owner_digest?: boolean; // owners: resumen periódico en vez de un mail por reserva
 }
 
 export interface CreateUserDTO {
@@ -26,6 +27,7 @@ export interface CreateUserDTO {
 export interface UpdateUserDTO {
   name?: string;
   phone?: string | null;
+  owner_digest?: boolean;
   role?: Role;      // solo si tu policy lo permite en otro endpoint
   password?: string; // si implementás cambio de password
 }
@@ -1,13 +1,27 @@
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import { getMe } from "../../api/auth.api";
-import { listMyBookings, listOwnerBookings, type Booking } from "../../api/bookings.api";
+import { listMyBookings, listOwnerBookings, type Booking, type BookingPage } from "../../api/bookings.api";
 
 type Role = "PLAYER" | "OWNER" | "ADMIN" | string;
 
+async function fetchPage(tab: "mine" | "owner", cursor: string | null): Promise<BookingPage> {
+  if (tab === "owner") return listOwnerBookings({ cursor });
+  try {
+    return await listMyBookings({ cursor });
+  } catch {
+    const qs = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+    const r = await fetch(`/api/v1/bookings?mine=1${qs}`);
+    if (!r.ok) return { items: [], nextCursor: null };
+    return { items: await r.json(), nextCursor: r.headers.get("x-next-cursor") };
+  }
+}
+
 export function useBookingsData(mineParam: boolean, tab: "mine" | "owner") {
   const [role, setRole] = useState<Role>("PLAYER");
   const [rows, setRows] = useState<Booking[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [err, setErr] = useState<string | null>(null);
 
   const canOwner = role === "OWNER" || role === "ADMIN";
@@ -24,33 +38,44 @@ export function useBookingsData(mineParam: boolean, tab: "mine" | "owner") {
     })();
   }, []);
 
-  // datos
-  useEffect(() => {
-    (async () => {
-      setLoading(true);
-      setErr(null);
-      try {
-        if (tab === "mine") {
-          try {
-            const data = await listMyBookings();
-            setRows(data);
-          } catch {
-            const r = await fetch("/api/v1/bookings?mine=1");
-            setRows(r.ok ? await r.json() : []);
-          }
-        } else {
-          const data = await listOwnerBookings({});
-          data.sort((a, b) => new Date(b.start_datetime).getTime() - new Date(a.start_datetime).getTime());
-          setRows(data);
-        }
-      } catch (e: any) {
-        setErr(e?.message ?? "Error cargando reservas");
-        setRows([]);
-      } finally {
-        setLoading(false);
-      }
-    })();
+  // primera página (al cambiar de tab o al actualizar)
+  const refresh = useCallback(async () => {
+    setLoading(true);
+    setErr(null);
+    try {
+      const page = await fetchPage(tab, null);
+      setRows(page.items);
+      setNextCursor(page.nextCursor);
+    } catch (e: any) {
+      setErr(e?.message ?? "Error cargando reservas");
+      setRows([]);
+      setNextCursor(null);
+    } finally {
+      setLoading(false);
+    }
   }, [tab]);
 
-  return { role, canOwner, rows, setRows, loading, err, setErr };
+  useEffect(() => {
+    refresh();
+  }, [refresh]);
+
+  // página siguiente, a pedido ("Cargar más")
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(tab, nextCursor);
+      setRows((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (e: any) {
+      setErr(e?.message ?? "Error cargando reservas");
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [tab, nextCursor, loadingMore]);
+
+  return {
+    role, canOwner, rows, setRows, loading, err, setErr,
+    refresh, loadMore, hasMore: nextCursor !== null, loadingMore,
+  };
 }
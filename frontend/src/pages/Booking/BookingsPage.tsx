@@ -1,10 +1,7 @@
 // src/pages/Booking/BookingsPage.tsx
 import React, { useMemo, useState } from "react";
 import { useSearchParams } from "react-router-dom";
-import {
-  confirmBooking, declineBooking, cancelBooking,
-  listMyBookings, listOwnerBookings,
-} from "../../api/bookings.api";
+import { confirmBooking, declineBooking, cancelBooking } from "../../api/bookings.api";
 
 import { Container, Paper, Typography, Tabs, Tab, Stack, Button, Alert, CircularProgress, Divider, Chip } from "@mui/material";
 import EventNoteIcon from "@mui/icons-material/EventNote";
@@ -21,17 +18,10 @@ export default function BookingsPage() {
   const mineParam = params.get("mine") === "1";
 
   const [tab, setTab] = useState<TabKey>(mineParam ? "mine" : "mine");
-  const { role, canOwner, rows, setRows, loading, err, setErr } = useBookingsData(mineParam, tab);
-
-  async function refresh() {
-    if (tab === "mine") {
-      setRows(await listMyBookings());
-    } else {
-      const data = await listOwnerBookings({});
-      data.sort((a, b) => new Date(b.start_datetime).getTime() - new Date(a.start_datetime).getTime());
-      setRows(data);
-    }
-  }
+  const {
+    role, canOwner, rows, loading, err, setErr,
+    refresh, loadMore, hasMore, loadingMore,
+  } = useBookingsData(mineParam, tab);
 
   async function onConfirm(id: number) {
     try { await confirmBooking(id); await refresh(); }
@@ -113,6 +103,13 @@ export default function BookingsPage() {
             onCancel={onCancel}
             ActionsCell={ActionsCell}
           />
+          {hasMore && (
+            <Stack alignItems="center" sx={{ mt: 2 }}>
+              <Button onClick={loadMore} variant="outlined" disabled={loadingMore}>
+                {loadingMore ? "Cargando…" : "Cargar más"}
+              </Button>
+            </Stack>
+          )}
         </Paper>
       )}
     </Container>